@@ -0,0 +1,392 @@
+"""
+HTTP load test with simulated players.
+
+Each simulated player is an asyncio task that registers, logs in, and
+then loops over a weighted mix of API calls with randomized think times
+between them. The number of active players follows a ramp profile of
+"seconds:players" stages, each ramping linearly from the previous stage's
+target. At the end it reports throughput, error rate and latency
+percentiles per endpoint.
+
+By default the test starts a WebServer on a temporary database in this
+process and stops it afterwards. That server handles each request on its
+own thread but runs requests for the same player one at a time, and all
+of them share one SQLite database, so latencies under load include
+queueing for the player lock and the database as well as the work itself.
+It also gets one mission per simulated player that no command completes,
+so the mission action can start and abandon it for the whole run:
+
+    python benchmarks/load_test.py --stages 20:500,40:500,10:0 --think-time 1.0
+    python benchmarks/load_test.py --players 2000 --ramp-up 30 --duration 60 \\
+        --mix execute_command=70,leaderboard=10,mission=10,mining=5,login=5 --json results.json
+
+Pass --url to target a server that is already running instead. Players
+then cycle through the tutorial missions, dropping each one the server
+reports as completed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import urllib.parse
+import uuid
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import NexusConfig
+from src.core.logger import NexusLogger
+from src.models.mission import MissionObjective, MissionStatus
+
+PASSWORD = "load-test-password"
+COMMANDS = ["ls", "cat data.txt", "cat log.txt", "cat mission_brief.md"]
+DEFAULT_MIX = "execute_command=60,leaderboard=10,mission=10,mining=10,status=5,login=5"
+TUTORIAL_MISSIONS = ["tutorial_001", "tutorial_002", "tutorial_003"]
+# Start rejections that retrying will not change
+FINAL_REJECTIONS = ("already completed", "is completed")
+IN_PROCESS_SERVER = "in-process WebServer: a thread per request, one request at a time per player, one SQLite database"
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+def parse_stages(spec):
+    """'30:100,60:100,10:0' -> [(30.0, 100), (60.0, 100), (10.0, 0)]"""
+    stages = []
+    for entry in spec.split(","):
+        seconds, players = entry.split(":")
+        stages.append((float(seconds), int(players)))
+    return stages
+
+def parse_mix(spec):
+    """'execute_command=60,leaderboard=10' -> {'execute_command': 60.0, 'leaderboard': 10.0}"""
+    mix = {}
+    for entry in spec.split(","):
+        name, weight = entry.split("=")
+        if name.strip() not in ACTIONS:
+            raise ValueError(f"Unknown action '{name}'; choose from {', '.join(sorted(ACTIONS))}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def seed_missions(mission_service, count):
+    """Create a mission per simulated player that no command completes; returns their ids"""
+    mission_ids = []
+    for index in range(count):
+        mission = mission_service.create_mission(
+            f"loadtest_{index:05d}", "Load Test", "Started and abandoned by the load test"
+        )
+        mission.add_objective(MissionObjective("hold", "Not progressed by any command", 1))
+        mission.status = MissionStatus.AVAILABLE
+        mission_service.repository.save(mission)
+        mission_ids.append(mission.id)
+    return mission_ids
+
+class RampProfile:
+    """Target number of active players over time, interpolated between stages"""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.duration = sum(seconds for seconds, _ in stages)
+        self.max_players = max(players for _, players in stages)
+
+    def target(self, elapsed):
+        start_players = 0
+        for seconds, players in self.stages:
+            if elapsed < seconds:
+                fraction = elapsed / seconds if seconds else 1.0
+                return round(start_players + (players - start_players) * fraction)
+            elapsed -= seconds
+            start_players = players
+        return start_players
+
+class Stats:
+    """Latency samples and outcomes per endpoint"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.rejected = {}
+
+    def record(self, endpoint, latency_ms, error, rejected):
+        self.latencies.setdefault(endpoint, []).append(latency_ms)
+        if error:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        elif rejected:
+            self.rejected[endpoint] = self.rejected.get(endpoint, 0) + 1
+
+    def summary(self, elapsed_seconds):
+        rows = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            count = len(samples)
+            rows[endpoint] = {
+                "requests": count,
+                "throughput_rps": round(count / elapsed_seconds, 2),
+                "error_rate": round(self.errors.get(endpoint, 0) / count, 4),
+                "rejected_rate": round(self.rejected.get(endpoint, 0) / count, 4),
+                "p50_ms": round(percentile(samples, 0.50), 2),
+                "p95_ms": round(percentile(samples, 0.95), 2),
+                "p99_ms": round(percentile(samples, 0.99), 2),
+                "max_ms": round(max(samples), 2),
+            }
+        return rows
+
+class HttpClient:
+    """Minimal asyncio HTTP/1.1 client; one connection per request, as the server closes after each response"""
+
+    def __init__(self, host, port, stats, max_connections, timeout):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.connections = asyncio.Semaphore(max_connections)
+        self.timeout = timeout
+
+    async def request(self, endpoint, method, path, body=None, token=None):
+        """Send one request and record it under endpoint; returns the JSON body or None"""
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Connection: close",
+            f"Content-Length: {len(payload)}",
+        ]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+        if token:
+            headers.append(f"Authorization: Bearer {token}")
+        request = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload
+
+        async with self.connections:
+            started = time.perf_counter()
+            try:
+                status, data = await asyncio.wait_for(self._exchange(request), self.timeout)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                self.stats.record(endpoint, (time.perf_counter() - started) * 1000, True, False)
+                return None
+            latency_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            result = json.loads(data) if data else None
+        except ValueError:
+            result = None
+        rejected = isinstance(result, dict) and result.get("success") is False
+        self.stats.record(endpoint, latency_ms, status >= 400, rejected)
+        return result if status < 400 else None
+
+    async def _exchange(self, request):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        return status, body
+
+class SimulatedPlayer:
+    """One player: register and log in once, then loop over the action mix while active"""
+
+    def __init__(self, index, run_id, client, mix, think_time, rng, missions):
+        self.index = index
+        self.name = f"lt{run_id}_{index}"
+        self.client = client
+        self.actions = list(mix)
+        self.weights = [mix[action] for action in self.actions]
+        self.think_time = think_time
+        self.rng = rng
+        self.token = None
+        self.missions = missions
+        # Players start on different missions so seeded missions are not shared
+        self.next_mission = index % len(missions)
+        self.completed = set()
+        self.active_mission = None
+
+    async def run(self, is_active, finished):
+        while not finished.is_set():
+            if not is_active(self.index):
+                await asyncio.sleep(0.1)
+                continue
+            if self.token is None:
+                await self.client.request("register", "POST", "/api/register",
+                                          {"username": self.name, "password": PASSWORD})
+                await self.login()
+            else:
+                action = self.rng.choices(self.actions, self.weights)[0]
+                await ACTIONS[action](self)
+            if self.think_time > 0:
+                await asyncio.sleep(self.rng.expovariate(1.0 / self.think_time))
+
+    async def login(self):
+        result = await self.client.request("login", "POST", "/api/login",
+                                           {"username": self.name, "password": PASSWORD})
+        if result and result.get("success"):
+            self.token = result["token"]
+
+    async def execute_command(self):
+        await self.client.request("execute_command", "POST", "/api/command/execute",
+                                  {"command": self.rng.choice(COMMANDS)}, self.token)
+
+    async def leaderboard(self):
+        category = self.rng.choice(["level", "credits", "missions"])
+        query = urllib.parse.urlencode({"category": category, "limit": 10})
+        await self.client.request("leaderboard", "GET", f"/api/leaderboard?{query}")
+
+    async def mission(self):
+        # Alternate starting and abandoning so the mission is not always already active
+        if self.active_mission is not None:
+            result = await self.client.request("mission", "POST", "/api/mission/abandon",
+                                               {"player_name": self.name, "mission_id": self.active_mission})
+            # A rejected abandon means commands completed the mission in the meantime
+            if result is not None:
+                self.active_mission = None
+            return
+
+        for _ in range(len(self.missions)):
+            mission_id = self.missions[self.next_mission]
+            if mission_id not in self.completed:
+                break
+            self.next_mission = (self.next_mission + 1) % len(self.missions)
+        else:
+            # Every mission is completed; nothing left to start
+            return
+        result = await self.client.request("mission", "POST", "/api/mission/start",
+                                           {"player_name": self.name, "mission_id": mission_id})
+        if result and result.get("success"):
+            self.active_mission = mission_id
+        elif result is not None:
+            # Move on; a mission held by another player may be free next time round
+            if any(reason in (result.get("message") or "") for reason in FINAL_REJECTIONS):
+                self.completed.add(mission_id)
+            self.next_mission = (self.next_mission + 1) % len(self.missions)
+
+    async def mining(self):
+        if self.rng.random() < 0.5:
+            await self.client.request("mining", "POST", "/api/mining/start",
+                                      {"player_name": self.name, "hours": 1})
+        else:
+            await self.client.request("mining", "POST", "/api/mining/check", {"player_name": self.name})
+
+    async def status(self):
+        await self.client.request("status", "GET", "/api/status")
+
+ACTIONS = {
+    "execute_command": SimulatedPlayer.execute_command,
+    "leaderboard": SimulatedPlayer.leaderboard,
+    "mission": SimulatedPlayer.mission,
+    "mining": SimulatedPlayer.mining,
+    "status": SimulatedPlayer.status,
+    "login": SimulatedPlayer.login,
+}
+
+async def run_load(host, port, profile, mix, think_time, max_connections, timeout, seed,
+                   missions=TUTORIAL_MISSIONS):
+    """Drive the ramp profile against host:port and return (stats, elapsed seconds)"""
+    stats = Stats()
+    client = HttpClient(host, port, stats, max_connections, timeout)
+    rng = random.Random(seed)
+    run_id = uuid.uuid4().hex[:4]
+    players = [
+        SimulatedPlayer(index, run_id, client, mix, think_time, random.Random(rng.random()), missions)
+        for index in range(profile.max_players)
+    ]
+
+    started = time.perf_counter()
+    finished = asyncio.Event()
+    target = {"players": 0}
+
+    def is_active(index):
+        return index < target["players"]
+
+    tasks = [asyncio.create_task(player.run(is_active, finished)) for player in players]
+    while True:
+        elapsed = time.perf_counter() - started
+        if elapsed >= profile.duration:
+            break
+        target["players"] = profile.target(elapsed)
+        await asyncio.sleep(0.1)
+    finished.set()
+    target["players"] = 0
+    # Let requests already in flight finish so they are counted
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started
+
+def print_report(summary, elapsed_seconds):
+    print(f"elapsed {elapsed_seconds:.1f}s")
+    print(f"{'endpoint':<16}{'requests':>9}{'req/s':>9}{'errors':>8}{'rejected':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, row in summary.items():
+        print(f"{endpoint:<16}{row['requests']:>9}{row['throughput_rps']:>9.1f}{row['error_rate']:>8.1%}"
+              f"{row['rejected_rate']:>9.1%}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP API with simulated players")
+    parser.add_argument("--players", type=int, default=200, help="Peak simulated players (without --stages)")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds to reach --players (without --stages)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds at peak (without --stages)")
+    parser.add_argument("--stages", help="Ramp profile as seconds:players stages, e.g. 30:1000,60:1000,10:0")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted actions, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between a player's requests")
+    parser.add_argument("--max-connections", type=int, default=256, help="Open connections at once")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request counts as failed")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="Target a running server instead of starting one in-process")
+    parser.add_argument("--scrypt-n", type=int, default=2 ** 14, help="scrypt cost for the in-process server")
+    parser.add_argument("--json", help="Also write the per-endpoint summary to this file")
+    args = parser.parse_args()
+
+    stages = parse_stages(args.stages) if args.stages else [(args.ramp_up, args.players), (args.duration, args.players)]
+    profile = RampProfile(stages)
+    mix = parse_mix(args.mix)
+
+    web_server = None
+    db_path = None
+    missions = TUTORIAL_MISSIONS
+    if args.url:
+        target = urllib.parse.urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+        server = args.url
+    else:
+        from src.server.web_server import WebServer
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = db_path
+        config.server.host = "127.0.0.1"
+        config.server.port = 0
+        # Every simulated player shares one IP
+        config.game.rate_limiting_enabled = False
+        config.security.scrypt_n = args.scrypt_n
+        # Per-request INFO logging would dominate the measurement
+        NexusLogger.initialize("WARNING")
+        web_server = WebServer(config)
+        missions = seed_missions(web_server.game_api.mission_service, profile.max_players)
+        host, port = web_server.start()
+        server = IN_PROCESS_SERVER
+
+    try:
+        stats, elapsed = asyncio.run(run_load(
+            host, port, profile, mix, args.think_time, args.max_connections, args.timeout, args.seed, missions
+        ))
+    finally:
+        if web_server is not None:
+            web_server.stop()
+            os.unlink(db_path)
+
+    summary = stats.summary(elapsed)
+    print(f"server: {server}")
+    print(f"peak players={profile.max_players} stages={args.stages or stages} mix={args.mix}")
+    print_report(summary, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"server": server, "elapsed_seconds": elapsed, "stages": stages, "mix": mix, "endpoints": summary}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
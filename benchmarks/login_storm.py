@@ -0,0 +1,177 @@
+"""
+Login storm benchmark.
+
+Starts a WebServer on a temporary database (or targets --url), then fires
+concurrent POST /api/login requests while a separate client keeps sending
+POST /api/command/execute, and reports login throughput and latency next
+to the command latency seen before and during the storm. Everything goes
+through the real HTTP server, so the numbers include request threading
+and the password hashing limit. Run with different --hash-workers values
+to see how many concurrent hashes trade login throughput against command
+latency.
+
+    python benchmarks/login_storm.py --logins 200 --concurrency 32 --hash-workers 2
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import NexusConfig
+from src.core.logger import NexusLogger
+
+PASSWORD = "storm-password"
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+def summarize(name, samples_ms):
+    return (
+        f"{name:<10} n={len(samples_ms):<6} "
+        f"p50={percentile(samples_ms, 0.50):8.2f}ms "
+        f"p99={percentile(samples_ms, 0.99):8.2f}ms "
+        f"max={max(samples_ms, default=0.0):8.2f}ms"
+    )
+
+def post(host, port, path, body, token=None, timeout=60.0):
+    """POST a JSON body; returns (status, parsed response)"""
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("POST", path, json.dumps(body), headers)
+        response = connection.getresponse()
+        data = response.read()
+    finally:
+        connection.close()
+    try:
+        return response.status, json.loads(data) if data else None
+    except ValueError:
+        return response.status, None
+
+def login(host, port, name):
+    status, result = post(host, port, "/api/login", {"username": name, "password": PASSWORD})
+    if status != 200 or not result or not result.get("success"):
+        raise RuntimeError(f"Login failed for {name}: {status} {result}")
+    return result["token"]
+
+def command_traffic(host, port, token, stop_event, samples_ms, failures):
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        status, result = post(host, port, "/api/command/execute", {"command": "ls"}, token)
+        samples_ms.append((time.perf_counter() - start) * 1000)
+        if status != 200 or not result or not result.get("success"):
+            failures.append(status)
+
+def measure_commands(host, port, token, clients, during=None, seconds=1.0):
+    """Command latencies from `clients` threads, for `seconds` or while `during` runs"""
+    stop_event = threading.Event()
+    samples_ms, failures = [], []
+    workers = [
+        threading.Thread(target=command_traffic, args=(host, port, token, stop_event, samples_ms, failures))
+        for _ in range(clients)
+    ]
+    for worker in workers:
+        worker.start()
+    result = during() if during else time.sleep(seconds)
+    stop_event.set()
+    for worker in workers:
+        worker.join()
+    return samples_ms, failures, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins against command traffic over HTTP")
+    parser.add_argument("--players", type=int, default=10, help="Registered players to log in as")
+    parser.add_argument("--logins", type=int, default=200, help="Total login attempts")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent login clients")
+    parser.add_argument("--command-clients", type=int, default=1, help="Concurrent command clients")
+    parser.add_argument("--hash-workers", type=int, default=2, help="Password hashes allowed at once (in-process server)")
+    parser.add_argument("--algorithm", default="scrypt", choices=["scrypt", "pbkdf2_sha256"])
+    parser.add_argument("--scrypt-n", type=int, default=2 ** 14)
+    parser.add_argument("--pbkdf2-iterations", type=int, default=600000)
+    parser.add_argument("--url", help="Target a running server instead of starting one in-process")
+    args = parser.parse_args()
+
+    web_server = None
+    db_path = None
+    if args.url:
+        target = urllib.parse.urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        from src.server.web_server import WebServer
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = db_path
+        config.server.host = "127.0.0.1"
+        config.server.port = 0
+        # All clients share one IP
+        config.game.rate_limiting_enabled = False
+        config.security.password_hash_algorithm = args.algorithm
+        config.security.scrypt_n = args.scrypt_n
+        config.security.pbkdf2_iterations = args.pbkdf2_iterations
+        config.security.password_hash_workers = args.hash_workers
+        # Per-request INFO logging would dominate the measurement
+        NexusLogger.initialize("WARNING")
+        web_server = WebServer(config)
+        host, port = web_server.start()
+
+    try:
+        run_id = uuid.uuid4().hex[:4]
+        names = [f"storm{run_id}_{i}" for i in range(args.players)]
+        commander = f"cmd{run_id}"
+        for name in names + [commander]:
+            post(host, port, "/api/register", {"username": name, "password": PASSWORD})
+        token = login(host, port, commander)
+
+        # Baseline command latency with no logins running
+        baseline_ms, baseline_failures, _ = measure_commands(host, port, token, args.command_clients)
+
+        def storm():
+            def timed_login(index):
+                start = time.perf_counter()
+                login(host, port, names[index % len(names)])
+                return (time.perf_counter() - start) * 1000
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+                latencies = list(clients.map(timed_login, range(args.logins)))
+            return latencies, time.perf_counter() - started
+
+        # Command latency during the login storm
+        storm_ms, storm_failures, (login_ms, storm_seconds) = measure_commands(
+            host, port, token, args.command_clients, during=storm
+        )
+    finally:
+        if web_server is not None:
+            web_server.stop()
+            os.unlink(db_path)
+
+    print(f"algorithm={args.algorithm} hash_workers={args.hash_workers} concurrency={args.concurrency} "
+          f"command_clients={args.command_clients}")
+    print(f"logins/s   {args.logins / storm_seconds:.1f}")
+    print(summarize("login", login_ms))
+    print(summarize("cmd idle", baseline_ms))
+    print(summarize("cmd storm", storm_ms))
+    if baseline_failures or storm_failures:
+        print(f"failed commands: idle={len(baseline_failures)} storm={len(storm_failures)}")
+    if baseline_ms and storm_ms:
+        print(f"cmd p50 slowdown x{statistics.median(storm_ms) / statistics.median(baseline_ms):.2f}")
+
+if __name__ == "__main__":
+    main()
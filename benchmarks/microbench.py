@@ -0,0 +1,295 @@
+"""
+Microbenchmarks for core hot paths, with JSON baselines and regression gates.
+
+Each case is timed in rounds: the loop count is calibrated so one round
+takes at least --min-time seconds, then --rounds rounds are run and the
+median time per operation is reported. Results can be saved as a JSON
+baseline and later compared against it; the comparison exits non-zero
+when any case is slower than the baseline by more than --threshold.
+
+    python benchmarks/microbench.py --save benchmarks/baselines/local.json
+    python benchmarks/microbench.py --compare benchmarks/baselines/local.json --threshold 0.15
+    python benchmarks/microbench.py --filter repository --sizes 10000,100000,1000000
+
+Repository cases build a database of each --sizes row count once and
+reuse it across cases; a million rows takes a few minutes and about 2 GB
+of temporary disk. Baselines are only comparable on the same machine and
+Python version, which are recorded in the JSON.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.events import Event, EventBus, GameEvents
+from src.core.logger import NexusLogger
+from src.models.player import Player
+from src.nexus_script.lexer import Lexer, TokenType
+from src.nexus_script.parser import Parser
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.command_service import CommandService
+
+SCRIPT = (
+    'set $ip = "10.0.0.1"\n'
+    'scan($ip, 22)\n'
+    'set $node = new Node(42, "core")\n'
+    'print(hash($node))\n'
+) * 50
+
+# Arguments that make every builtin take its normal (successful where possible) path
+COMMAND_LINES = {
+    "set": "set $target = 10.0.0.1",
+    "ls": "ls -la",
+    "cat": "cat data.txt",
+    "scan": "scan 10.0.0.1",
+    "hashcrack": "hashcrack 5f4dcc3b5aa765d61d8327deb882cf99",
+    "dos_attack": "dos_attack nobody",
+}
+
+class Case:
+    """One benchmark: fn is called repeatedly; each call performs ops operations"""
+
+    def __init__(self, name, fn, ops=1, teardown=None):
+        self.name = name
+        self.fn = fn
+        self.ops = ops
+        self.teardown = teardown
+
+def time_case(case, rounds, min_time):
+    """Median and minimum seconds per operation over the timed rounds"""
+    fn = case.fn
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        # Extrapolate once the round is long enough to time reliably
+        if elapsed > min_time / 10:
+            loops = int(loops * min_time * 1.2 / elapsed) + 1
+        else:
+            loops *= 10
+
+    per_op = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_op.append((time.perf_counter() - started) / (loops * case.ops))
+    return {
+        "median_ns": statistics.median(per_op) * 1e9,
+        "min_ns": min(per_op) * 1e9,
+        "loops": loops,
+        "rounds": rounds,
+    }
+
+def benchmark_player():
+    player = Player("Benchmark")
+    player.stats.level = 12
+    player.stats.credits = 5000
+    data = player.to_dict()
+    yield Case("player.to_dict", player.to_dict)
+    yield Case("player.from_dict", lambda: Player.from_dict(data))
+
+def build_player_database(path, rows):
+    """Bulk-load rows players into a fresh repository database"""
+    repository = SQLitePlayerRepository(path)
+    template = Player("template").to_dict()
+    created = datetime(2025, 1, 1).isoformat()
+    rng = random.Random(rows)
+
+    def generate():
+        for i in range(rows):
+            name = f"bench_{i:07d}"
+            level, credits, missions = rng.randint(1, 60), rng.randint(0, 1000000), rng.randint(0, 200)
+            data = dict(template, id=f"bench-{i}", name=name)
+            data["stats"] = dict(template["stats"], level=level, credits=credits, total_missions_completed=missions)
+            yield (f"bench-{i}", name, created, created, level, credits, missions, json.dumps(data))
+
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO players (id, name, created_at, last_login, level, credits, missions_completed, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            generate()
+        )
+    return repository
+
+REPOSITORY_CASES = ("find_by_name", "find_by_name_miss", "save", "get_leaderboard")
+
+def benchmark_repository(sizes, name_filter=None):
+    for rows in sizes:
+        names = [f"repository.{case}[{rows}]" for case in REPOSITORY_CASES]
+        if name_filter and not any(name_filter in name for name in names):
+            # Skip building a database nothing will use
+            continue
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        started = time.perf_counter()
+        repository = build_player_database(path, rows)
+        print(f"  built {rows} players in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+        rng = random.Random(7)
+        names = [f"bench_{rng.randrange(rows):07d}" for _ in range(1024)]
+        lookups = itertools.cycle(names)
+        player = repository.find_by_name(names[0])
+
+        yield Case(f"repository.find_by_name[{rows}]", lambda: repository.find_by_name(next(lookups)))
+        yield Case(f"repository.find_by_name_miss[{rows}]", lambda: repository.find_by_name("no_such_player"))
+        yield Case(f"repository.save[{rows}]", lambda: repository.save(player))
+        yield Case(f"repository.get_leaderboard[{rows}]", lambda: repository.get_leaderboard("credits", 10),
+                   teardown=lambda path=path: os.unlink(path))
+
+def benchmark_event_bus():
+    class CountingHandler:
+        def __init__(self):
+            self.count = 0
+
+        def handle(self, event):
+            self.count += 1
+            return True
+
+    for fan_out in (1, 10, 100):
+        bus = EventBus()
+        for _ in range(fan_out):
+            bus.subscribe(GameEvents.COMMAND_EXECUTED, CountingHandler())
+        event = Event(GameEvents.COMMAND_EXECUTED, {"player_id": "p1", "command": "ls"}, source="benchmark")
+        yield Case(f"event_bus.publish[{fan_out} handlers]", lambda bus=bus, event=event: bus.publish(event))
+
+def benchmark_commands():
+    service = CommandService(EventBus())
+    # VIP with credits and level to spare, so no command sleeps or runs short of credits
+    player = Player("Commander", is_vip=True)
+    player.stats.level = 50
+    for name in sorted(service.commands):
+        command_line = COMMAND_LINES.get(name, name)
+        # Commands start locked behind the K-Map
+        player.knowledge_map.unlock_command(name)
+
+        def run(command_line=command_line):
+            player.stats.credits = 10 ** 9
+            return service.execute_command(player, command_line)
+
+        # Timing a failing command would gate on its error path, so it is left out
+        result = run()
+        if not result.success:
+            print(f"skipping command.execute[{name}]: {result.error or result.output}", file=sys.stderr)
+            continue
+        yield Case(f"command.execute[{name}]", run)
+
+def benchmark_nexus_script():
+    def lex():
+        lexer = Lexer(SCRIPT)
+        while lexer.next_token().type != TokenType.EOF:
+            pass
+
+    token_count = 0
+    lexer = Lexer(SCRIPT)
+    while lexer.next_token().type != TokenType.EOF:
+        token_count += 1
+    # Per-token cost, so the numbers read as throughput
+    yield Case("lexer.tokenize[per token]", lex, ops=token_count)
+    statements = len(Parser(Lexer(SCRIPT)).parse_program().statements)
+    yield Case("parser.parse_program[per statement]", lambda: Parser(Lexer(SCRIPT)).parse_program(), ops=statements)
+
+def all_cases(sizes, name_filter=None):
+    yield from benchmark_player()
+    yield from benchmark_event_bus()
+    yield from benchmark_commands()
+    yield from benchmark_nexus_script()
+    yield from benchmark_repository(sizes, name_filter)
+
+def run(sizes, name_filter, rounds, min_time):
+    results = {}
+    for case in all_cases(sizes, name_filter):
+        try:
+            if name_filter and name_filter not in case.name:
+                continue
+            results[case.name] = time_case(case, rounds, min_time)
+            print(f"{case.name:<48}{format_ns(results[case.name]['median_ns']):>12}", file=sys.stderr)
+        finally:
+            if case.teardown:
+                case.teardown()
+    return results
+
+def format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+def compare(baseline, results, threshold):
+    """Print a comparison table; returns the names of regressed cases"""
+    regressions = []
+    print(f"{'case':<48}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<48}{'-':>12}{format_ns(result['median_ns']):>12}{'new':>9}")
+            continue
+        change = result["median_ns"] / before["median_ns"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48}{format_ns(before['median_ns']):>12}{format_ns(result['median_ns']):>12}{change:>+9.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark core hot paths")
+    parser.add_argument("--sizes", default="10000,100000", help="Player row counts for repository cases")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per round")
+    parser.add_argument("--save", help="Write results to this JSON baseline")
+    parser.add_argument("--compare", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Fractional slowdown of the median that fails the comparison")
+    args = parser.parse_args()
+
+    # Logging would dominate most of these cases
+    NexusLogger.initialize("CRITICAL")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run(sizes, args.filter, args.rounds, args.min_time)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "sqlite": sqlite3.sqlite_version,
+                    "machine": platform.platform(),
+                    "run_id": uuid.uuid4().hex[:8],
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved {len(results)} results to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["python"] != platform.python_version():
+            print(f"warning: baseline was recorded on Python {baseline['meta']['python']}", file=sys.stderr)
+        regressions = compare(baseline["results"], results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
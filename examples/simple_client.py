@@ -4,7 +4,7 @@ Simple client example for Nexus Root MMORPG API
 
 import requests
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class NexusClient:
     """Simple HTTP client for Nexus Root MMORPG API"""
@@ -14,7 +14,7 @@ class NexusClient:
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
         self.player_name: Optional[str] = None
-        self.session_id: Optional[str] = None
+        self.token: Optional[str] = None
     
     def _request(self, method: str, endpoint: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make HTTP request to API"""
@@ -41,31 +41,37 @@ class NexusClient:
             "is_vip": is_vip
         })
     
-    def login(self, name: str, session_id: str = None) -> Dict[str, Any]:
-        """Login with a player"""
-        result = self._request("POST", "/api/player/login", {
-            "name": name,
-            "session_id": session_id or f"session_{name}"
+    def register(self, name: str, password: str) -> Dict[str, Any]:
+        """Register a player account"""
+        return self._request("POST", "/api/register", {
+            "username": name,
+            "password": password
+        })
+    
+    def login(self, name: str, password: str) -> Dict[str, Any]:
+        """Login and keep the signed session token for later requests"""
+        result = self._request("POST", "/api/login", {
+            "username": name,
+            "password": password
         })
         
         if result.get("success"):
             self.player_name = name
-            self.session_id = session_id or f"session_{name}"
+            self.token = result["token"]
+            self.session.headers["Authorization"] = f"Bearer {self.token}"
         
         return result
     
     def logout(self) -> Dict[str, Any]:
-        """Logout current player"""
+        """Logout current player and revoke the session token"""
         if not self.player_name:
             return {"success": False, "error": "No player logged in"}
         
-        result = self._request("POST", "/api/player/logout", {
-            "name": self.player_name
-        })
+        result = self._request("POST", "/api/logout")
         
-        if result.get("success"):
-            self.player_name = None
-            self.session_id = None
+        self.player_name = None
+        self.token = None
+        self.session.headers.pop("Authorization", None)
         
         return result
     
@@ -75,10 +81,19 @@ class NexusClient:
             return {"success": False, "error": "No player logged in"}
         
         return self._request("POST", "/api/command/execute", {
-            "player_name": self.player_name,
             "command": command
         })
     
+    def execute_commands(self, commands: List[str], stop_on_error: bool = False) -> Dict[str, Any]:
+        """Execute several game commands in one request"""
+        if not self.player_name:
+            return {"success": False, "error": "No player logged in"}
+        
+        return self._request("POST", "/api/command/batch", {
+            "commands": commands,
+            "stop_on_error": stop_on_error
+        })
+    
     def get_player_info(self, name: str = None) -> Dict[str, Any]:
         """Get player information"""
         target_name = name or self.player_name
@@ -153,22 +168,23 @@ def main():
         print(f"Server error: {stats.get('error')}")
         return
     
-    # Create or login player
+    # Register or login player
     player_name = "ClientTest"
+    password = "client-test-password"
     
-    # Try to create player
-    result = client.create_player(player_name, is_vip=False)
+    # Try to register player
+    result = client.register(player_name, password)
     if not result.get("success") and "already taken" in result.get("error", ""):
         print(f"Player {player_name} already exists")
     elif result.get("success"):
-        print(f"Created player: {player_name}")
+        print(f"Registered player: {player_name}")
     
     # Login
-    result = client.login(player_name)
+    result = client.login(player_name, password)
     if result.get("success"):
         print(f"Logged in as: {player_name}")
-        player_data = result["data"]
-        print(f"Level: {player_data['level']}, Credits: {player_data['credits']}")
+        player_data = client.get_player_info().get("data", {})
+        print(f"Level: {player_data.get('level')}, Credits: {player_data.get('credits')}")
     else:
         print(f"Login failed: {result.get('error')}")
         return
@@ -177,9 +193,12 @@ def main():
     print("\nExecuting commands:")
     
     commands = ["ls", "cat data.txt", "status"]
-    for cmd in commands:
+    batch = client.execute_commands(commands)
+    results = batch.get("data", {}).get("results", [])
+    if not results:
+        print(f"Error: {batch.get('error')}")
+    for cmd, result in zip(commands, results):
         print(f"\n> {cmd}")
-        result = client.execute_command(cmd)
         if result.get("success"):
             print(result.get("output", ""))
         else:
@@ -1,12 +1,19 @@
 import sqlite3
 import uuid
-import hashlib
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import NexusConfig
+from src.services.password_hasher import PasswordHasher
 
 def create_admin_user(db_path, username, password):
     """Create a new admin user"""
     try:
         with sqlite3.connect(db_path) as conn:
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            password_hash = PasswordHasher.from_config(NexusConfig.load_from_file().security).hash(password)
             admin_id = str(uuid.uuid4())
 
             conn.execute(
@@ -29,4 +36,4 @@ if __name__ == "__main__":
     parser.add_argument("--password", required=True, help="Admin password")
     args = parser.parse_args()
 
-    create_admin_user(args.db_path, args.username, args.password)
\ No newline at end of file
+    create_admin_user(args.db_path, args.username, args.password)
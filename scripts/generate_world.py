@@ -0,0 +1,318 @@
+"""
+Generate a synthetic game world for load, benchmark and migration testing.
+
+Players get skewed, correlated stats: most accounts are young and low
+level, credits are log-normal around a level-dependent median, hardware
+tiers and unlocked commands follow level, and a small share of players
+is VIP, online or banned. Missions come from a generated catalog and are
+assigned as completed or active according to each player's level.
+
+    python scripts/generate_world.py --db-path world.db --players 1000000 --seed 42
+
+Rows are written with executemany in large transactions on a connection
+with journaling and fsync off, with the secondary indexes and the name
+search triggers dropped; the repositories recreate both once the load is
+done, which is much faster than maintaining them row by row. The same
+seed and --as-of date always produce the same rows. Generated players
+have no password, so they can only be used through session logins.
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.logger import NexusLogger
+from src.models.mission import MissionType
+from src.models.player import Player
+from src.repositories.sqlite_mission_repository import SQLiteMissionRepository
+from src.repositories.query_log import QUERY_LOG
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+
+MAX_LEVEL = 100
+MAX_TIER = 10
+
+# Level at which each initially locked command is usually unlocked
+COMMAND_UNLOCK_LEVELS = {
+    "scan": 2, "run": 4, "hashcrack": 6, "pivot": 10, "thread spawn": 15, "raw": 20, "edit": 25,
+}
+
+NAME_PREFIXES = ("zero", "null", "ghost", "root", "cyber", "dark", "neon", "byte", "hex", "void",
+                 "echo", "proxy", "rogue", "silent", "static", "quantum", "binary", "crypt")
+NAME_SUFFIXES = ("cat", "runner", "shell", "wolf", "fox", "daemon", "phantom", "spider", "coder",
+                 "hawk", "blade", "signal", "vector", "wraith", "pilot", "nomad", "viper", "agent")
+THEMES = ("default", "default", "default", "matrix", "amber", "solarized", "dracula")
+BAN_REASONS = ("Cheating", "Exploit abuse", "Harassment", "Botting", "Chargeback")
+FRAGMENTS = ("crypto", "network", "kernel", "forensics", "exploit", "social")
+ITEMS = ("data_chip", "proxy_token", "decryptor", "firewall_patch", "overclock_kit")
+MISSION_TYPES = (MissionType.MAIN, MissionType.SIDE, MissionType.SIDE, MissionType.DAILY,
+                 MissionType.WEEKLY, MissionType.SPECIAL)
+
+def generate_missions(rng, count, as_of):
+    """Mission catalog rows, each with a level requirement spread over the level range"""
+    created = (as_of - timedelta(days=730)).isoformat()
+    catalog = []
+    for i in range(count):
+        mission_type = MISSION_TYPES[i % len(MISSION_TYPES)]
+        # Denser at low levels, where most players are
+        level_requirement = 1 + int((i / max(1, count - 1)) ** 2 * (MAX_LEVEL - 1))
+        data = {
+            "id": f"world_{i:04d}",
+            "name": f"{rng.choice(NAME_PREFIXES).title()} {rng.choice(NAME_SUFFIXES).title()} {i}",
+            "description": "Generated mission",
+            "type": mission_type.value,
+            "status": "available",
+            "difficulty": min(5, 1 + level_requirement // 20),
+            "category": rng.choice(FRAGMENTS),
+            "tags": ["generated"],
+            "level_requirement": level_requirement,
+            "time_limit_hours": 24 if mission_type == MissionType.DAILY else None,
+            "prerequisites": [],
+            "reward": {
+                "experience": 50 * level_requirement,
+                "credits": 25 * level_requirement,
+                "items": {},
+                "unlocked_commands": [],
+                "knowledge_fragments": {},
+            },
+            "objectives": [
+                {"id": f"objective_{n}", "description": "Generated objective",
+                 "required_count": rng.randint(1, 5), "current_count": 0, "is_completed": False}
+                for n in range(rng.randint(1, 3))
+            ],
+            "created_at": created,
+            "started_at": None,
+            "completed_at": None,
+            "player_id": None,
+        }
+        catalog.append(data)
+    return catalog
+
+class WorldGenerator:
+    """Deterministic stream of player rows for a seed and reference time"""
+
+    def __init__(self, seed, as_of, missions):
+        self.rng = random.Random(seed)
+        self.as_of = as_of
+        # The catalog is ordered by level requirement, so eligible missions are a prefix
+        self.mission_ids = [mission["id"] for mission in missions]
+        self.mission_levels = [mission["level_requirement"] for mission in missions]
+        self.template = Player("template").to_dict()
+
+    def player(self, index):
+        """One player's column values and serialized data, plus a session row if online"""
+        rng = self.rng
+        template = self.template
+        player_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        name = f"{rng.choice(NAME_PREFIXES)}_{rng.choice(NAME_SUFFIXES)}{index}"
+
+        # Account age skews young; older accounts reach higher levels
+        age_days = min(730.0, rng.expovariate(1 / 180))
+        created_at = self.as_of - timedelta(days=age_days)
+        maturity = age_days / 730
+        level = min(MAX_LEVEL, 1 + int(rng.expovariate(1 / (2 + 25 * maturity))))
+        is_vip = rng.random() < 0.05
+
+        online = rng.random() < 0.02
+        if online:
+            last_login = self.as_of - timedelta(minutes=rng.uniform(0, 120))
+        else:
+            last_login = created_at + (self.as_of - created_at) * rng.random() ** 0.3
+        session_id = str(uuid.UUID(int=rng.getrandbits(128), version=4)) if online else None
+
+        median_credits = 40 * level * (3 if is_vip else 1)
+        credits = int(rng.lognormvariate(math.log(median_credits), 1.0))
+
+        # Components cluster around a level-based tier
+        base_tier = 1 + level // 12
+        tiers = [max(1, min(MAX_TIER, base_tier + rng.choice((-1, 0, 0, 0, 1)))) for _ in range(4)]
+
+        integrated = list(template["knowledge_map"]["integrated_commands"])
+        unlocked, locked = [], []
+        for command, unlock_level in COMMAND_UNLOCK_LEVELS.items():
+            if level < unlock_level:
+                locked.append(command)
+            elif level >= unlock_level + 5 and rng.random() < 0.7:
+                integrated.append(command)
+            else:
+                unlocked.append(command)
+        fragments = {
+            fragment: rng.randint(1, level) for fragment in rng.sample(FRAGMENTS, min(len(FRAGMENTS), level // 8))
+        }
+
+        # Missions are worked through roughly in catalog order
+        eligible = bisect.bisect_right(self.mission_levels, level)
+        done = int(eligible * rng.uniform(0.3, 1.0))
+        completed_ids = self.mission_ids[:done]
+        active_ids = self.mission_ids[done:min(eligible, done + rng.randint(0, 3))]
+
+        playtime = int(age_days * rng.uniform(5, 60) * (0.5 + maturity))
+        banned = rng.random() < 0.005
+        ban_reason = rng.choice(BAN_REASONS) if banned else None
+        ban_expires_at = None
+        if banned and rng.random() < 0.6:
+            ban_expires_at = (self.as_of + timedelta(days=rng.randint(1, 30))).isoformat()
+
+        data = dict(template)
+        data.update({
+            "id": player_id,
+            "name": name,
+            "is_vip": is_vip,
+            "session_id": session_id,
+            "created_at": created_at.isoformat(),
+            "last_login": last_login.isoformat(),
+            "is_online": online,
+            "stats": {
+                "level": level,
+                "experience": rng.randrange(level * 100),
+                "credits": credits,
+                "total_commands_executed": int(playtime * rng.uniform(0.5, 3)),
+                "total_scripts_executed": int(playtime * rng.uniform(0, 0.2)),
+                "total_missions_completed": len(completed_ids),
+                "playtime_minutes": playtime,
+            },
+            "virtual_computer": dict(
+                template["virtual_computer"],
+                cpu_tier=tiers[0], ram_tier=tiers[1], nic_tier=tiers[2], ssd_tier=tiers[3],
+                last_maintenance=last_login.isoformat(),
+                total_uptime_minutes=playtime,
+                total_commands_processed=int(playtime * rng.uniform(0.5, 3)),
+            ),
+            "knowledge_map": {
+                "integrated_commands": integrated,
+                "unlocked_commands": unlocked,
+                "locked_commands": locked,
+                "knowledge_fragments": fragments,
+            },
+            "active_missions": active_ids,
+            "completed_missions": completed_ids,
+            "inventory": {item: rng.randint(1, 5) for item in rng.sample(ITEMS, rng.randint(0, 2))},
+            "settings": dict(template["settings"], theme=rng.choice(THEMES)),
+            "banned": banned,
+            "ban_reason": ban_reason,
+            "ban_expires_at": ban_expires_at,
+        })
+        row = (player_id, name, is_vip, session_id, data["created_at"], data["last_login"], online,
+               level, credits, len(completed_ids), int(banned), ban_reason, ban_expires_at, json.dumps(data))
+        session = None
+        if online:
+            expires_at = (self.as_of + timedelta(hours=1)).timestamp()
+            session = (str(uuid.UUID(int=rng.getrandbits(128), version=4)), player_id, session_id, expires_at)
+        return row, session
+
+def drop_load_indexes(conn):
+    """Drop secondary player indexes and name search upkeep; returns the dropped index names"""
+    indexes = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'players' AND sql IS NOT NULL"
+    )]
+    for index in indexes:
+        conn.execute(f'DROP INDEX "{index}"')
+    for trigger in ("players_fts_insert", "players_fts_delete", "players_fts_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    # The repository rebuilds the search table from players when it is missing
+    conn.execute("DROP TABLE IF EXISTS players_fts")
+    return indexes
+
+def generate_world(db_path, players, seed=0, missions=200, batch_size=50000, as_of=None, progress=None):
+    """Create db_path and fill it with a generated world; returns row counts"""
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    as_of = as_of or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    SQLitePlayerRepository(db_path)
+    SQLiteMissionRepository(db_path)
+    catalog = generate_missions(random.Random(seed), missions, as_of)
+    generator = WorldGenerator(seed, as_of, catalog)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    sessions = 0
+    try:
+        # A failed load leaves a throwaway file, so durability buys nothing here
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -262144")
+        drop_load_indexes(conn)
+
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO missions (id, name, type, status, player_id, created_at, started_at, completed_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(m["id"], m["name"], m["type"], m["status"], None, m["created_at"], None, None, json.dumps(m))
+             for m in catalog]
+        )
+        conn.execute("COMMIT")
+
+        written = 0
+        while written < players:
+            count = min(batch_size, players - written)
+            rows, session_rows = [], []
+            for index in range(written, written + count):
+                row, session = generator.player(index)
+                rows.append(row)
+                if session:
+                    session_rows.append(session)
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO players (id, name, is_vip, session_id, created_at, last_login, is_online, "
+                "level, credits, missions_completed, banned, ban_reason, ban_expires_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.executemany(
+                "INSERT INTO sessions (id, player_id, token, expires_at) VALUES (?, ?, ?, ?)", session_rows
+            )
+            conn.execute("COMMIT")
+            written += count
+            sessions += len(session_rows)
+            if progress:
+                progress(written)
+    finally:
+        conn.close()
+
+    # Recreates the dropped indexes, triggers and search table in one pass each
+    SQLitePlayerRepository(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ANALYZE")
+    return {"players": players, "missions": len(catalog), "sessions": sessions}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic game world database")
+    parser.add_argument("--db-path", required=True, help="Database file to create")
+    parser.add_argument("--players", type=int, default=100000, help="Number of players")
+    parser.add_argument("--missions", type=int, default=200, help="Size of the mission catalog")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Players per transaction")
+    parser.add_argument("--as-of", help="Reference date (YYYY-MM-DD) for generated timestamps; default today")
+    args = parser.parse_args()
+
+    NexusLogger.initialize("WARNING")
+    # Index builds after the load would all be reported as slow queries
+    QUERY_LOG.configure(QUERY_LOG.slow_query_ms, enabled=False)
+    as_of = datetime.strptime(args.as_of, "%Y-%m-%d") if args.as_of else None
+    started = time.perf_counter()
+
+    def progress(written):
+        elapsed = time.perf_counter() - started
+        print(f"  {written} players ({written / elapsed:,.0f}/s)", file=sys.stderr)
+
+    try:
+        counts = generate_world(args.db_path, args.players, args.seed, args.missions, args.batch_size,
+                                as_of, progress)
+    except FileExistsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Generated {counts['players']} players, {counts['missions']} missions and "
+          f"{counts['sessions']} sessions in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
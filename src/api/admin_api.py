@@ -5,7 +5,8 @@ Admin API for managing the game
 from typing import Dict, Any, List, Optional
 from ..services.player_service import PlayerService
 from ..services.admin_service import AdminService
-from ..core.exceptions import NexusException, AuthenticationError
+from ..services.analytics_service import AnalyticsService
+from ..core.exceptions import NexusException, AuthenticationError, ConfigurationError
 from ..core.logger import NexusLogger
 
 class AdminAPI:
@@ -13,19 +14,53 @@ class AdminAPI:
     Admin API for managing the game
     """
 
-    def __init__(self, player_service: PlayerService, admin_service: AdminService):
+    def __init__(self, player_service: PlayerService, admin_service: AdminService,
+                 analytics_service: AnalyticsService = None):
         """Initialize the Admin API"""
         self.player_service = player_service
         self.admin_service = admin_service
+        self.analytics_service = analytics_service
         self.logger = NexusLogger.get_logger("admin_api")
 
-    def get_all_players(self, search: str = None, sort: str = "name", order: str = "asc") -> Dict[str, Any]:
-        """Get all players"""
+    def get_all_players(self, search: str = None, sort: str = "name", order: str = "asc", cursor: str = None,
+                        limit: int = 50, fields: List[str] = None) -> Dict[str, Any]:
+        """Get one page of players"""
         try:
-            players = self.admin_service.get_all_players(search, sort, order)
+            players, next_cursor = self.admin_service.get_all_players(search, sort, order, cursor, limit, fields)
             return {
                 "success": True,
-                "data": [player.to_dict() for player in players]
+                "data": players,
+                "next_cursor": next_cursor
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def export_players(self, export_format: str = "ndjson", fields: List[str] = None) -> Dict[str, Any]:
+        """Export all players; on success the data is an iterator of text chunks"""
+        try:
+            content_type, chunks = self.admin_service.export_players(export_format, fields)
+            return {
+                "success": True,
+                "content_type": content_type,
+                "chunks": chunks
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def search_players(self, query: str, limit: int = 20) -> Dict[str, Any]:
+        """Search players by partial name"""
+        try:
+            return {
+                "success": True,
+                "data": self.admin_service.search_players(query, limit)
             }
         except NexusException as e:
             return {
@@ -85,10 +120,10 @@ class AdminAPI:
                 "code": e.code
             }
 
-    def ban_player(self, player_id: str) -> Dict[str, Any]:
+    def ban_player(self, player_id: str, reason: str = None, duration_minutes: int = None) -> Dict[str, Any]:
         """Ban a player"""
         try:
-            success, message = self.admin_service.ban_player(player_id)
+            success, message = self.admin_service.ban_player(player_id, reason, duration_minutes)
             return {
                 "success": success,
                 "message": message
@@ -115,6 +150,62 @@ class AdminAPI:
                 "code": e.code
             }
 
+    def ban_players(self, player_ids: List[str], reason: str = None, duration_minutes: int = None) -> Dict[str, Any]:
+        """Ban many players"""
+        try:
+            return {
+                "success": True,
+                "data": self.admin_service.ban_players(player_ids, reason, duration_minutes)
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def unban_players(self, player_ids: List[str]) -> Dict[str, Any]:
+        """Unban many players"""
+        try:
+            return {
+                "success": True,
+                "data": self.admin_service.unban_players(player_ids)
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def ban_ips(self, ip_addresses: List[str]) -> Dict[str, Any]:
+        """Ban many IP addresses or ranges"""
+        try:
+            return {
+                "success": True,
+                "data": self.admin_service.ban_ips(ip_addresses)
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def unban_ips(self, ip_addresses: List[str]) -> Dict[str, Any]:
+        """Unban many IP addresses or ranges"""
+        try:
+            return {
+                "success": True,
+                "data": self.admin_service.unban_ips(ip_addresses)
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
     def get_banned_players(self) -> Dict[str, Any]:
         """Get banned players"""
         try:
@@ -130,6 +221,22 @@ class AdminAPI:
                 "code": e.code
             }
 
+    def get_player_analytics(self, multipliers: List[float] = None, refresh: bool = False) -> Dict[str, Any]:
+        """Get level, credit and hardware distributions, with credit multiplier what-ifs"""
+        try:
+            if self.analytics_service is None:
+                raise ConfigurationError("Player analytics are not configured")
+            return {
+                "success": True,
+                "data": self.analytics_service.get_report(multipliers or [], refresh)
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
     def send_announcement(self, message: str) -> Dict[str, Any]:
         """Send an announcement to all online players"""
         try:
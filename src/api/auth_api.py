@@ -34,4 +34,15 @@ class AuthAPI:
             token = self.auth_service.login(username, password)
             return {"success": True, "token": token}
         except NexusException as e:
-            return {"success": False, "error": e.message}
\ No newline at end of file
+            return {"success": False, "error": e.message}
+
+    def logout(self, token: str) -> Dict[str, Any]:
+        """Revoke a player session token"""
+        if not token:
+            return {"success": False, "error": "Missing session token"}
+
+        try:
+            self.auth_service.logout(token)
+            return {"success": True, "message": "Logged out"}
+        except NexusException as e:
+            return {"success": False, "error": e.message}
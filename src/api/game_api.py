@@ -6,13 +6,21 @@ from typing import Dict, Any, List, Optional
 from ..services.player_service import PlayerService
 from ..services.command_service import CommandService
 from ..services.mission_service import MissionService
+from ..services.statistics_service import StatisticsService
+from ..services.script_service import ScriptService
 from ..repositories.sqlite_player_repository import SQLitePlayerRepository
 from ..repositories.sqlite_mission_repository import SQLiteMissionRepository
+from ..repositories.query_log import QUERY_LOG
+from ..nexus_script.executor import DEFAULT_MODULE, ScriptExecutor
+from ..nexus_script.profiler import ScriptProfiler
 from ..core.events import EventBus
 from ..core.config import NexusConfig
 from ..core.exceptions import NexusException, ValidationError, AuthenticationError
+from ..core.locks import KeyedLocks, locked_by_player
 from ..core.logger import NexusLogger
+from ..core.tracing import trace_methods
 
+@trace_methods("GameAPI")
 class GameAPI:
     """
     Main Game API for external integration
@@ -26,6 +34,12 @@ class GameAPI:
         self.config = config or NexusConfig.load_from_file()
         self.logger = NexusLogger.get_logger("game_api")
         self.event_bus = EventBus()
+        # Requests run on their own threads; each loads, changes and saves
+        # a player, so calls for the same player must not interleave
+        self.player_locks = KeyedLocks()
+        
+        # Statement timing for every repository connection
+        QUERY_LOG.configure(self.config.database.slow_query_ms, self.config.database.query_log_enabled)
         
         # Initialize repositories
         self.player_repository = SQLitePlayerRepository(self.config.database.database)
@@ -35,6 +49,17 @@ class GameAPI:
         self.player_service = PlayerService(self.player_repository, self.event_bus)
         self.command_service = CommandService(self.event_bus, self.player_service)
         self.mission_service = MissionService(self.mission_repository, self.event_bus)
+        self.statistics_service = StatisticsService(
+            self.player_repository,
+            self.mission_repository,
+            self.event_bus,
+            self.config.monitoring.statistics_max_staleness_seconds
+        )
+        
+        # Initialize NexusScript execution (in-process or process pool)
+        self.script_profiler = ScriptProfiler()
+        self.script_executor = ScriptExecutor.from_config(self.config.game, self.script_profiler)
+        self.script_service = ScriptService(self.script_executor, self.event_bus)
         
         # Setup event handlers
         self._setup_event_handlers()
@@ -43,7 +68,7 @@ class GameAPI:
     
     def _setup_event_handlers(self):
         """Setup event handlers for cross-service communication"""
-        from ..core.events import GameEvents
+        from ..core.events import GameEvents, PlayerEvents
         
         # Handle command execution for mission progress
         class CommandMissionHandler:
@@ -66,6 +91,17 @@ class GameAPI:
             GameEvents.COMMAND_EXECUTED,
             CommandMissionHandler(self.mission_service, self.player_service)
         )
+
+        # Drop script variables on logout so they are not kept for the life of the process
+        class ScriptEnvironmentHandler:
+            def __init__(self, script_executor):
+                self.script_executor = script_executor
+
+            def handle(self, event):
+                self.script_executor.discard_environment(event.data["player_name"])
+                return True
+
+        self.event_bus.subscribe(PlayerEvents.PLAYER_LOGGED_OUT, ScriptEnvironmentHandler(self.script_executor))
     
     # Player Management API
     
@@ -105,6 +141,7 @@ class GameAPI:
                 "error": str(e)
             }
     
+    @locked_by_player
     def authenticate_player(self, name: str, session_id: str = None, ip_address: str = None) -> Dict[str, Any]:
         """Authenticate a player"""
         try:
@@ -166,6 +203,7 @@ class GameAPI:
                 "code": e.code
             }
     
+    @locked_by_player
     def logout_player(self, player_name: str) -> Dict[str, Any]:
         """Logout a player"""
         try:
@@ -190,6 +228,7 @@ class GameAPI:
     
     # Command Execution API
     
+    @locked_by_player
     def execute_command(self, player_name: str, command_line: str) -> Dict[str, Any]:
         """Execute a command for a player"""
         try:
@@ -201,16 +240,52 @@ class GameAPI:
             self.player_service.check_passive_mining(player)
             
             result = self.command_service.execute_command(player, command_line)
-            
+
             # Save player state after command
             self.player_service.repository.save(player)
-            
+
+            return self._command_response(result)
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    @locked_by_player
+    def execute_commands(self, player_name: str, command_lines: List[str], stop_on_error: bool = False) -> Dict[str, Any]:
+        """Execute several commands in order, loading and saving the player once"""
+        try:
+            if not isinstance(command_lines, list) or not command_lines:
+                raise ValidationError("Missing commands")
+
+            max_commands = self.config.game.max_commands_per_batch
+            if len(command_lines) > max_commands:
+                raise ValidationError(f"Too many commands in batch (max {max_commands})")
+
+            player = self.player_service.get_player_by_name(player_name)
+            if not player:
+                raise AuthenticationError("Player not found")
+
+            self.player_service.check_passive_mining(player)
+
+            results = []
+            for command_line in command_lines:
+                result = self.command_service.execute_command(player, str(command_line))
+                results.append(self._command_response(result))
+                if stop_on_error and not result.success:
+                    break
+
+            # One save for the whole batch
+            self.player_service.repository.save(player)
+
             return {
-                "success": result.success,
-                "output": result.output,
-                "error": result.error if not result.success else None,
-                "execution_time_ms": result.execution_time_ms,
-                "data": result.data
+                "success": all(result["success"] for result in results),
+                "data": {
+                    "results": results,
+                    "executed": len(results),
+                    "total_execution_time_ms": sum(result["execution_time_ms"] for result in results)
+                }
             }
         except NexusException as e:
             return {
@@ -218,7 +293,44 @@ class GameAPI:
                 "error": e.message,
                 "code": e.code
             }
-    
+
+    @locked_by_player
+    def execute_script(self, player_name: str, source: str, module: str = None) -> Dict[str, Any]:
+        """Run a NexusScript program for a player"""
+        try:
+            player = self.player_service.get_player_by_name(player_name)
+            if not player:
+                raise AuthenticationError("Player not found")
+
+            self.player_service.check_passive_mining(player)
+
+            result = self.script_service.execute_script(player, source, module)
+
+            self.player_service.repository.save(player)
+
+            return {
+                "success": True,
+                "output": "" if result.value is None else str(result.value),
+                "data": {
+                    "module": module or DEFAULT_MODULE
+                }
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
+            }
+
+    def _command_response(self, result) -> Dict[str, Any]:
+        return {
+            "success": result.success,
+            "output": result.output,
+            "error": result.error if not result.success else None,
+            "execution_time_ms": result.execution_time_ms,
+            "data": result.data
+        }
+
     def get_available_commands(self, player_name: str) -> Dict[str, Any]:
         """Get available commands for a player"""
         try:
@@ -298,6 +410,7 @@ class GameAPI:
                 "code": e.code
             }
     
+    @locked_by_player
     def start_mission(self, player_name: str, mission_id: str) -> Dict[str, Any]:
         """Start a mission for a player"""
         try:
@@ -322,6 +435,7 @@ class GameAPI:
                 "code": e.code
             }
     
+    @locked_by_player
     def abandon_mission(self, player_name: str, mission_id: str) -> Dict[str, Any]:
         """Abandon a mission for a player"""
         try:
@@ -348,6 +462,7 @@ class GameAPI:
     
     # Hardware Management API
     
+    @locked_by_player
     def upgrade_hardware(self, player_name: str, component: str) -> Dict[str, Any]:
         """Upgrade player hardware"""
         try:
@@ -391,6 +506,7 @@ class GameAPI:
     
     # Game State API
     
+    @locked_by_player
     def start_passive_mining(self, player_name: str, duration_hours: int) -> Dict[str, Any]:
         """Start passive mining for a player"""
         try:
@@ -411,6 +527,7 @@ class GameAPI:
                 "code": e.code
             }
     
+    @locked_by_player
     def check_passive_mining(self, player_name: str) -> Dict[str, Any]:
         """Check passive mining status for a player"""
         try:
@@ -465,16 +582,37 @@ class GameAPI:
     def get_server_statistics(self) -> Dict[str, Any]:
         """Get server statistics"""
         try:
-            stats = {
-                "total_players": self.player_repository.count(),
-                "online_players": self.player_repository.count_online(),
-                "total_missions": self.mission_repository.count(),
-                "mission_statistics": self.mission_repository.get_mission_statistics()
+            return {
+                "success": True,
+                "data": self.statistics_service.get_statistics()
+            }
+        except NexusException as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.code
             }
+    
+    def get_query_stats(self, limit: int = 20, sort: str = "total_ms") -> Dict[str, Any]:
+        """Get per-statement query aggregates, most expensive first"""
+        return {
+            "success": True,
+            "data": {
+                "enabled": QUERY_LOG.enabled,
+                "slow_query_ms": QUERY_LOG.slow_query_ms,
+                "statements": QUERY_LOG.get_stats(limit, sort)
+            }
+        }
+    
+    def get_script_profile(self, player_name: str = None, limit: int = 10) -> Dict[str, Any]:
+        """Get the NexusScript hot-spot report, optionally for one player"""
+        try:
+            report = self.script_profiler.get_report(player_name, limit)
+            report["enabled"] = self.script_executor.profiler is not None
             
             return {
                 "success": True,
-                "data": stats
+                "data": report
             }
         except NexusException as e:
             return {
@@ -511,4 +649,4 @@ class GameAPI:
     def shutdown(self):
         """Shutdown the game API"""
         self.logger.info("Shutting down Game API")
-        # Cleanup and close resources as needed
\ No newline at end of file
+        self.script_executor.shutdown()
\ No newline at end of file
@@ -4,7 +4,7 @@ Configuration management for Nexus Root MMORPG
 
 import os
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 from dataclasses import dataclass, field
 from .exceptions import ConfigurationError
@@ -20,6 +20,8 @@ class DatabaseConfig:
     username: str = ""
     password: str = ""
     pool_size: int = 5
+    query_log_enabled: bool = True
+    slow_query_ms: float = 100.0
 
 @dataclass
 class ServerConfig:
@@ -37,6 +39,67 @@ class GameConfig:
     credit_multiplier: float = 1.0
     xp_multiplier: float = 1.0
     passive_mining_enabled: bool = True
+    script_execution_mode: str = "in_process"
+    script_worker_processes: int = 2
+    script_profiling_enabled: bool = False
+    max_commands_per_batch: int = 50
+    rate_limiting_enabled: bool = True
+    # Route class -> [requests per second, burst size]
+    rate_limits_free: Dict[str, List[float]] = field(default_factory=lambda: {
+        "auth": [0.2, 5], "command": [5, 20], "admin": [20, 60], "read": [10, 40],
+    })
+    rate_limits_vip: Dict[str, List[float]] = field(default_factory=lambda: {
+        "auth": [0.2, 5], "command": [15, 60], "admin": [20, 60], "read": [20, 80],
+    })
+    rate_limit_ip_multiplier: float = 4.0
+
+@dataclass
+class SecurityConfig:
+    """Security configuration"""
+    admin_session_ttl_seconds: int = 3600
+    session_sweep_interval_seconds: int = 60
+    session_sweep_batch_size: int = 500
+    token_secret: str = ""
+    token_key_id: str = "k1"
+    token_previous_secrets: Dict[str, str] = field(default_factory=dict)
+    player_token_ttl_seconds: int = 86400
+    password_hash_algorithm: str = "scrypt"
+    scrypt_n: int = 16384
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iterations: int = 600000
+    password_hash_workers: int = 2
+
+@dataclass
+class MonitoringConfig:
+    """Monitoring configuration"""
+    metrics_enabled: bool = False
+    # Bearer token required to scrape /metrics; /metrics is not served without one
+    metrics_token: str = ""
+    # Fraction of requests traced; 0 disables tracing
+    tracing_sample_rate: float = 0.0
+    # Any of "memory" (served at /admin/api/traces) and "jsonl" (appended to trace_file)
+    tracing_exporters: List[str] = field(default_factory=lambda: ["memory"])
+    trace_file: str = "traces.jsonl"
+    trace_buffer_size: int = 2000
+    # Admin sampling profiler and per-request cProfile (X-Nexus-Profile header)
+    profiling_enabled: bool = True
+    profiler_max_seconds: float = 60.0
+    # Oldest /api/statistics counts may be before they are recounted from the database
+    statistics_max_staleness_seconds: float = 30.0
+
+@dataclass
+class LoggingConfig:
+    """Logging pipeline configuration"""
+    # Records waiting for the writer thread; further records are dropped
+    queue_size: int = 10000
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    # TimedRotatingFileHandler interval (e.g. "midnight"); empty rotates by size
+    rotate_when: str = ""
+    json_format: bool = False
+    # Fraction of DEBUG/INFO records kept per logger, e.g. {"command_service": 0.1}
+    sampling: Dict[str, float] = field(default_factory=dict)
 
 @dataclass
 class NexusConfig:
@@ -44,6 +107,9 @@ class NexusConfig:
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
     server: ServerConfig = field(default_factory=ServerConfig)
     game: GameConfig = field(default_factory=GameConfig)
+    security: SecurityConfig = field(default_factory=SecurityConfig)
+    monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
     log_level: str = "INFO"
     log_file: str = "nexus.log"
     
@@ -65,11 +131,17 @@ class NexusConfig:
             database_config = DatabaseConfig(**config_data.get("database", {}))
             server_config = ServerConfig(**config_data.get("server", {}))
             game_config = GameConfig(**config_data.get("game", {}))
+            security_config = SecurityConfig(**config_data.get("security", {}))
+            monitoring_config = MonitoringConfig(**config_data.get("monitoring", {}))
+            logging_config = LoggingConfig(**config_data.get("logging", {}))
             
             return cls(
                 database=database_config,
                 server=server_config,
                 game=game_config,
+                security=security_config,
+                monitoring=monitoring_config,
+                logging=logging_config,
                 log_level=config_data.get("log_level", "INFO"),
                 log_file=config_data.get("log_file", "nexus.log")
             )
@@ -88,6 +160,8 @@ class NexusConfig:
                 database=os.getenv("NEXUS_DB_NAME", "nexus_root.db"),
                 username=os.getenv("NEXUS_DB_USER", ""),
                 password=os.getenv("NEXUS_DB_PASS", ""),
+                query_log_enabled=os.getenv("NEXUS_QUERY_LOG", "true").lower() == "true",
+                slow_query_ms=float(os.getenv("NEXUS_SLOW_QUERY_MS", "100.0")),
             ),
             server=ServerConfig(
                 host=os.getenv("NEXUS_SERVER_HOST", "0.0.0.0"),
@@ -100,6 +174,48 @@ class NexusConfig:
                 max_threads_per_player=int(os.getenv("NEXUS_MAX_THREADS", "10")),
                 credit_multiplier=float(os.getenv("NEXUS_CREDIT_MULT", "1.0")),
                 xp_multiplier=float(os.getenv("NEXUS_XP_MULT", "1.0")),
+                script_execution_mode=os.getenv("NEXUS_SCRIPT_MODE", "in_process"),
+                script_worker_processes=int(os.getenv("NEXUS_SCRIPT_WORKERS", "2")),
+                script_profiling_enabled=os.getenv("NEXUS_SCRIPT_PROFILING", "false").lower() == "true",
+                max_commands_per_batch=int(os.getenv("NEXUS_MAX_BATCH_COMMANDS", "50")),
+                rate_limiting_enabled=os.getenv("NEXUS_RATE_LIMITING", "true").lower() == "true",
+                rate_limit_ip_multiplier=float(os.getenv("NEXUS_RATE_LIMIT_IP_MULT", "4.0")),
+            ),
+            security=SecurityConfig(
+                admin_session_ttl_seconds=int(os.getenv("NEXUS_ADMIN_SESSION_TTL", "3600")),
+                session_sweep_interval_seconds=int(os.getenv("NEXUS_SESSION_SWEEP_INTERVAL", "60")),
+                session_sweep_batch_size=int(os.getenv("NEXUS_SESSION_SWEEP_BATCH", "500")),
+                token_secret=os.getenv("NEXUS_TOKEN_SECRET", ""),
+                token_key_id=os.getenv("NEXUS_TOKEN_KEY_ID", "k1"),
+                player_token_ttl_seconds=int(os.getenv("NEXUS_PLAYER_TOKEN_TTL", "86400")),
+                password_hash_algorithm=os.getenv("NEXUS_PASSWORD_HASH", "scrypt"),
+                scrypt_n=int(os.getenv("NEXUS_SCRYPT_N", "16384")),
+                pbkdf2_iterations=int(os.getenv("NEXUS_PBKDF2_ITERATIONS", "600000")),
+                password_hash_workers=int(os.getenv("NEXUS_PASSWORD_HASH_WORKERS", "2")),
+            ),
+            monitoring=MonitoringConfig(
+                metrics_enabled=os.getenv("NEXUS_METRICS", "false").lower() == "true",
+                metrics_token=os.getenv("NEXUS_METRICS_TOKEN", ""),
+                tracing_sample_rate=float(os.getenv("NEXUS_TRACE_SAMPLE_RATE", "0.0")),
+                tracing_exporters=os.getenv("NEXUS_TRACE_EXPORTERS", "memory").split(","),
+                trace_file=os.getenv("NEXUS_TRACE_FILE", "traces.jsonl"),
+                profiling_enabled=os.getenv("NEXUS_PROFILING", "true").lower() == "true",
+                profiler_max_seconds=float(os.getenv("NEXUS_PROFILER_MAX_SECONDS", "60.0")),
+                statistics_max_staleness_seconds=float(os.getenv("NEXUS_STATISTICS_MAX_STALENESS", "30.0")),
+            ),
+            logging=LoggingConfig(
+                queue_size=int(os.getenv("NEXUS_LOG_QUEUE_SIZE", "10000")),
+                max_bytes=int(os.getenv("NEXUS_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+                backup_count=int(os.getenv("NEXUS_LOG_BACKUP_COUNT", "5")),
+                rotate_when=os.getenv("NEXUS_LOG_ROTATE_WHEN", ""),
+                json_format=os.getenv("NEXUS_LOG_JSON", "false").lower() == "true",
+                # e.g. "command_service=0.1,web_server=0.5"
+                sampling={
+                    name.strip(): float(rate)
+                    for name, rate in (
+                        entry.split("=", 1) for entry in os.getenv("NEXUS_LOG_SAMPLING", "").split(",") if "=" in entry
+                    )
+                },
             ),
             log_level=os.getenv("NEXUS_LOG_LEVEL", "INFO"),
             log_file=os.getenv("NEXUS_LOG_FILE", "nexus.log"),
@@ -116,6 +232,8 @@ class NexusConfig:
                 "username": self.database.username,
                 "password": self.database.password,
                 "pool_size": self.database.pool_size,
+                "query_log_enabled": self.database.query_log_enabled,
+                "slow_query_ms": self.database.slow_query_ms,
             },
             "server": {
                 "host": self.server.host,
@@ -129,6 +247,48 @@ class NexusConfig:
                 "credit_multiplier": self.game.credit_multiplier,
                 "xp_multiplier": self.game.xp_multiplier,
                 "passive_mining_enabled": self.game.passive_mining_enabled,
+                "script_execution_mode": self.game.script_execution_mode,
+                "script_worker_processes": self.game.script_worker_processes,
+                "script_profiling_enabled": self.game.script_profiling_enabled,
+                "max_commands_per_batch": self.game.max_commands_per_batch,
+                "rate_limiting_enabled": self.game.rate_limiting_enabled,
+                "rate_limits_free": self.game.rate_limits_free,
+                "rate_limits_vip": self.game.rate_limits_vip,
+                "rate_limit_ip_multiplier": self.game.rate_limit_ip_multiplier,
+            },
+            "security": {
+                "admin_session_ttl_seconds": self.security.admin_session_ttl_seconds,
+                "session_sweep_interval_seconds": self.security.session_sweep_interval_seconds,
+                "session_sweep_batch_size": self.security.session_sweep_batch_size,
+                "token_secret": self.security.token_secret,
+                "token_key_id": self.security.token_key_id,
+                "token_previous_secrets": self.security.token_previous_secrets,
+                "player_token_ttl_seconds": self.security.player_token_ttl_seconds,
+                "password_hash_algorithm": self.security.password_hash_algorithm,
+                "scrypt_n": self.security.scrypt_n,
+                "scrypt_r": self.security.scrypt_r,
+                "scrypt_p": self.security.scrypt_p,
+                "pbkdf2_iterations": self.security.pbkdf2_iterations,
+                "password_hash_workers": self.security.password_hash_workers,
+            },
+            "monitoring": {
+                "metrics_enabled": self.monitoring.metrics_enabled,
+                "metrics_token": self.monitoring.metrics_token,
+                "tracing_sample_rate": self.monitoring.tracing_sample_rate,
+                "tracing_exporters": self.monitoring.tracing_exporters,
+                "trace_file": self.monitoring.trace_file,
+                "trace_buffer_size": self.monitoring.trace_buffer_size,
+                "profiling_enabled": self.monitoring.profiling_enabled,
+                "profiler_max_seconds": self.monitoring.profiler_max_seconds,
+                "statistics_max_staleness_seconds": self.monitoring.statistics_max_staleness_seconds,
+            },
+            "logging": {
+                "queue_size": self.logging.queue_size,
+                "max_bytes": self.logging.max_bytes,
+                "backup_count": self.logging.backup_count,
+                "rotate_when": self.logging.rotate_when,
+                "json_format": self.logging.json_format,
+                "sampling": self.logging.sampling,
             },
             "log_level": self.log_level,
             "log_file": self.log_file,
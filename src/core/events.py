@@ -4,8 +4,22 @@ Event system for Nexus Root MMORPG
 
 from typing import Dict, Any, Callable, List
 from abc import ABC, abstractmethod
+import time
 from datetime import datetime
 from .logger import NexusLogger
+from .metrics import REGISTRY
+from .tracing import TRACER
+
+EVENT_HANDLER_SECONDS = REGISTRY.histogram(
+    "nexus_event_handler_duration_seconds",
+    "Time spent in each event handler",
+    ("event_type", "handler")
+)
+EVENT_HANDLER_ERRORS = REGISTRY.counter(
+    "nexus_event_handler_errors_total",
+    "Event handlers that raised or reported failure",
+    ("event_type", "handler")
+)
 
 class Event:
     """Base event class"""
@@ -53,12 +67,19 @@ class EventBus:
         
         if event.event_type in self.handlers:
             for handler in self.handlers[event.event_type]:
+                handler_name = handler.__class__.__name__
+                started = time.perf_counter()
                 try:
-                    success = handler.handle(event)
+                    with TRACER.span(f"{handler_name}.handle", event_type=event.event_type):
+                        success = handler.handle(event)
                     if not success:
-                        self.logger.warning(f"Handler {handler.__class__.__name__} failed to handle {event.event_type}")
+                        EVENT_HANDLER_ERRORS.inc(1, event.event_type, handler_name)
+                        self.logger.warning(f"Handler {handler_name} failed to handle {event.event_type}")
                 except Exception as e:
-                    self.logger.error(f"Error in handler {handler.__class__.__name__} for {event.event_type}: {str(e)}")
+                    EVENT_HANDLER_ERRORS.inc(1, event.event_type, handler_name)
+                    self.logger.error(f"Error in handler {handler_name} for {event.event_type}: {str(e)}")
+                finally:
+                    EVENT_HANDLER_SECONDS.observe(time.perf_counter() - started, event.event_type, handler_name)
 
 # Predefined event types
 class PlayerEvents:
@@ -73,12 +94,21 @@ class PlayerEvents:
 class GameEvents:
     """Game-related event types"""
     COMMAND_EXECUTED = "game.command_executed"
+    MISSION_STARTED = "game.mission_started"
+    MISSION_ABANDONED = "game.mission_abandoned"
     MISSION_COMPLETED = "game.mission_completed"
     MISSION_FAILED = "game.mission_failed"
     SCRIPT_EXECUTED = "game.script_executed"
     PASSIVE_MINING_STARTED = "game.passive_mining_started"
     PASSIVE_MINING_COMPLETED = "game.passive_mining_completed"
 
+class AdminEvents:
+    """Moderation event types, published once per admin action"""
+    PLAYERS_BANNED = "admin.players_banned"
+    PLAYERS_UNBANNED = "admin.players_unbanned"
+    IPS_BANNED = "admin.ips_banned"
+    IPS_UNBANNED = "admin.ips_unbanned"
+
 class SystemEvents:
     """System-related event types"""
     SERVER_STARTED = "system.server_started"
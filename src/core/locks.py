@@ -0,0 +1,31 @@
+"""
+Per-key locking for request threads
+"""
+
+import functools
+import threading
+
+class KeyedLocks:
+    """
+    A fixed set of reentrant locks, picked by hashing the key.
+
+    Keys that hash to the same lock wait for each other, which costs a
+    little concurrency but means there is nothing to create or clean up
+    per key. Locks are reentrant so a locked operation can call another
+    one for the same key.
+    """
+
+    def __init__(self, stripes: int = 256):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def __call__(self, key) -> threading.RLock:
+        return self._locks[hash(key) % len(self._locks)]
+
+def locked_by_player(method):
+    """Serialize calls of a method for the same player (its first argument, a name)"""
+    @functools.wraps(method)
+    def wrapper(self, player_name, *args, **kwargs):
+        # Names are locked case-insensitively so lookups that ignore case are covered too
+        with self.player_locks(str(player_name).lower()):
+            return method(self, player_name, *args, **kwargs)
+    return wrapper
@@ -2,24 +2,88 @@
 Centralized logging system for Nexus Root MMORPG
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of DEBUG and INFO records per logger.
+
+    Rates are keyed by logger name without the "nexus." prefix, e.g.
+    {"command_service": 0.1}. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = {f"nexus.{name}": rate for name, rate in rates.items()}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name)
+        return rate is None or random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking or erroring when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Losing a log line is better than stalling the request thread
+            self.dropped += 1
+
 class NexusLogger:
-    """Centralized logging system with structured logging support"""
+    """
+    Centralized logging system with structured logging support.
+
+    Loggers only put records on a bounded queue; a QueueListener thread
+    formats them and does the console and file I/O, so logging never
+    blocks a request thread on disk or terminal writes.
+    """
     
     _loggers: Dict[str, logging.Logger] = {}
     _initialized = False
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    _listener: Optional[logging.handlers.QueueListener] = None
     
     @classmethod
-    def initialize(cls, log_level: str = "INFO", log_file: Optional[str] = None):
-        """Initialize the logging system"""
+    def initialize(cls, log_level: str = "INFO", log_file: Optional[str] = None, logging_config=None):
+        """
+        Initialize the logging system.
+
+        logging_config is a LoggingConfig; without one the queue, rotation
+        and format defaults apply. Calling it again replaces the previous
+        setup, including the default one made by the first get_logger call.
+        """
         if cls._initialized:
-            return
-            
+            cls.shutdown()
+        
         # Create logs directory
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
@@ -29,23 +93,62 @@ class NexusLogger:
         root_logger.setLevel(getattr(logging, log_level.upper()))
         
         # Create formatters
-        detailed_formatter = logging.Formatter(
-            '[%(asctime)s] %(name)s.%(levelname)s: %(message)s'
-        )
+        if logging_config is not None and logging_config.json_format:
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(
+                '[%(asctime)s] %(name)s.%(levelname)s: %(message)s'
+            )
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(console_handler)
+        console_handler.setFormatter(formatter)
+        handlers = [console_handler]
         
-        # File handler
+        # File handler, rotated by time when configured, otherwise by size
         if log_file:
-            file_handler = logging.FileHandler(log_dir / log_file)
-            file_handler.setFormatter(detailed_formatter)
-            root_logger.addHandler(file_handler)
+            max_bytes = logging_config.max_bytes if logging_config is not None else 10 * 1024 * 1024
+            backup_count = logging_config.backup_count if logging_config is not None else 5
+            if logging_config is not None and logging_config.rotate_when:
+                file_handler = logging.handlers.TimedRotatingFileHandler(
+                    log_dir / log_file, when=logging_config.rotate_when, backupCount=backup_count
+                )
+            else:
+                file_handler = logging.handlers.RotatingFileHandler(
+                    log_dir / log_file, maxBytes=max_bytes, backupCount=backup_count
+                )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        
+        # Request threads only enqueue; the listener thread writes
+        queue_size = logging_config.queue_size if logging_config is not None else 10000
+        cls._queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        if logging_config is not None and logging_config.sampling:
+            cls._queue_handler.addFilter(SamplingFilter(logging_config.sampling))
+        root_logger.addHandler(cls._queue_handler)
+        cls._listener = logging.handlers.QueueListener(cls._queue_handler.queue, *handlers)
+        cls._listener.start()
         
         cls._initialized = True
     
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and detach the handlers"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+        if cls._queue_handler is not None:
+            logging.getLogger("nexus").removeHandler(cls._queue_handler)
+            cls._queue_handler = None
+        cls._initialized = False
+    
+    @classmethod
+    def dropped_records(cls) -> int:
+        """Records discarded because the queue was full"""
+        return cls._queue_handler.dropped if cls._queue_handler is not None else 0
+    
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """Get or create a logger for the given name"""
@@ -76,4 +179,6 @@ class NexusLogger:
         """Log error with context"""
         logger = cls.get_logger("errors")
         context_str = f" context={context}" if context else ""
-        logger.error(f"ERROR: {type(error).__name__}: {str(error)}{context_str}", exc_info=True)
\ No newline at end of file
+        logger.error(f"ERROR: {type(error).__name__}: {str(error)}{context_str}", exc_info=True)
+
+atexit.register(NexusLogger.shutdown)
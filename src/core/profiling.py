@@ -0,0 +1,201 @@
+"""
+On-demand profiling of a running server: stack sampling and per-request cProfile
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+def _frame_label(code) -> str:
+    # Flame graph tools split frames on ";" and the count on the last space
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack at a fixed rate for a bounded time.
+
+    A background thread reads sys._current_frames() each interval and
+    counts identical stacks, so the profiled threads run untouched; the
+    cost is one stack walk per thread per sample. Results are collapsed
+    stacks ("thread;outer;inner count" per line) for flame graph tools.
+    One session runs at a time; results stay readable until the next
+    session starts.
+    """
+
+    MIN_INTERVAL = 0.001
+
+    def __init__(self, max_duration: float = 60.0):
+        self.max_duration = max_duration
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Dict[Tuple[str, ...], int] = {}
+        self._labels: Dict[Any, str] = {}
+        self._samples = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._duration = 0.0
+        self._interval = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, interval: float = 0.01) -> bool:
+        """Start a session; False if one is already running"""
+        if duration <= 0 or duration > self.max_duration:
+            raise ValueError(f"Duration must be between 0 and {self.max_duration} seconds")
+        if interval < self.MIN_INTERVAL or interval > duration:
+            raise ValueError(f"Interval must be between {self.MIN_INTERVAL} seconds and the duration")
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = {}
+            self._samples = 0
+            self._started_at = time.time()
+            self._finished_at = None
+            self._duration = duration
+            self._interval = interval
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="nexus-sampling-profiler", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """End the running session early"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        deadline = time.perf_counter() + self._duration
+        next_sample = time.perf_counter()
+        while not self._stop.is_set() and next_sample < deadline:
+            self._sample(own_id)
+            # Fixed rate: schedule from the previous tick, not from now
+            next_sample += self._interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+        self._finished_at = time.time()
+
+    def _sample(self, own_id: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        labels = self._labels
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}").replace(";", ":"))
+            key = tuple(reversed(stack))
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+        self._samples += 1
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "duration_seconds": self._duration,
+            "interval_seconds": self._interval,
+            "samples": self._samples,
+            "distinct_stacks": len(self._stacks),
+        }
+
+    def collapsed(self) -> str:
+        """Collapsed stacks of the last session, heaviest first"""
+        stacks = sorted(dict(self._stacks).items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks)
+
+class RequestProfiles:
+    """
+    Recent cProfile results of single requests, looked up by id.
+
+    Only one request is profiled at a time. Request threads run
+    concurrently, and from Python 3.12 cProfile is a single process-wide
+    sys.monitoring tool: a second active profiler fails to enable, and
+    either would record the other threads' work as well.
+    """
+
+    def __init__(self, max_profiles: int = 20):
+        self._profiles = deque(maxlen=max_profiles)
+        self._active = threading.Lock()
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """An enabled profiler, or None while another request is being profiled"""
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+        except BaseException:
+            self._active.release()
+            raise
+        return profile
+
+    def stop(self, profile: cProfile.Profile):
+        """Disable a profiler from start so the next request can be profiled"""
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+
+    @staticmethod
+    def summarize(profile: cProfile.Profile, limit: int = 40) -> List[Dict[str, Any]]:
+        """Functions with the most cumulative time"""
+        stats = pstats.Stats(profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in rows
+        ]
+
+    @staticmethod
+    def new_id() -> str:
+        # Assigned before the request runs so it can go out in the response headers
+        return uuid.uuid4().hex[:12]
+
+    def add(self, profile_id: str, method: str, path: str, duration_ms: float, profile: cProfile.Profile):
+        self._profiles.append({
+            "id": profile_id,
+            "method": method,
+            "path": path.split("?", 1)[0],
+            "recorded_at": time.time(),
+            "duration_ms": round(duration_ms, 3),
+            "functions": self.summarize(profile),
+        })
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return next((profile for profile in self._profiles if profile["id"] == profile_id), None)
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Newest first, without the function tables"""
+        return [
+            {key: value for key, value in profile.items() if key != "functions"}
+            for profile in reversed(self._profiles)
+        ]
+
+# Process-wide profilers used by the web server's admin endpoints
+SAMPLING_PROFILER = SamplingProfiler()
+REQUEST_PROFILES = RequestProfiles()
@@ -0,0 +1,236 @@
+"""
+Lightweight request tracing with contextvar-propagated spans
+"""
+
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+def _new_id() -> str:
+    return "%016x" % random.getrandbits(64)
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_time", "start_ns", "end_ns",
+                 "attributes", "status", "error")
+
+    sampled = True
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.name = name
+        # Wall clock for display; the monotonic clock for the duration
+        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    """Stands in for spans of unsampled traces"""
+
+    sampled = False
+    trace_id = span_id = parent_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[object]] = ContextVar("nexus_current_span", default=None)
+
+def current_span():
+    """The active span, or a no-op span outside a sampled trace"""
+    return _current_span.get() or NOOP_SPAN
+
+class InMemoryExporter:
+    """Keeps the most recent finished spans in a bounded buffer"""
+
+    def __init__(self, max_spans: int = 2000):
+        self._spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        # deque.append is atomic, so exporting threads need no lock
+        self._spans.append(span.to_dict())
+
+    def spans(self) -> List[Dict[str, Any]]:
+        return list(self._spans)
+
+    def traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent traces first, each with its spans in start order"""
+        traces: Dict[str, List[Dict[str, Any]]] = {}
+        for span in self.spans():
+            traces.setdefault(span["trace_id"], []).append(span)
+        result = []
+        for trace_id, spans in reversed(list(traces.items())):
+            spans.sort(key=lambda span: span["start_ns"])
+            root = next((span for span in spans if span["parent_id"] is None), spans[0])
+            result.append({
+                "trace_id": trace_id,
+                "name": root["name"],
+                "duration_ms": root["duration_ms"],
+                "spans": spans,
+            })
+            if len(result) >= limit:
+                break
+        return result
+
+    def clear(self):
+        self._spans.clear()
+
+class JsonLinesExporter:
+    """Appends one JSON object per finished span to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", buffering=1)
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to exporters.
+
+    Sampling is decided once per trace at the root span: unsampled traces
+    mark the context with a no-op span so nested calls skip span creation
+    too. With a sample rate of 0 the cost of a traced call is one context
+    variable lookup.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporters: List[object] = None):
+        self.sample_rate = 0.0
+        self.exporters: List[object] = []
+        self.configure(sample_rate, exporters or [])
+
+    def configure(self, sample_rate: float, exporters: List[object]):
+        """Replace the sample rate and exporters"""
+        self.exporters = list(exporters)
+        self.sample_rate = sample_rate if self.exporters else 0.0
+
+    @classmethod
+    def exporters_from_config(cls, monitoring_config) -> List[object]:
+        exporters = []
+        if "memory" in monitoring_config.tracing_exporters:
+            exporters.append(InMemoryExporter(monitoring_config.trace_buffer_size))
+        if "jsonl" in monitoring_config.tracing_exporters:
+            exporters.append(JsonLinesExporter(monitoring_config.trace_file))
+        return exporters
+
+    def close(self):
+        """Close exporters that hold files"""
+        for exporter in self.exporters:
+            close = getattr(exporter, "close", None)
+            if close is not None:
+                close()
+
+    def memory_exporter(self) -> Optional[InMemoryExporter]:
+        return next((exporter for exporter in self.exporters if isinstance(exporter, InMemoryExporter)), None)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Run the with-block inside a child of the current span, or a new root"""
+        parent = _current_span.get()
+        if parent is None:
+            if self.sample_rate <= 0.0:
+                yield NOOP_SPAN
+                return
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                token = _current_span.set(NOOP_SPAN)
+                try:
+                    yield NOOP_SPAN
+                finally:
+                    _current_span.reset(token)
+                return
+            span = Span(name, _new_id(), None, attributes)
+        elif parent is NOOP_SPAN:
+            yield NOOP_SPAN
+            return
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            _current_span.reset(token)
+            for exporter in self.exporters:
+                try:
+                    exporter.export(span)
+                except Exception:
+                    pass
+
+# Process-wide tracer used by the traced modules; off until configured
+TRACER = Tracer()
+
+def traced(name: str = None):
+    """Decorator running the function inside a span"""
+    def decorate(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def trace_methods(prefix: str):
+    """Class decorator tracing every public method the class defines"""
+    def decorate(cls):
+        for method_name, method in list(vars(cls).items()):
+            if method_name.startswith("_") or not inspect.isfunction(method):
+                continue
+            setattr(cls, method_name, traced(f"{prefix}.{method_name}")(method))
+        return cls
+    return decorate
@@ -59,6 +59,9 @@ def run_api_server(args):
             config.server.debug = True
             config.log_level = "DEBUG"
         
+        # Initialize logging
+        NexusLogger.initialize(config.log_level, config.log_file, config.logging)
+        
         # Create and start server
         server = WebServer(config)
         server.run()
@@ -83,6 +83,17 @@ class Player:
             "prompt_format": "{user}@nexus-root> "
         }
         self.cpu_locked_until: Optional[datetime] = None
+        
+        # Moderation state
+        self.banned = False
+        self.ban_reason: Optional[str] = None
+        self.ban_expires_at: Optional[datetime] = None
+    
+    def is_banned(self, now: datetime = None) -> bool:
+        """Check if the player is under a ban that has not expired"""
+        if not self.banned:
+            return False
+        return self.ban_expires_at is None or self.ban_expires_at > (now or datetime.now())
     
     def update_experience(self, amount: int, event_bus=None) -> bool:
         """Update player experience and handle level ups"""
@@ -139,6 +150,7 @@ class Player:
     
     def login(self, event_bus=None):
         """Handle player login"""
+        was_online = self.is_online
         self.is_online = True
         self.last_login = datetime.now()
         
@@ -148,13 +160,15 @@ class Player:
                 {
                     "player_id": self.id,
                     "player_name": self.name,
-                    "login_time": self.last_login.isoformat()
+                    "login_time": self.last_login.isoformat(),
+                    "was_online": was_online
                 },
                 source="player"
             ))
     
     def logout(self, event_bus=None):
         """Handle player logout"""
+        was_online = self.is_online
         self.is_online = False
         
         if event_bus:
@@ -163,7 +177,8 @@ class Player:
                 {
                     "player_id": self.id,
                     "player_name": self.name,
-                    "logout_time": datetime.now().isoformat()
+                    "logout_time": datetime.now().isoformat(),
+                    "was_online": was_online
                 },
                 source="player"
             ))
@@ -213,7 +228,10 @@ class Player:
             "inventory": self.inventory,
             "settings": self.settings,
             "password_hash": getattr(self, 'password_hash', None),
-            "cpu_locked_until": self.cpu_locked_until.isoformat() if self.cpu_locked_until else None
+            "cpu_locked_until": self.cpu_locked_until.isoformat() if self.cpu_locked_until else None,
+            "banned": self.banned,
+            "ban_reason": self.ban_reason,
+            "ban_expires_at": self.ban_expires_at.isoformat() if self.ban_expires_at else None
         }
     
     @classmethod
@@ -263,5 +281,9 @@ class Player:
         player.password_hash = data.get("password_hash")
         if data.get("cpu_locked_until"):
             player.cpu_locked_until = datetime.fromisoformat(data["cpu_locked_until"])
+        player.banned = data.get("banned", False)
+        player.ban_reason = data.get("ban_reason")
+        if data.get("ban_expires_at"):
+            player.ban_expires_at = datetime.fromisoformat(data["ban_expires_at"])
         
         return player
\ No newline at end of file
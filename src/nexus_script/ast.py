@@ -33,6 +33,14 @@ class Identifier(Expression):
     def to_string(self):
         return self.value
 
+class Builtin(Expression):
+    def __init__(self, name, function, takes_evaluator=True):
+        self.name = name
+        self.function = function
+        self.takes_evaluator = takes_evaluator
+    def to_string(self):
+        return self.name
+
 class StringLiteral(Expression):
     def __init__(self, value):
         self.value = value
@@ -3,12 +3,14 @@ from .ast import (
     SetStatement,
     ExpressionStatement,
     Identifier,
+    Builtin,
     StringLiteral,
     NumberLiteral,
     CallExpression,
     NewExpression,
 )
 from datetime import datetime, timedelta
+from .optimizer import Optimizer
 from ..upgrade_data import UPGRADE_DATA
 import time
 
@@ -47,16 +49,28 @@ class Evaluator:
         elif isinstance(node, NumberLiteral):
             return node.value
         elif isinstance(node, CallExpression):
+            if isinstance(node.function, Builtin):
+                args = [self.eval(arg) for arg in node.arguments]
+                if node.function.takes_evaluator:
+                    return node.function.function(self, args)
+                return node.function.function(args)
             func = self.eval(node.function)
             if not callable(func):
                 return f"Error: {node.function.value} is not a function"
             args = [self.eval(arg) for arg in node.arguments]
             return func(args)
+        elif isinstance(node, Builtin):
+            if node.takes_evaluator:
+                return node.function.__get__(self)
+            return node.function
         elif isinstance(node, NewExpression):
             # Simplified for now
             return None
         return None
 
+    def compile(self, program, keep_globals=True):
+        return Optimizer(self.builtins, keep_globals).optimize(program)
+
     def eval_statements(self, statements):
         result = None
         for statement in statements:
@@ -0,0 +1,255 @@
+"""
+Script execution for NexusScript programs
+
+Programs can run in-process or be shipped to a process pool so that
+CPU-heavy scripts do not hold the GIL of the request-handling threads.
+In process-pool mode the compiled program travels together with a
+snapshot of the player's VC state; the worker returns the attributes it
+changed and the caller merges them back with apply_result on its own
+thread.  Jobs for the same player are queued, and each snapshot includes
+the deltas of the jobs before it, so results apply in submission order.
+"""
+
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from .lexer import Lexer
+from .parser import Parser
+from .evaluator import Evaluator
+from .optimizer import Optimizer
+from .profiler import ProfilingEvaluator
+from .themes import THEMES
+from ..vc_state import VC_State
+from ..core.exceptions import ConfigurationError, ScriptExecutionError
+from ..core.logger import NexusLogger
+
+DEFAULT_MODULE = "<inline>"
+
+IN_PROCESS = "in_process"
+PROCESS_POOL = "process_pool"
+EXECUTION_MODES = (IN_PROCESS, PROCESS_POOL)
+
+class ScriptResult:
+    """Result of a script execution"""
+    def __init__(self, value: Any = None, state_delta: Dict[str, Any] = None, environment: Dict[str, Any] = None, profile: Dict[str, Any] = None):
+        self.value = value
+        self.state_delta = state_delta or {}
+        self.environment = environment or {}
+        self.profile = profile
+
+class _SnapshotPlayer:
+    """Minimal stand-in for a player inside a worker process"""
+    def __init__(self, name: str, is_vip: bool, vc_state: VC_State):
+        self.name = name
+        self.is_vip = is_vip
+        self.vc_state = vc_state
+
+def _run_program(program, name: str, is_vip: bool, state: Dict[str, Any], environment: Dict[str, Any], profile: bool = False) -> ScriptResult:
+    """Evaluate a program against a state snapshot and return the changes (worker entry point)"""
+    vc_state = VC_State()
+    vc_state.__dict__.update(state)
+    evaluator_class = ProfilingEvaluator if profile else Evaluator
+    evaluator = evaluator_class(_SnapshotPlayer(name, is_vip, vc_state), THEMES)
+    evaluator.environment.update(environment)
+
+    value = evaluator.eval(program)
+    if callable(value):
+        # Bare builtin references are not meaningful outside this process
+        value = None
+
+    state_delta = {
+        key: new_value
+        for key, new_value in vars(vc_state).items()
+        if key not in state or state[key] != new_value
+    }
+    return ScriptResult(value, state_delta, evaluator.environment, getattr(evaluator, "sample", None))
+
+class ScriptExecutor:
+    """
+    Runs NexusScript programs in-process or on a process pool.
+
+    Script variables persist per player between runs. At most
+    max_environments players keep theirs, least recently used first out,
+    and a player's variables are dropped when they log out.
+    """
+
+    def __init__(self, mode: str = IN_PROCESS, max_workers: int = 2, profiler=None, max_environments: int = 10000):
+        if mode not in EXECUTION_MODES:
+            raise ConfigurationError(f"Invalid script execution mode: {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        # Optional ScriptProfiler; profiling is off while this is None
+        self.profiler = profiler
+        self.max_environments = max_environments
+        self.logger = NexusLogger.get_logger("script_executor")
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queues: Dict[str, deque] = {}
+        # Merged deltas of finished jobs whose player has a job still queued
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._environments: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # Compiled programs do not depend on the player, so they are cached by source
+        self._optimizer = Optimizer(Evaluator(None, THEMES).builtins)
+        self._compile_cached = lru_cache(maxsize=256)(self._compile)
+
+    @classmethod
+    def from_config(cls, game_config, profiler=None) -> "ScriptExecutor":
+        """Create an executor from a GameConfig"""
+        return cls(
+            game_config.script_execution_mode,
+            game_config.script_worker_processes,
+            profiler if game_config.script_profiling_enabled else None
+        )
+
+    def compile(self, source: str):
+        """Lex, parse and optimize source into a program"""
+        return self._compile_cached(source)
+
+    def _compile(self, source: str):
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if parser.errors:
+            raise ScriptExecutionError("; ".join(parser.errors), context={"errors": parser.errors})
+        return self._optimizer.optimize(program)
+
+    def execute(self, player, source: str, module: str = DEFAULT_MODULE, timeout: float = None) -> ScriptResult:
+        """Execute source for a player, wait for the result and apply it to the player"""
+        result = self.submit(player, source, module).result(timeout)
+        if self.mode == PROCESS_POOL:
+            self.apply_result(player, result)
+        return result
+
+    @staticmethod
+    def apply_result(player, result: ScriptResult):
+        """Merge the state changes of a process-pool result into the player"""
+        for attribute, value in result.state_delta.items():
+            setattr(player.vc_state, attribute, value)
+
+    def submit(self, player, source: str, module: str = DEFAULT_MODULE) -> Future:
+        """
+        Schedule source for a player, preserving per-player ordering.
+
+        In process-pool mode the player is not modified; pass each result
+        to apply_result, in submission order, to merge its changes.
+        """
+        program = self.compile(source)
+        future = Future()
+
+        if self.mode == IN_PROCESS:
+            with self._lock:
+                environment = self._store_environment(player.name, self._environments.get(player.name, {}))
+            self._run_in_process(player, program, module, environment, future)
+            return future
+
+        with self._lock:
+            queue = self._queues.setdefault(player.name, deque())
+            queue.append((player, program, module, future))
+            start = len(queue) == 1
+
+        if start:
+            self._dispatch(player.name)
+
+        return future
+
+    def _run_in_process(self, player, program, module: str, environment: Dict[str, Any], future: Future):
+        """Evaluate directly against the live player state"""
+        profiler = self.profiler
+        try:
+            evaluator = (ProfilingEvaluator if profiler else Evaluator)(player, THEMES)
+            evaluator.environment = environment
+            result = ScriptResult(evaluator.eval(program), environment=environment)
+        except Exception as e:
+            future.set_exception(ScriptExecutionError(str(e)))
+            return
+
+        if profiler:
+            result.profile = evaluator.sample
+            profiler.record(player.name, module, evaluator.sample)
+        future.set_result(result)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazily start the worker pool"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                self.logger.info(f"Started script worker pool with {self.max_workers} processes")
+            return self._pool
+
+    def _dispatch(self, key: str):
+        """Ship the job at the head of a player's queue to the pool"""
+        with self._lock:
+            player, program, module, future = self._queues[key][0]
+            environment = dict(self._environments.get(key, {}))
+            if key in self._environments:
+                self._environments.move_to_end(key)
+            pending = dict(self._pending.get(key, {}))
+
+        # Snapshot is taken only now, on top of the deltas of earlier jobs
+        state = dict(vars(player.vc_state))
+        state.update(pending)
+        try:
+            pool_future = self._get_pool().submit(
+                _run_program, program, player.name, player.is_vip, state, environment, self.profiler is not None
+            )
+        except Exception as e:
+            self._complete(key, player, module, future, error=e)
+            return
+
+        pool_future.add_done_callback(
+            lambda done: self._complete(key, player, module, future, done=done)
+        )
+
+    def _complete(self, key: str, player, module: str, future: Future, done: Future = None, error: Exception = None):
+        """Resolve a finished job and start the next one for the player"""
+        if error is None:
+            error = done.exception()
+
+        if error is None:
+            result = done.result()
+            with self._lock:
+                self._store_environment(key, result.environment)
+                self._pending.setdefault(key, {}).update(result.state_delta)
+            profiler = self.profiler
+            if profiler and result.profile:
+                profiler.record(player.name, module, result.profile)
+            future.set_result(result)
+        else:
+            self.logger.error(f"Script execution failed for {key}: {error}")
+            future.set_exception(ScriptExecutionError(str(error)))
+
+        with self._lock:
+            queue = self._queues[key]
+            queue.popleft()
+            if not queue:
+                del self._queues[key]
+                self._pending.pop(key, None)
+                return
+
+        self._dispatch(key)
+
+    def _store_environment(self, key: str, environment: Dict[str, Any]) -> Dict[str, Any]:
+        """Set a player's environment as the most recently used; call with the lock held"""
+        environments = self._environments
+        environments[key] = environment
+        environments.move_to_end(key)
+        while len(environments) > self.max_environments:
+            environments.popitem(last=False)
+        return environment
+
+    def discard_environment(self, player_name: str) -> bool:
+        """Forget a player's script variables"""
+        with self._lock:
+            return self._environments.pop(player_name, None) is not None
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
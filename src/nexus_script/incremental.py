@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from .lexer import Lexer, TokenType
+from .parser import Parser
+from .ast import Program, ExpressionStatement
+
+class ParsedStatement:
+    """A top-level statement; offsets are relative to the statement start"""
+    def __init__(self, node, length, diagnostics):
+        self.node = node
+        self.length = length
+        self.diagnostics = diagnostics
+
+class IncrementalParser:
+    """
+    Keeps a module parsed while it is being edited.
+
+    Each edit re-lexes and re-parses from two statements before the first
+    statement starting at or after the edit, and stops as soon as lexing
+    lands on the start of an unchanged statement after it; from there the
+    old statements (and their AST nodes) are reused. The first step back
+    reaches the statement containing the edit. Parsing a statement depends
+    on at most one token past its end, and an edit inside the containing
+    statement can change that statement's first token, which is the token
+    the statement before it looked at. So the second step back re-parses
+    that earlier statement as well. Statement start offsets live in a flat
+    list so shifting the tail after an edit stays cheap.
+    """
+
+    def __init__(self, source=""):
+        self.source = source
+        self.statements = []
+        self.starts = []
+        self._parse_from(0, 0, None)
+        self.last_reparsed = len(self.statements)
+
+    def edit(self, start, end, text):
+        """Replace source[start:end] with text and return the new diagnostics"""
+        if not 0 <= start <= end <= len(self.source):
+            raise ValueError(f"Edit range {start}:{end} outside source of length {len(self.source)}")
+
+        self.source = self.source[:start] + text + self.source[end:]
+        delta = len(text) - (end - start)
+
+        # Statement containing the edit, and the one before it (see class docstring)
+        first = max(bisect_left(self.starts, start) - 2, 0)
+        offset = self.starts[first] if first > 0 else 0
+
+        # Old statements starting at or after `end` are unchanged and may be reused
+        reusable = bisect_left(self.starts, end)
+        old_starts = self.starts
+        statements, starts = [], []
+        resume = self._parse_from(offset, len(text) + start, (old_starts, reusable, delta), statements, starts)
+        self.last_reparsed = len(statements)
+
+        if resume is None:
+            resume = len(old_starts)
+        tail_starts = old_starts[resume:]
+        if delta:
+            tail_starts = [s + delta for s in tail_starts]
+
+        self.statements[first:resume] = statements
+        self.starts = old_starts[:first] + starts + tail_starts
+        return self.diagnostics
+
+    def _parse_from(self, offset, resume_after, resume_info, statements=None, starts=None):
+        """Parse statements from offset, returning the old index where parsing resumed (if any)"""
+        if statements is None:
+            statements, starts = self.statements, self.starts
+        parser = Parser(Lexer(self.source, offset))
+
+        while parser.current_token.type != TokenType.EOF:
+            token = parser.current_token
+
+            if resume_info is not None and token.start >= resume_after:
+                old_starts, reusable, delta = resume_info
+                index = bisect_left(old_starts, token.start - delta, reusable)
+                if index < len(old_starts) and old_starts[index] == token.start - delta:
+                    return index
+
+            error_count = len(parser.errors)
+            node = parser.parse_statement()
+            end = max(parser.current_token.end, token.end)
+
+            diagnostics = [
+                (0, end - token.start, message)
+                for message in parser.errors[error_count:]
+            ]
+            if isinstance(node, ExpressionStatement) and node.expression is None:
+                diagnostics.append((0, token.end - token.start, f"unexpected token {token.type} '{token.literal}'"))
+
+            statements.append(ParsedStatement(node, end - token.start, diagnostics))
+            starts.append(token.start)
+            parser.next_token()
+
+        return None
+
+    @property
+    def program(self):
+        program = Program()
+        program.statements = [s.node for s in self.statements if s.node is not None]
+        return program
+
+    @property
+    def spans(self):
+        """(start, end) of every top-level statement"""
+        return [(start, start + s.length) for start, s in zip(self.starts, self.statements)]
+
+    @property
+    def diagnostics(self):
+        return [
+            {"start": start + relative_start, "end": start + relative_end, "message": message}
+            for start, statement in zip(self.starts, self.statements) if statement.diagnostics
+            for relative_start, relative_end, message in statement.diagnostics
+        ]
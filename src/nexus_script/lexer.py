@@ -38,18 +38,21 @@ class TokenType(Enum):
     ILLEGAL = 'ILLEGAL'
 
 class Token:
-    def __init__(self, type, literal):
+    def __init__(self, type, literal, start=None, end=None):
         self.type = type
         self.literal = literal
+        # Source offsets [start, end), used for diagnostics and incremental parsing
+        self.start = start
+        self.end = end
 
     def __str__(self):
         return f"Token({self.type}, {self.literal})"
 
 class Lexer:
-    def __init__(self, input_string):
+    def __init__(self, input_string, start=0):
         self.input = input_string
-        self.position = 0
-        self.read_position = 0
+        self.position = start
+        self.read_position = start
         self.ch = ''
         self.keywords = {
             "set": TokenType.SET,
@@ -92,6 +95,7 @@ class Lexer:
     def next_token(self):
         self.skip_whitespace()
 
+        start = self.position
         token = None
         if self.ch == '(':
             token = Token(TokenType.LEFT_PAREN, self.ch)
@@ -111,19 +115,22 @@ class Lexer:
             literal = self.read_string()
             token = Token(TokenType.STRING, literal)
         elif self.ch == '':
-            token = Token(TokenType.EOF, "")
+            return Token(TokenType.EOF, "", start, start)
         else:
             if self.ch.isalpha() or self.ch == '$':
                 literal = self.read_identifier()
                 token_type = self.keywords.get(literal, TokenType.IDENTIFIER)
-                return Token(token_type, literal)
+                return Token(token_type, literal, start, self.position)
             elif self.ch.isdigit():
                 literal = self.read_number()
-                return Token(TokenType.NUMBER, literal)
+                return Token(TokenType.NUMBER, literal, start, self.position)
             else:
                 token = Token(TokenType.ILLEGAL, self.ch)
 
         self.read_char()
+        token.start = start
+        # An unterminated string reads one past the end of the input
+        token.end = min(self.position, len(self.input))
         return token
 
     def read_identifier(self):
@@ -0,0 +1,124 @@
+from .ast import (
+    Program,
+    SetStatement,
+    ExpressionStatement,
+    Identifier,
+    Builtin,
+    StringLiteral,
+    NumberLiteral,
+    CallExpression,
+    NewExpression,
+)
+
+CONSTANT_NODES = (StringLiteral, NumberLiteral, Builtin)
+
+class Optimizer:
+    """
+    Optimization pass run between Parser.parse_program and evaluation.
+
+    Builtin identifiers are resolved once (stored unbound, so the result is
+    not tied to one Evaluator instance), constants are propagated into later
+    reads, and dead `set` statements are dropped. With keep_globals the
+    environment is assumed to outlive the run, so only stores overwritten
+    before any read count as dead.
+    """
+
+    def __init__(self, builtins, keep_globals=True):
+        self.builtins = {}
+        for name, function in builtins.items():
+            unbound = getattr(function, "__func__", None)
+            if unbound is not None:
+                self.builtins[name] = (unbound, True)
+            else:
+                self.builtins[name] = (function, False)
+        self.keep_globals = keep_globals
+
+    def optimize(self, program):
+        statements = self.fold_statements(program.statements)
+        optimized = Program()
+        optimized.statements = self.eliminate_dead_stores(statements)
+        return optimized
+
+    def fold_statements(self, statements):
+        constants = {}
+        folded = []
+        for statement in statements:
+            if isinstance(statement, SetStatement):
+                value = self.fold(statement.value, constants)
+                if isinstance(value, CONSTANT_NODES):
+                    constants[statement.name.value] = value
+                else:
+                    constants.pop(statement.name.value, None)
+                folded.append(SetStatement(statement.name, value))
+            elif isinstance(statement, ExpressionStatement):
+                folded.append(ExpressionStatement(self.fold(statement.expression, constants)))
+            else:
+                folded.append(statement)
+        return folded
+
+    def fold(self, node, constants):
+        if isinstance(node, Identifier):
+            # Builtins win over variables, as they do in Evaluator.eval
+            if node.value in self.builtins:
+                function, takes_evaluator = self.builtins[node.value]
+                return Builtin(node.value, function, takes_evaluator)
+            return constants.get(node.value, node)
+        elif isinstance(node, CallExpression):
+            return CallExpression(
+                self.fold(node.function, constants),
+                self.fold_arguments(node.arguments, constants),
+            )
+        elif isinstance(node, NewExpression):
+            return NewExpression(node.class_name, self.fold_arguments(node.arguments, constants))
+        return node
+
+    def fold_arguments(self, arguments, constants):
+        if arguments is None:
+            return None
+        return [self.fold(argument, constants) for argument in arguments]
+
+    def eliminate_dead_stores(self, statements):
+        live = set()
+        if self.keep_globals:
+            live = {s.name.value for s in statements if isinstance(s, SetStatement)}
+
+        kept = []
+        for index in range(len(statements) - 1, -1, -1):
+            statement = statements[index]
+            # The last statement's value is the program result, so keep it
+            is_last = index == len(statements) - 1
+
+            if isinstance(statement, SetStatement):
+                name, value = statement.name.value, statement.value
+                if name not in live and not is_last:
+                    if not has_side_effects(value):
+                        continue
+                    # Keep the call, drop only the store
+                    statement = ExpressionStatement(value)
+                live.discard(name)
+                live.update(read_names(value))
+            elif isinstance(statement, ExpressionStatement):
+                live.update(read_names(statement.expression))
+
+            kept.append(statement)
+
+        kept.reverse()
+        return kept
+
+def read_names(node):
+    """Variable names read while evaluating node"""
+    if isinstance(node, Identifier):
+        return {node.value}
+    names = set()
+    if isinstance(node, CallExpression):
+        names.update(read_names(node.function))
+    if isinstance(node, (CallExpression, NewExpression)):
+        for argument in node.arguments or []:
+            names.update(read_names(argument))
+    return names
+
+def has_side_effects(node):
+    """Whether evaluating node may do more than produce a value"""
+    if isinstance(node, (CallExpression, NewExpression)):
+        return True
+    return False
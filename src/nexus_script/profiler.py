@@ -0,0 +1,135 @@
+import threading
+import time
+from .ast import Builtin, CallExpression, Identifier
+from .evaluator import Evaluator
+
+def new_sample():
+    return {
+        "runs": 0,
+        "instructions": 0,
+        "wall_ms": 0.0,
+        "functions": {},   # name -> [calls, total_ms]
+        "statements": {},  # statement number -> [runs, total_ms]
+    }
+
+def merge_sample(target, sample):
+    target["runs"] += sample["runs"]
+    target["instructions"] += sample["instructions"]
+    target["wall_ms"] += sample["wall_ms"]
+    for key in ("functions", "statements"):
+        for name, (count, total_ms) in sample[key].items():
+            entry = target[key].setdefault(name, [0, 0.0])
+            entry[0] += count
+            entry[1] += total_ms
+
+class ProfilingEvaluator(Evaluator):
+    """
+    Evaluator that counts evaluated nodes and times calls and top-level statements.
+
+    Kept as a subclass so the plain Evaluator pays nothing when profiling is off.
+    """
+
+    def __init__(self, player, themes):
+        super().__init__(player, themes)
+        self.sample = new_sample()
+
+    def eval(self, node):
+        self.sample["instructions"] += 1
+        if not isinstance(node, CallExpression):
+            return super().eval(node)
+
+        start = time.perf_counter()
+        try:
+            return super().eval(node)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            entry = self.sample["functions"].setdefault(function_name(node.function), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+
+    def eval_statements(self, statements):
+        run_start = time.perf_counter()
+        result = None
+        for number, statement in enumerate(statements, 1):
+            start = time.perf_counter()
+            result = self.eval(statement)
+            entry = self.sample["statements"].setdefault(number, [0, 0.0])
+            entry[0] += 1
+            entry[1] += (time.perf_counter() - start) * 1000
+        self.sample["runs"] += 1
+        self.sample["wall_ms"] += (time.perf_counter() - run_start) * 1000
+        return result
+
+def function_name(node):
+    if isinstance(node, Builtin):
+        return node.name
+    if isinstance(node, Identifier):
+        return node.value
+    return type(node).__name__
+
+class ScriptProfiler:
+    """Aggregates profiling samples per player and per module"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._players = {}
+        self._modules = {}
+
+    def record(self, player_name, module, sample):
+        with self._lock:
+            merge_sample(self._players.setdefault(player_name, new_sample()), sample)
+            merge_sample(self._modules.setdefault((player_name, module), new_sample()), sample)
+
+    def reset(self):
+        with self._lock:
+            self._players.clear()
+            self._modules.clear()
+
+    def get_report(self, player_name=None, limit=10):
+        """Hot-spot report: heaviest players, modules and functions by wall time"""
+        with self._lock:
+            players = {
+                name: summarize(sample)
+                for name, sample in self._players.items()
+                if player_name is None or name == player_name
+            }
+            modules = [
+                dict(summarize(sample), player=owner, module=module)
+                for (owner, module), sample in self._modules.items()
+                if player_name is None or owner == player_name
+            ]
+            functions = {}
+            for (owner, module), sample in self._modules.items():
+                if player_name is not None and owner != player_name:
+                    continue
+                for name, (calls, total_ms) in sample["functions"].items():
+                    entry = functions.setdefault(name, [0, 0.0])
+                    entry[0] += calls
+                    entry[1] += total_ms
+
+        by_wall_time = lambda item: item["wall_ms"]
+        return {
+            "players": sorted(
+                (dict(summary, player=name) for name, summary in players.items()),
+                key=by_wall_time, reverse=True
+            )[:limit],
+            "modules": sorted(modules, key=by_wall_time, reverse=True)[:limit],
+            "functions": sorted(
+                ({"function": name, "calls": calls, "wall_ms": total_ms} for name, (calls, total_ms) in functions.items()),
+                key=by_wall_time, reverse=True
+            )[:limit],
+        }
+
+def summarize(sample):
+    runs = sample["runs"]
+    hottest = sorted(sample["statements"].items(), key=lambda item: item[1][1], reverse=True)[:5]
+    return {
+        "runs": runs,
+        "instructions": sample["instructions"],
+        "wall_ms": sample["wall_ms"],
+        "avg_ms": sample["wall_ms"] / runs if runs else 0.0,
+        "hot_statements": [
+            {"statement": number, "runs": count, "wall_ms": total_ms}
+            for number, (count, total_ms) in hottest
+        ],
+    }
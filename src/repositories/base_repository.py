@@ -2,8 +2,65 @@
 Base repository interface
 """
 
+import functools
+import inspect
+import time
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
+from ..core.metrics import REGISTRY
+from ..core.tracing import TRACER
+
+REPOSITORY_CALL_SECONDS = REGISTRY.histogram(
+    "nexus_repository_call_duration_seconds",
+    "Latency of repository method calls",
+    ("repository", "method")
+)
+
+def instrumented(repository_name: str):
+    """Class decorator timing and tracing every public method the class defines"""
+    def decorate(cls):
+        for method_name, method in list(vars(cls).items()):
+            if method_name.startswith("_") or not inspect.isfunction(method):
+                continue
+            setattr(cls, method_name, _timed(method, repository_name, method_name))
+        return cls
+    return decorate
+
+def _timed_iteration(generator, started: float, repository_name: str, method_name: str):
+    """Pass generator through, observing the time from started until it is exhausted or closed"""
+    try:
+        yield from generator
+    finally:
+        REPOSITORY_CALL_SECONDS.observe(time.perf_counter() - started, repository_name, method_name)
+
+def _timed(method, repository_name: str, method_name: str):
+    span_name = f"{repository_name}_repository.{method_name}"
+
+    if inspect.isgeneratorfunction(method):
+        # Calling a generator function only creates the generator, so time
+        # the iteration instead, until it is exhausted or closed. There is no
+        # span: it would stay current while the caller handles each item
+        @functools.wraps(method)
+        def generator_wrapper(*args, **kwargs):
+            return _timed_iteration(method(*args, **kwargs), time.perf_counter(), repository_name, method_name)
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with TRACER.span(span_name):
+                result = method(*args, **kwargs)
+        except BaseException:
+            REPOSITORY_CALL_SECONDS.observe(time.perf_counter() - started, repository_name, method_name)
+            raise
+        if inspect.isgenerator(result):
+            # Methods that validate eagerly and then return a generator are
+            # timed through its iteration too
+            return _timed_iteration(result, started, repository_name, method_name)
+        REPOSITORY_CALL_SECONDS.observe(time.perf_counter() - started, repository_name, method_name)
+        return result
+    return wrapper
 
 class BaseRepository(ABC):
     """Abstract base repository interface"""
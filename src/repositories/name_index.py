@@ -0,0 +1,107 @@
+"""
+In-memory n-gram index for player name search
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+def rank_key(name: str, query: str) -> Tuple[int, int, str]:
+    """Sort key ranking exact matches, then prefixes, then shorter names"""
+    lowered = name.lower()
+    if lowered == query:
+        kind = 0
+    elif lowered.startswith(query):
+        kind = 1
+    else:
+        kind = 2
+    return kind, len(name), lowered
+
+class NgramIndex:
+    """
+    Case-insensitive substring index over player names.
+
+    Used when SQLite lacks the FTS5 trigram tokenizer. Queries of at least
+    n characters intersect the posting sets of their n-grams (smallest
+    first) and confirm the substring on the survivors; shorter queries fall
+    back to a prefix search over a sorted name list. Either way the cost
+    depends on the number of candidates, not the number of players.
+    """
+
+    def __init__(self, n: int = 3, entries: Iterable[Tuple[str, str]] = ()):
+        self.n = n
+        self._names: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._sorted: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        for player_id, name in entries:
+            self._names[player_id] = name
+        for player_id, name in self._names.items():
+            for gram in self._grams(name.lower()):
+                self._postings.setdefault(gram, set()).add(player_id)
+        # Sorted once; an insort per entry would make the build quadratic
+        self._sorted = sorted((name.lower(), player_id) for player_id, name in self._names.items())
+
+    def _grams(self, text: str) -> Set[str]:
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, player_id: str, name: str):
+        """Index a player name, replacing any previous name for the id"""
+        with self._lock:
+            old = self._names.get(player_id)
+            if old == name:
+                return
+            if old is not None:
+                self._discard(player_id, old)
+            self._names[player_id] = name
+            lowered = name.lower()
+            for gram in self._grams(lowered):
+                self._postings.setdefault(gram, set()).add(player_id)
+            bisect.insort(self._sorted, (lowered, player_id))
+
+    def remove(self, player_id: str) -> bool:
+        """Drop a player from the index"""
+        with self._lock:
+            name = self._names.pop(player_id, None)
+            if name is None:
+                return False
+            self._discard(player_id, name)
+            return True
+
+    def _discard(self, player_id: str, name: str):
+        lowered = name.lower()
+        for gram in self._grams(lowered):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(player_id)
+                if not postings:
+                    del self._postings[gram]
+        position = bisect.bisect_left(self._sorted, (lowered, player_id))
+        if position < len(self._sorted) and self._sorted[position] == (lowered, player_id):
+            del self._sorted[position]
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str]]:
+        """Ranked (id, name) pairs whose name contains the query"""
+        query = query.lower()
+        if not query:
+            return []
+        with self._lock:
+            if len(query) < self.n:
+                # Too short for n-grams, so match prefixes only
+                start = bisect.bisect_left(self._sorted, (query, ""))
+                candidates = []
+                for lowered, player_id in self._sorted[start:]:
+                    if not lowered.startswith(query):
+                        break
+                    candidates.append(player_id)
+            else:
+                postings = sorted((self._postings.get(gram, set()) for gram in self._grams(query)), key=len)
+                candidates = set.intersection(*postings) if postings and postings[0] else set()
+            matches = [(player_id, self._names[player_id]) for player_id in candidates
+                       if query in self._names[player_id].lower()]
+
+        matches.sort(key=lambda match: rank_key(match[1], query))
+        return matches[:limit]
+
+    def __len__(self):
+        return len(self._names)
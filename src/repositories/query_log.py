@@ -0,0 +1,252 @@
+"""
+Per-statement query statistics and slow-query logging for the SQLite repositories
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+from ..core.logger import NexusLogger
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+def normalize_sql(sql: str) -> str:
+    """
+    One key per statement however it is indented; IN (?, ?, ...) lists of
+    any length share a key so chunked lookups do not flood the table.
+    """
+    return _PLACEHOLDER_LIST.sub("?, ...", _WHITESPACE.sub(" ", sql).strip())
+
+def percentile(durations: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of durations"""
+    if not durations:
+        return 0.0
+    ordered = sorted(durations)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def is_full_scan(plan: List[str]) -> bool:
+    """True if a query plan reads a whole table rather than searching an index"""
+    return any(
+        detail.startswith("SCAN ") and "USING" not in detail and "CONSTANT ROW" not in detail
+        for detail in plan
+    )
+
+class QueryLog:
+    """
+    Aggregates statement timings and logs slow statements with their plans.
+
+    Statements are keyed by their normalized SQL, so they must use bound
+    parameters rather than formatted literals to aggregate. Each key keeps
+    a count, total and maximum, plus a window of recent durations for the
+    p95. The first time a statement runs over the threshold its
+    EXPLAIN QUERY PLAN is captured and logged; later slow runs only log
+    the statement and duration.
+    """
+
+    # Recent durations kept per statement for percentiles
+    WINDOW = 512
+    # Distinct statements tracked before new ones are pooled together
+    MAX_STATEMENTS = 1000
+    OVERFLOW_KEY = "(other statements)"
+
+    def __init__(self, slow_query_ms: float = 100.0, enabled: bool = True):
+        self.slow_query_ms = slow_query_ms
+        self.enabled = enabled
+        self.logger = NexusLogger.get_logger("query_log")
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, slow_query_ms: float, enabled: bool = True):
+        self.slow_query_ms = slow_query_ms
+        self.enabled = enabled
+
+    def record(self, sql: str, elapsed_ms: float, connection: sqlite3.Connection = None, parameters=()):
+        """Add one execution; explain it if it is slow and not yet explained"""
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.MAX_STATEMENTS:
+                    key = self.OVERFLOW_KEY
+                    entry = self._stats.get(key)
+                if entry is None:
+                    entry = self._stats[key] = {
+                        "count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow_count": 0,
+                        "recent": deque(maxlen=self.WINDOW), "plan": None,
+                    }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["recent"].append(elapsed_ms)
+            slow = elapsed_ms >= self.slow_query_ms
+            if slow:
+                entry["slow_count"] += 1
+            needs_plan = slow and entry["plan"] is None and key != self.OVERFLOW_KEY
+
+        if not slow:
+            return
+        if needs_plan and connection is not None:
+            plan = self.explain(connection, sql, parameters)
+            with self._lock:
+                entry["plan"] = plan
+            self.logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {key} | plan: {'; '.join(plan)}")
+        else:
+            self.logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {key}")
+
+    @staticmethod
+    def explain(connection: sqlite3.Connection, sql: str, parameters=()) -> List[str]:
+        """EXPLAIN QUERY PLAN details for a statement, or the reason there are none"""
+        try:
+            rows = sqlite3.Connection.execute(connection, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+        return [row[-1] for row in rows]
+
+    def get_stats(self, limit: int = 20, sort: str = "total_ms") -> List[Dict[str, Any]]:
+        """Per-statement aggregates, most expensive first"""
+        with self._lock:
+            snapshot = [
+                (sql, dict(entry, recent=list(entry["recent"]))) for sql, entry in self._stats.items()
+            ]
+        rows = []
+        for sql, entry in snapshot:
+            rows.append({
+                "sql": sql,
+                "count": entry["count"],
+                "total_ms": round(entry["total_ms"], 3),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                "p95_ms": round(percentile(entry["recent"], 0.95), 3),
+                "max_ms": round(entry["max_ms"], 3),
+                "slow_count": entry["slow_count"],
+                "plan": entry["plan"],
+                "full_scan": is_full_scan(entry["plan"]) if entry["plan"] else None,
+            })
+        if sort not in ("total_ms", "avg_ms", "p95_ms", "max_ms", "count", "slow_count"):
+            sort = "total_ms"
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+# Process-wide query log shared by every repository connection
+QUERY_LOG = QueryLog()
+
+class QueryLoggingCursor(sqlite3.Cursor):
+    """
+    Cursor that reports every statement it executes to QUERY_LOG.
+
+    SQLite produces rows as they are fetched, so execute() alone covers
+    little of a SELECT. Statements that return rows are timed across
+    execute and every fetch, and recorded once the cursor is exhausted,
+    closed, reused for another statement or discarded. The time the
+    caller spends between fetches is not counted.
+    """
+
+    # [sql, parameters, seconds so far] of a statement with rows left to fetch
+    _pending = None
+
+    def execute(self, sql: str, parameters=()):
+        self._flush()
+        if not QUERY_LOG.enabled:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except BaseException:
+            QUERY_LOG.record(sql, (time.perf_counter() - started) * 1000, self.connection, parameters)
+            raise
+        elapsed = time.perf_counter() - started
+        if self.description is None:
+            QUERY_LOG.record(sql, elapsed * 1000, self.connection, parameters)
+        else:
+            self._pending = [sql, parameters, elapsed]
+        return self
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if row is None:
+            self._flush()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed_fetch(super().fetchmany, size)
+        if len(rows) < size:
+            self._flush()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        self._flush()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._flush()
+            raise
+
+    def close(self):
+        self._flush()
+        super().close()
+
+    def __del__(self):
+        # Single-row lookups rarely fetch past their row; record them when the cursor goes
+        try:
+            self._flush()
+        except Exception:
+            pass
+
+    def _timed_fetch(self, fetch, *args):
+        pending = self._pending
+        if pending is None:
+            return fetch(*args)
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            pending[2] += time.perf_counter() - started
+
+    def _flush(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, parameters, elapsed = pending
+            QUERY_LOG.record(sql, elapsed * 1000, self.connection, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        self._flush()
+        if not QUERY_LOG.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # No single parameter row to explain with, so no plan is captured
+            QUERY_LOG.record(sql, (time.perf_counter() - started) * 1000)
+
+class QueryLoggingConnection(sqlite3.Connection):
+    """
+    Connection factory routing statements through QueryLoggingCursor.
+
+    Connection.execute does not go through cursor() in the C
+    implementation, so both shortcuts are overridden.
+    """
+
+    def cursor(self, factory=QueryLoggingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """sqlite3.connect with query logging"""
+    return sqlite3.connect(db_path, factory=QueryLoggingConnection)
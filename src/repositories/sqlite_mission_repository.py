@@ -6,10 +6,12 @@ import sqlite3
 import json
 from typing import List, Optional
 from ..models.mission import Mission, MissionStatus
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, instrumented
+from .query_log import connect
 from ..core.exceptions import DatabaseError
 from ..core.logger import NexusLogger
 
+@instrumented("mission")
 class SQLiteMissionRepository(BaseRepository):
     """SQLite implementation of mission repository"""
     
@@ -21,7 +23,7 @@ class SQLiteMissionRepository(BaseRepository):
     def _initialize_tables(self):
         """Initialize database tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS missions (
                         id TEXT PRIMARY KEY,
@@ -50,7 +52,7 @@ class SQLiteMissionRepository(BaseRepository):
     def save(self, mission: Mission) -> Mission:
         """Save a mission"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 # Serialize mission data
                 mission_data = mission.to_dict()
                 data_json = json.dumps(mission_data)
@@ -83,7 +85,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_by_id(self, mission_id: str) -> Optional[Mission]:
         """Find mission by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM missions WHERE id = ?",
                     (mission_id,)
@@ -104,7 +106,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_all(self) -> List[Mission]:
         """Find all missions"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("SELECT data FROM missions ORDER BY created_at")
                 rows = cursor.fetchall()
                 
@@ -124,7 +126,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_by_player(self, player_id: str) -> List[Mission]:
         """Find missions by player ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM missions WHERE player_id = ? ORDER BY started_at DESC",
                     (player_id,)
@@ -147,7 +149,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_by_status(self, status: MissionStatus) -> List[Mission]:
         """Find missions by status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM missions WHERE status = ? ORDER BY created_at",
                     (status.value,)
@@ -170,7 +172,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_by_player_and_status(self, player_id: str, status: MissionStatus) -> List[Mission]:
         """Find missions by player and status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM missions WHERE player_id = ? AND status = ? ORDER BY started_at DESC",
                     (player_id, status.value)
@@ -193,7 +195,7 @@ class SQLiteMissionRepository(BaseRepository):
     def find_available_for_player(self, player_level: int, completed_missions: List[str]) -> List[Mission]:
         """Find available missions for a player"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 # Get missions that are available and meet level requirements
                 cursor = conn.execute(
                     "SELECT data FROM missions WHERE status = 'available' ORDER BY created_at",
@@ -228,7 +230,7 @@ class SQLiteMissionRepository(BaseRepository):
     def count(self) -> int:
         """Count total missions"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM missions")
                 return cursor.fetchone()[0]
                 
@@ -238,7 +240,7 @@ class SQLiteMissionRepository(BaseRepository):
     def count_by_status(self, status: MissionStatus) -> int:
         """Count missions by status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT COUNT(*) FROM missions WHERE status = ?",
                     (status.value,)
@@ -251,7 +253,7 @@ class SQLiteMissionRepository(BaseRepository):
     def count_by_player(self, player_id: str) -> int:
         """Count missions for a player"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT COUNT(*) FROM missions WHERE player_id = ?",
                     (player_id,)
@@ -264,7 +266,7 @@ class SQLiteMissionRepository(BaseRepository):
     def delete(self, mission_id: str) -> bool:
         """Delete a mission"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "DELETE FROM missions WHERE id = ?",
                     (mission_id,)
@@ -284,12 +286,12 @@ class SQLiteMissionRepository(BaseRepository):
     def cleanup_old_missions(self, days_ago: int = 30):
         """Clean up old completed missions"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("""
                     DELETE FROM missions 
                     WHERE status = 'completed' 
-                    AND datetime(completed_at) < datetime('now', '-{} days')
-                """.format(days_ago))
+                    AND datetime(completed_at) < datetime('now', ?)
+                """, (f"-{int(days_ago)} days",))
                 
                 conn.commit()
                 deleted_count = cursor.rowcount
@@ -305,7 +307,7 @@ class SQLiteMissionRepository(BaseRepository):
     def get_mission_statistics(self) -> dict:
         """Get mission statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 stats = {}
                 
                 # Total missions
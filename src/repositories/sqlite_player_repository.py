@@ -3,26 +3,79 @@ SQLite implementation of player repository
 """
 
 import sqlite3
+import base64
 import json
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ..models.player import Player
-from .base_repository import BaseRepository
-from ..core.exceptions import DatabaseError
+from .base_repository import BaseRepository, instrumented
+from .name_index import NgramIndex
+from .query_log import connect
+from ..core.exceptions import DatabaseError, ValidationError
 from ..core.logger import NexusLogger
 
+@instrumented("player")
 class SQLitePlayerRepository(BaseRepository):
     """SQLite implementation of player repository"""
     
+    # Sort keys accepted by query_players, mapped to indexed columns
+    SORT_COLUMNS = {
+        "name": "name",
+        "id": "id",
+        "created_at": "created_at",
+        "level": "level",
+        "stats.level": "level",
+        "credits": "credits",
+        "stats.credits": "credits",
+        "missions_completed": "missions_completed",
+        "stats.total_missions_completed": "missions_completed",
+    }
+    
+    # Fields query_players can project, mapped to columns
+    PROJECTION_FIELDS = {
+        "id": "id",
+        "name": "name",
+        "is_vip": "is_vip",
+        "is_online": "is_online",
+        "created_at": "created_at",
+        "last_login": "last_login",
+        "level": "level",
+        "credits": "credits",
+        "missions_completed": "missions_completed",
+        "banned": "banned",
+    }
+    
+    # Numeric columns streamed for analytics, with the SQL that reads each
+    STAT_COLUMNS = {
+        "level": "level",
+        "credits": "credits",
+        "missions_completed": "missions_completed",
+        "is_vip": "is_vip",
+        "cpu_tier": "COALESCE(json_extract(data, '$.virtual_computer.cpu_tier'), 1)",
+        "ram_tier": "COALESCE(json_extract(data, '$.virtual_computer.ram_tier'), 1)",
+        "nic_tier": "COALESCE(json_extract(data, '$.virtual_computer.nic_tier'), 1)",
+        "ssd_tier": "COALESCE(json_extract(data, '$.virtual_computer.ssd_tier'), 1)",
+    }
+    
+    DEFAULT_FIELDS = ("id", "name", "level", "credits")
+    MAX_PAGE_SIZE = 500
+    
+    # Trigram search needs queries at least this long
+    MIN_TRIGRAM_QUERY = 3
+    
     def __init__(self, db_path: str = "nexus_root.db"):
         self.db_path = db_path
         self.logger = NexusLogger.get_logger("player_repository")
+        self.fts_enabled = False
+        # Only built when SQLite has no FTS5 trigram tokenizer
+        self.name_index: Optional[NgramIndex] = None
         self._initialize_tables()
     
     def _initialize_tables(self):
         """Initialize database tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS players (
                         id TEXT PRIMARY KEY,
@@ -33,6 +86,12 @@ class SQLitePlayerRepository(BaseRepository):
                         last_login TEXT NOT NULL,
                         is_online BOOLEAN DEFAULT FALSE,
                         password_hash TEXT,
+                        level INTEGER NOT NULL DEFAULT 1,
+                        credits INTEGER NOT NULL DEFAULT 0,
+                        missions_completed INTEGER NOT NULL DEFAULT 0,
+                        banned INTEGER NOT NULL DEFAULT 0,
+                        ban_reason TEXT,
+                        ban_expires_at TEXT,
                         data TEXT NOT NULL
                     )
                 """)
@@ -63,9 +122,25 @@ class SQLitePlayerRepository(BaseRepository):
                     )
                 """)
 
+                self._migrate(conn)
+
                 # Create indices
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players(name)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_players_session ON players(session_id)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
+                # Sort columns end with id so keyset pages can seek on (column, id)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_level ON players(level, id)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_credits ON players(credits, id)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_missions ON players(missions_completed, id)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_created ON players(created_at, id)")
+                # Only banned rows are indexed, so ban lists scale with the number of bans
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_banned ON players(ban_expires_at) WHERE banned = 1")
+                # Lets short prefix searches use LIKE, which is case-insensitive
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_players_name_nocase ON players(name COLLATE NOCASE)")
+                
+                self.fts_enabled = self._initialize_name_search(conn)
+                if not self.fts_enabled:
+                    self.name_index = NgramIndex(entries=conn.execute("SELECT id, name FROM players"))
                 
                 conn.commit()
                 self.logger.debug("Initialized player and admin tables")
@@ -73,10 +148,75 @@ class SQLitePlayerRepository(BaseRepository):
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to initialize tables: {str(e)}")
     
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns missing from databases created by older versions"""
+        # Sessions created before expiry tracking lack this column
+        session_columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if "expires_at" not in session_columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN expires_at REAL")
+
+        # Stats used for sorting were only stored inside the JSON data
+        player_columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+        stat_columns = {
+            "level": ("INTEGER NOT NULL DEFAULT 1", "$.stats.level"),
+            "credits": ("INTEGER NOT NULL DEFAULT 0", "$.stats.credits"),
+            "missions_completed": ("INTEGER NOT NULL DEFAULT 0", "$.stats.total_missions_completed"),
+        }
+        for column, (definition, json_path) in stat_columns.items():
+            if column not in player_columns:
+                conn.execute(f"ALTER TABLE players ADD COLUMN {column} {definition}")
+                conn.execute(
+                    f"UPDATE players SET {column} = COALESCE(json_extract(data, ?), {column})",
+                    (json_path,)
+                )
+                self.logger.info(f"Migrated players table: added {column}")
+
+        # Moderation state was never persisted before, so there is nothing to backfill
+        for column, definition in (("banned", "INTEGER NOT NULL DEFAULT 0"), ("ban_reason", "TEXT"),
+                                   ("ban_expires_at", "TEXT")):
+            if column not in player_columns:
+                conn.execute(f"ALTER TABLE players ADD COLUMN {column} {definition}")
+    
+    def _initialize_name_search(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 trigram index on player names; False if unsupported"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players_fts'"
+        ).fetchone()
+        if not exists:
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE players_fts USING fts5(
+                        name, content='players', content_rowid='rowid', tokenize='trigram'
+                    )
+                """)
+            except sqlite3.OperationalError as e:
+                self.logger.info(f"FTS5 trigram search unavailable, using in-memory name index: {e}")
+                return False
+            conn.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+
+        # External content tables are kept in sync by triggers
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS players_fts_insert AFTER INSERT ON players BEGIN
+                INSERT INTO players_fts(rowid, name) VALUES (new.rowid, new.name);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS players_fts_delete AFTER DELETE ON players BEGIN
+                INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS players_fts_update AFTER UPDATE OF name ON players BEGIN
+                INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+                INSERT INTO players_fts(rowid, name) VALUES (new.rowid, new.name);
+            END
+        """)
+        return True
+    
     def save(self, player: Player) -> Player:
         """Save a player"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 # Generate ID if new player
                 if not player.id:
                     player.id = str(uuid.uuid4())
@@ -85,11 +225,26 @@ class SQLitePlayerRepository(BaseRepository):
                 player_data = player.to_dict()
                 data_json = json.dumps(player_data)
                 
-                # Insert or update
+                # Upsert rather than REPLACE so the row (and its rowid in the
+                # name search index) is updated in place. Moderation state and
+                # the password hash of existing rows are written only by
+                # set_ban(s) and set_password_hash, so saving a player loaded
+                # before a ban or rehash cannot undo it
                 conn.execute("""
-                    INSERT OR REPLACE INTO players 
-                    (id, name, is_vip, session_id, created_at, last_login, is_online, password_hash, data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO players 
+                    (id, name, is_vip, session_id, created_at, last_login, is_online, password_hash,
+                     level, credits, missions_completed, banned, ban_reason, ban_expires_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name = excluded.name, is_vip = excluded.is_vip, session_id = excluded.session_id,
+                        created_at = excluded.created_at, last_login = excluded.last_login,
+                        is_online = excluded.is_online,
+                        level = excluded.level, credits = excluded.credits,
+                        missions_completed = excluded.missions_completed,
+                        data = json_set(excluded.data,
+                            '$.password_hash', players.password_hash,
+                            '$.banned', json(CASE WHEN players.banned THEN 'true' ELSE 'false' END),
+                            '$.ban_reason', players.ban_reason, '$.ban_expires_at', players.ban_expires_at)
                 """, (
                     player.id,
                     player.name,
@@ -99,11 +254,20 @@ class SQLitePlayerRepository(BaseRepository):
                     player.last_login.isoformat(),
                     player.is_online,
                     getattr(player, 'password_hash', None),
+                    player.stats.level,
+                    player.stats.credits,
+                    player.stats.total_missions_completed,
+                    player.banned,
+                    player.ban_reason,
+                    player.ban_expires_at.isoformat() if player.ban_expires_at else None,
                     data_json
                 ))
                 
                 conn.commit()
                 self.logger.debug(f"Saved player: {player.name}")
+            
+            if self.name_index is not None:
+                self.name_index.add(player.id, player.name)
                 
             return player
             
@@ -113,7 +277,7 @@ class SQLitePlayerRepository(BaseRepository):
     def find_by_id(self, player_id: str) -> Optional[Player]:
         """Find player by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM players WHERE id = ?",
                     (player_id,)
@@ -134,7 +298,7 @@ class SQLitePlayerRepository(BaseRepository):
     def find_by_name(self, name: str) -> Optional[Player]:
         """Find player by name"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM players WHERE name = ?",
                     (name,)
@@ -155,7 +319,7 @@ class SQLitePlayerRepository(BaseRepository):
     def find_by_session_id(self, session_id: str) -> Optional[Player]:
         """Find player by session ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM players WHERE session_id = ?",
                     (session_id,)
@@ -176,7 +340,7 @@ class SQLitePlayerRepository(BaseRepository):
     def find_all(self) -> List[Player]:
         """Find all players"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("SELECT data FROM players ORDER BY created_at")
                 rows = cursor.fetchall()
                 
@@ -193,10 +357,341 @@ class SQLitePlayerRepository(BaseRepository):
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to find all players: {str(e)}")
     
+    def query_players(self, search: str = None, sort: str = "name", order: str = "asc", cursor: str = None,
+                      limit: int = 50, fields: List[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Query one page of players as light projections.
+
+        Sorting uses indexed columns with id as a tie-breaker, and pages are
+        addressed by an opaque keyset cursor, so each page is an index seek
+        regardless of table size. Returns the rows and the next page cursor
+        (None on the last page).
+        """
+        sort_column = self.SORT_COLUMNS.get(sort)
+        if sort_column is None:
+            raise ValidationError(f"Cannot sort players by '{sort}'")
+        if order not in ("asc", "desc"):
+            raise ValidationError(f"Invalid sort order '{order}'")
+        fields = self._resolve_fields(fields or list(self.DEFAULT_FIELDS))
+        limit = max(1, min(int(limit), self.MAX_PAGE_SIZE))
+
+        # The sort value and id are always selected so the cursor can be built
+        columns = [self.PROJECTION_FIELDS[field] for field in fields] + [sort_column, "id"]
+        where, params = [], []
+        if search and self.fts_enabled and len(search) >= self.MIN_TRIGRAM_QUERY:
+            where.append("rowid IN (SELECT rowid FROM players_fts WHERE players_fts MATCH ?)")
+            params.append(self._fts_phrase(search))
+        elif search:
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append("%" + self._escape_like(search) + "%")
+        if cursor:
+            last_value, last_id = self._decode_cursor(cursor)
+            where.append(f"({sort_column}, id) {'>' if order == 'asc' else '<'} (?, ?)")
+            params.extend([last_value, last_id])
+
+        direction = order.upper()
+        query = f"SELECT {', '.join(columns)} FROM players"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {sort_column} {direction}, id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        try:
+            with connect(self.db_path) as conn:
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to query players: {str(e)}")
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1][-2], rows[-1][-1])
+
+        return [self._projection(fields, row) for row in rows], next_cursor
+
+    def iter_players(self, fields: List[str] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate player projections in storage order, one batch at a time.
+
+        Each batch is a separate keyset query on rowid, so no read
+        transaction stays open while the caller is busy with earlier rows.
+        Fields are validated before iteration starts.
+        """
+        fields = self._resolve_fields(fields or list(self.PROJECTION_FIELDS))
+        query = (
+            f"SELECT rowid, {', '.join(self.PROJECTION_FIELDS[field] for field in fields)} "
+            "FROM players WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        )
+        return self._iter_batches(query, fields, batch_size)
+
+    def _iter_batches(self, query: str, fields: List[str], batch_size: int) -> Iterator[Dict[str, Any]]:
+        last_rowid = 0
+        while True:
+            try:
+                with connect(self.db_path) as conn:
+                    rows = conn.execute(query, (last_rowid, batch_size)).fetchall()
+            except sqlite3.Error as e:
+                raise DatabaseError(f"Failed to iterate players: {str(e)}")
+            for row in rows:
+                yield self._projection(fields, row[1:])
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    def iter_stat_batches(self, batch_size: int = 50000) -> Iterator[List[tuple]]:
+        """
+        Iterate numeric stat rows in batches, in the order of STAT_COLUMNS.
+
+        Hardware tiers only live in the JSON data, so they are extracted
+        in SQL rather than by deserializing each player.
+        """
+        query = (
+            f"SELECT rowid, {', '.join(self.STAT_COLUMNS.values())} "
+            "FROM players WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        )
+        last_rowid = 0
+        while True:
+            try:
+                with connect(self.db_path) as conn:
+                    rows = conn.execute(query, (last_rowid, batch_size)).fetchall()
+            except sqlite3.Error as e:
+                raise DatabaseError(f"Failed to iterate player stats: {str(e)}")
+            if rows:
+                yield [row[1:] for row in rows]
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    def _resolve_fields(self, fields: List[str]) -> List[str]:
+        unknown = [field for field in fields if field not in self.PROJECTION_FIELDS]
+        if unknown:
+            raise ValidationError(f"Unknown player fields: {', '.join(unknown)}")
+        return fields
+
+    @staticmethod
+    def _projection(fields: List[str], row) -> Dict[str, Any]:
+        player = dict(zip(fields, row))
+        for field in ("is_vip", "is_online", "banned"):
+            if field in player:
+                player[field] = bool(player[field])
+        return player
+
+    def search_players(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find players whose name contains the query, best matches first.
+
+        Exact matches rank first, then prefix matches, then shorter names.
+        Queries shorter than a trigram only match name prefixes.
+        """
+        query = (query or "").strip()
+        if not query:
+            return []
+        limit = max(1, min(int(limit), self.MAX_PAGE_SIZE))
+
+        if self.name_index is not None:
+            matches = self.name_index.search(query, limit)
+            if not matches:
+                return []
+            placeholders = ", ".join("?" for _ in matches)
+            try:
+                with connect(self.db_path) as conn:
+                    rows = conn.execute(
+                        f"SELECT id, name, level, credits FROM players WHERE id IN ({placeholders})",
+                        [player_id for player_id, _ in matches]
+                    ).fetchall()
+            except sqlite3.Error as e:
+                raise DatabaseError(f"Failed to search players: {str(e)}")
+            by_id = {row[0]: row for row in rows}
+            return [dict(zip(self.DEFAULT_FIELDS, by_id[player_id])) for player_id, _ in matches if player_id in by_id]
+
+        escaped = self._escape_like(query)
+        ranking = "ORDER BY lower(name) = lower(?) DESC, name LIKE ? ESCAPE '\\' DESC, length(name), name COLLATE NOCASE"
+        if len(query) >= self.MIN_TRIGRAM_QUERY:
+            sql = (
+                "SELECT id, name, level, credits FROM players "
+                "WHERE rowid IN (SELECT rowid FROM players_fts WHERE players_fts MATCH ?) "
+                f"{ranking} LIMIT ?"
+            )
+            params = [self._fts_phrase(query), query, escaped + "%", limit]
+        else:
+            sql = f"SELECT id, name, level, credits FROM players WHERE name LIKE ? ESCAPE '\\' {ranking} LIMIT ?"
+            params = [escaped + "%", query, escaped + "%", limit]
+
+        try:
+            with connect(self.db_path) as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to search players: {str(e)}")
+        return [dict(zip(self.DEFAULT_FIELDS, row)) for row in rows]
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _fts_phrase(text: str) -> str:
+        # A quoted phrase matches the text literally under the trigram tokenizer
+        return '"' + text.replace('"', '""') + '"'
+
+    @staticmethod
+    def _encode_cursor(sort_value, player_id: str) -> str:
+        return base64.urlsafe_b64encode(json.dumps([sort_value, player_id]).encode()).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            sort_value, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return sort_value, player_id
+        except (ValueError, TypeError):
+            raise ValidationError("Invalid page cursor")
+    
+    def set_ban(self, player_id: str, banned: bool, reason: str = None, expires_at: datetime = None) -> bool:
+        """Set a player's moderation state without loading the player; False if not found"""
+        expires = expires_at.isoformat() if expires_at else None
+        try:
+            with connect(self.db_path) as conn:
+                # The JSON data is updated too so loaded players see the same state
+                cursor = conn.execute("""
+                    UPDATE players SET banned = ?, ban_reason = ?, ban_expires_at = ?,
+                        data = json_set(data, '$.banned', json(?), '$.ban_reason', ?, '$.ban_expires_at', ?)
+                    WHERE id = ?
+                """, (banned, reason, expires, "true" if banned else "false", reason, expires, player_id))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to update ban for player {player_id}: {str(e)}")
+    
+    def set_password_hash(self, player_id: str, password_hash: str) -> bool:
+        """Replace a player's password hash without loading the player; False if not found"""
+        try:
+            with connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    UPDATE players SET password_hash = ?, data = json_set(data, '$.password_hash', ?)
+                    WHERE id = ?
+                """, (password_hash, password_hash, player_id))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to update password for player {player_id}: {str(e)}")
+    
+    def set_bans(self, player_ids: List[str], banned: bool, reason: str = None,
+                 expires_at: datetime = None) -> Dict[str, Tuple[str, bool]]:
+        """
+        Set the moderation state of many players in one transaction.
+
+        Returns the name of each player found and whether they were under
+        a ban that had not expired, as Player.is_banned would say; ids
+        missing from the result do not exist. Unbanning only touches
+        players that are flagged as banned, expired or not.
+        """
+        expires = expires_at.isoformat() if expires_at else None
+        now = datetime.now()
+        try:
+            with connect(self.db_path) as conn:
+                found, flagged = {}, set()
+                for chunk in self._chunks(player_ids):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    for player_id, name, was_flagged, was_expires in conn.execute(
+                        f"SELECT id, name, banned, ban_expires_at FROM players WHERE id IN ({placeholders})", chunk
+                    ):
+                        active = bool(was_flagged) and (was_expires is None or datetime.fromisoformat(was_expires) > now)
+                        found[player_id] = (name, active)
+                        if was_flagged:
+                            flagged.add(player_id)
+
+                targets = [player_id for player_id in found if banned or player_id in flagged]
+                conn.executemany("""
+                    UPDATE players SET banned = ?, ban_reason = ?, ban_expires_at = ?,
+                        data = json_set(data, '$.banned', json(?), '$.ban_reason', ?, '$.ban_expires_at', ?)
+                    WHERE id = ?
+                """, [(banned, reason, expires, "true" if banned else "false", reason, expires, player_id)
+                      for player_id in targets])
+                conn.commit()
+                return found
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to update bans for {len(player_ids)} players: {str(e)}")
+    
+    def add_banned_ips(self, entries: List[str]) -> List[str]:
+        """Insert normalized IP ban entries in one transaction; returns those not already banned"""
+        try:
+            with connect(self.db_path) as conn:
+                existing = self._existing_banned_ips(conn, entries)
+                added = [entry for entry in entries if entry not in existing]
+                conn.executemany(
+                    "INSERT INTO banned_ips (id, ip_address) VALUES (?, ?)",
+                    [(str(uuid.uuid4()), entry) for entry in added]
+                )
+                conn.commit()
+                return added
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to ban {len(entries)} IP addresses: {str(e)}")
+    
+    def remove_banned_ips(self, entries: Dict[str, str]) -> List[str]:
+        """
+        Delete IP ban entries in one transaction; returns those that were banned.
+
+        entries maps each normalized entry to the address as it was given,
+        which is also deleted since rows may predate normalization (as
+        with a single unban).
+        """
+        try:
+            with connect(self.db_path) as conn:
+                existing = self._existing_banned_ips(conn, list(set(entries) | set(entries.values())))
+                removed = [entry for entry, given in entries.items() if entry in existing or given in existing]
+                conn.executemany(
+                    "DELETE FROM banned_ips WHERE ip_address IN (?, ?)",
+                    [(entry, entries[entry]) for entry in removed]
+                )
+                conn.commit()
+                return removed
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to unban {len(entries)} IP addresses: {str(e)}")
+    
+    def _existing_banned_ips(self, conn: sqlite3.Connection, entries: List[str]) -> set:
+        existing = set()
+        for chunk in self._chunks(entries):
+            placeholders = ", ".join("?" for _ in chunk)
+            existing.update(row[0] for row in conn.execute(
+                f"SELECT ip_address FROM banned_ips WHERE ip_address IN ({placeholders})", chunk
+            ))
+        return existing
+    
+    @staticmethod
+    def _chunks(items: List[str], size: int = 500):
+        # Stay well under SQLite's limit on bound parameters
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+    
+    def find_banned(self, now: datetime = None) -> List[Dict[str, Any]]:
+        """Find players under an active ban as id, name, reason and expiry"""
+        now = now or datetime.now()
+        try:
+            with connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    SELECT id, name, ban_reason, ban_expires_at FROM players
+                    WHERE banned = 1 AND (ban_expires_at IS NULL OR ban_expires_at > ?)
+                    ORDER BY name
+                """, (now.isoformat(),))
+                return [
+                    {"id": row[0], "name": row[1], "ban_reason": row[2], "ban_expires_at": row[3]}
+                    for row in cursor.fetchall()
+                ]
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to find banned players: {str(e)}")
+    
+    def find_banned_ips(self) -> List[str]:
+        """Find all banned IP addresses and ranges"""
+        try:
+            with connect(self.db_path) as conn:
+                cursor = conn.execute("SELECT ip_address FROM banned_ips")
+                return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to find banned IPs: {str(e)}")
+    
     def find_online_players(self) -> List[Player]:
         """Find all online players"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT data FROM players WHERE is_online = TRUE ORDER BY last_login DESC"
                 )
@@ -218,16 +713,14 @@ class SQLitePlayerRepository(BaseRepository):
     def get_leaderboard(self, category: str = "level", limit: int = 10) -> List[Player]:
         """Get player leaderboard"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Use JSON extraction for sorting
-                if category == "level":
-                    order_clause = "json_extract(data, '$.stats.level') DESC"
-                elif category == "credits":
-                    order_clause = "json_extract(data, '$.stats.credits') DESC"
+            with connect(self.db_path) as conn:
+                # Sort on the indexed stat columns
+                if category == "credits":
+                    order_clause = "credits DESC"
                 elif category == "missions":
-                    order_clause = "json_extract(data, '$.stats.total_missions_completed') DESC"
+                    order_clause = "missions_completed DESC"
                 else:
-                    order_clause = "json_extract(data, '$.stats.level') DESC"
+                    order_clause = "level DESC"
                 
                 cursor = conn.execute(f"""
                     SELECT data FROM players 
@@ -252,7 +745,7 @@ class SQLitePlayerRepository(BaseRepository):
     def delete(self, player_id: str) -> bool:
         """Delete a player"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "DELETE FROM players WHERE id = ?",
                     (player_id,)
@@ -263,6 +756,8 @@ class SQLitePlayerRepository(BaseRepository):
                 
                 if deleted:
                     self.logger.info(f"Deleted player: {player_id}")
+                    if self.name_index is not None:
+                        self.name_index.remove(player_id)
                 
                 return deleted
                 
@@ -272,7 +767,7 @@ class SQLitePlayerRepository(BaseRepository):
     def count(self) -> int:
         """Count total players"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM players")
                 return cursor.fetchone()[0]
                 
@@ -282,7 +777,7 @@ class SQLitePlayerRepository(BaseRepository):
     def count_online(self) -> int:
         """Count online players"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM players WHERE is_online = TRUE")
                 return cursor.fetchone()[0]
                 
@@ -292,13 +787,13 @@ class SQLitePlayerRepository(BaseRepository):
     def cleanup_old_sessions(self, hours_ago: int = 24):
         """Clean up old sessions"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with connect(self.db_path) as conn:
                 conn.execute("""
                     UPDATE players 
                     SET is_online = FALSE, session_id = NULL 
                     WHERE is_online = TRUE 
-                    AND datetime(last_login) < datetime('now', '-{} hours')
-                """.format(hours_ago))
+                    AND datetime(last_login) < datetime('now', ?)
+                """, (f"-{int(hours_ago)} hours",))
                 
                 conn.commit()
                 self.logger.info(f"Cleaned up sessions older than {hours_ago} hours")
@@ -2,39 +2,221 @@
 Simple HTTP server for the Game API
 """
 
+import hmac
 import json
+import math
+import re
+import threading
+import time
 import urllib.parse
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
 from ..api.game_api import GameAPI
 from ..api.admin_api import AdminAPI
 from ..api.auth_api import AuthAPI
 from ..services.auth_service import AuthService
 from ..services.admin_service import AdminService
+from ..services.analytics_service import MAX_CREDIT_MULTIPLIER, AnalyticsService
 from ..services.admin_auth_service import AdminAuthService
-from ..core.config import NexusConfig
+from ..services.session_store import SessionStore
+from ..services.token_service import TokenService
+from ..services.password_hasher import PasswordHasher
+from ..services.rate_limiter import RateLimiter, classify_route
+from ..core.config import NexusConfig, MonitoringConfig
+from ..core.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from ..core.tracing import TRACER, Tracer
+from ..core.profiling import SAMPLING_PROFILER, REQUEST_PROFILES, RequestProfiles
+from ..core.exceptions import NexusException
 from ..core.logger import NexusLogger
 
+# Bulk moderation paths mapped to their action; these
+# must be matched before the per-player /admin/api/players/<id>/<action> routes
+BULK_MODERATION_ROUTES = {
+    "/admin/api/players/bulk-ban": "ban_players",
+    "/admin/api/players/bulk-unban": "unban_players",
+    "/admin/api/ips/bulk-ban": "ban_ips",
+    "/admin/api/ips/bulk-unban": "unban_ips",
+}
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "nexus_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route")
+)
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "nexus_http_requests_total",
+    "HTTP requests by route and status code",
+    ("method", "route", "status")
+)
+
+# Fixed paths served by the handler, used as metric labels as-is
+STATIC_ROUTES = frozenset({
+    "/", "/admin", "/metrics",
+    "/api/status", "/api/leaderboard", "/api/statistics", "/api/announcement",
+    "/api/register", "/api/login", "/api/logout", "/api/player/create", "/api/player/logout",
+    "/api/command/execute", "/api/command/batch", "/api/script/execute", "/api/hardware/upgrade",
+    "/api/mission/start", "/api/mission/abandon", "/api/mining/start", "/api/mining/check",
+    "/admin/api/login", "/admin/api/logout", "/admin/api/players", "/admin/api/players/export",
+    "/admin/api/players/search", "/admin/api/banned-players", "/admin/api/script-profile",
+    "/admin/api/announcement", "/admin/api/ips/ban", "/admin/api/ips/unban", "/admin/api/traces",
+    "/admin/api/queries", "/admin/api/profiler", "/admin/api/profiler/start", "/admin/api/profiler/stop",
+    "/admin/api/profiler/requests", "/admin/api/analytics",
+}) | frozenset(BULK_MODERATION_ROUTES)
+
+PLAYER_ACTION_PATH = re.compile(r"^/admin/api/players/[^/]+/(ban|unban)$")
+
+def route_label(path: str, status: int) -> str:
+    """Route template for metrics; anything else is 'unmatched' so clients cannot create series"""
+    path = path.split("?", 1)[0]
+    if status == 404:
+        return "unmatched"
+    if path in STATIC_ROUTES:
+        return path
+    if path.startswith("/api/player/") and path.count("/") == 3:
+        return "/api/player/{name}"
+    if PLAYER_ACTION_PATH.match(path):
+        return "/admin/api/players/{id}/{action}"
+    return "unmatched"
+
+class NexusHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTPServer that handles each request on its own thread, with a listen
+    backlog sized for bursts of new connections.
+
+    A slow request (a password hash, a large admin export) no longer holds
+    up the requests behind it. GameAPI serializes requests for the same
+    player, and the shared services guard their state with locks.
+    """
+
+    # Responses close the connection, so every request is a new connect;
+    # the default backlog of 5 refuses connections under load
+    request_queue_size = 128
+    # Request threads must not keep the process alive on shutdown
+    daemon_threads = True
+
 class CustomAPIHandler(BaseHTTPRequestHandler):
     """HTTP handler for Game API requests"""
     
-    def __init__(self, *args, game_api: GameAPI = None, admin_api: AdminAPI = None, admin_auth_service: AdminAuthService = None, auth_api: AuthAPI = None, **kwargs):
+    def __init__(self, *args, game_api: GameAPI = None, admin_api: AdminAPI = None, admin_auth_service: AdminAuthService = None, auth_api: AuthAPI = None, rate_limiter: RateLimiter = None, monitoring: MonitoringConfig = None, **kwargs):
         self.game_api = game_api
         self.admin_api = admin_api
         self.admin_auth_service = admin_auth_service
         self.auth_api = auth_api
+        self.rate_limiter = rate_limiter
+        self.monitoring = monitoring or MonitoringConfig(metrics_enabled=False)
         super().__init__(*args, **kwargs)
     
-    def is_admin_authenticated(self):
-        """Check if the request is from an authenticated admin"""
+    def handle_one_request(self):
+        """Handle one request, recording its latency and status"""
+        self._request_started = None
+        self._response_status = None
+        self._profile = None
+        self._profile_id = None
+        with TRACER.span("http.request") as span:
+            try:
+                super().handle_one_request()
+            finally:
+                # A request that fails mid-response must not leave this thread profiled
+                if self._profile is not None:
+                    REQUEST_PROFILES.stop(self._profile)
+            if self._profile is not None:
+                REQUEST_PROFILES.add(
+                    self._profile_id, self.command, self.path,
+                    (time.perf_counter() - self._request_started) * 1000, self._profile
+                )
+            if self._request_started is not None and self._response_status is not None:
+                route = route_label(self.path, self._response_status)
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - self._request_started, self.command, route)
+                HTTP_REQUESTS_TOTAL.inc(1, self.command, route, str(self._response_status))
+                span.set_attribute("method", self.command)
+                span.set_attribute("route", route)
+                span.set_attribute("status", self._response_status)
+    
+    def parse_request(self):
+        """Start the request timer once the request line and headers are read"""
+        parsed = super().parse_request()
+        if parsed:
+            self._request_started = time.perf_counter()
+            self.start_request_profile()
+        return parsed
+    
+    def start_request_profile(self):
+        """cProfile this request if it carries a valid admin token in X-Nexus-Profile"""
+        token = self.headers.get("X-Nexus-Profile")
+        if not token or not self.monitoring.profiling_enabled:
+            return
+        if not self.admin_auth_service.is_authenticated(token):
+            return
+        # Runs unprofiled, without a profile id, while another request is profiled
+        self._profile = REQUEST_PROFILES.start()
+        if self._profile is not None:
+            self._profile_id = RequestProfiles.new_id()
+    
+    def send_response(self, code, message=None):
+        self._response_status = code
+        super().send_response(code, message)
+    
+    def end_headers(self):
+        if self._profile_id is not None:
+            self.send_header("X-Nexus-Profile-Id", self._profile_id)
+        super().end_headers()
+    
+    def is_rate_limited(self):
+        """Charge the request to its rate limit buckets; sends 429 when exhausted"""
+        if self.rate_limiter is None:
+            return False
+
+        # Runs before the body is read; token verification needs no I/O
+        claims = self.get_authenticated_player()
+        retry_after = self.rate_limiter.check_request(
+            classify_route(self.path),
+            self.client_address[0],
+            claims["pid"] if claims else None,
+            bool(claims and claims.get("vip"))
+        )
+        if not retry_after:
+            return False
+
+        body = json.dumps({"success": False, "error": "Rate limit exceeded", "retry_after": retry_after}).encode('utf-8')
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Retry-After", str(max(1, math.ceil(retry_after))))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        # The request body was never read, so the connection cannot be reused
+        self.close_connection = True
+        return True
+    
+    def get_bearer_token(self):
+        """Get the bearer token from the Authorization header"""
         auth_header = self.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return False
+            return None
+        return auth_header.split(" ")[1]
 
-        token = auth_header.split(" ")[1]
+    def is_admin_authenticated(self):
+        """Check if the request is from an authenticated admin"""
+        token = self.get_bearer_token()
+        if not token:
+            return False
         return self.admin_auth_service.is_authenticated(token)
 
+    def get_authenticated_player(self):
+        """Get the claims of the player session token, or None"""
+        token = self.get_bearer_token()
+        if not token:
+            return None
+        try:
+            return self.auth_api.auth_service.verify_token(token)
+        except NexusException:
+            return None
+
     def do_GET(self):
         """Handle GET requests"""
+        if self.is_rate_limited():
+            return
         try:
             path_parts = self.path.split('?')
             path = path_parts[0]
@@ -49,6 +231,8 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                 self.serve_admin_panel()
             elif path == "/api/status":
                 self.handle_status()
+            elif path == "/metrics" and self.monitoring.metrics_enabled and self.monitoring.metrics_token:
+                self.handle_metrics()
             elif path == "/api/leaderboard":
                 category = query_params.get("category", "level")
                 limit = int(query_params.get("limit", "10"))
@@ -69,12 +253,65 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                 search = query_params.get("search")
                 sort = query_params.get("sort", "name")
                 order = query_params.get("order", "asc")
-                self.handle_get_all_players(search, sort, order)
+                cursor = query_params.get("cursor")
+                limit = int(query_params.get("limit", "50"))
+                fields = query_params["fields"].split(",") if query_params.get("fields") else None
+                self.handle_get_all_players(search, sort, order, cursor, limit, fields)
+            elif path == "/admin/api/players/export":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                export_format = query_params.get("format", "ndjson")
+                fields = query_params["fields"].split(",") if query_params.get("fields") else None
+                self.handle_export_players(export_format, fields)
+            elif path == "/admin/api/players/search":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                query = query_params.get("q", "")
+                limit = int(query_params.get("limit", "20"))
+                self.handle_search_players(query, limit)
             elif path == "/admin/api/banned-players":
                 if not self.is_admin_authenticated():
                     self.send_error(401, "Unauthorized")
                     return
                 self.handle_get_banned_players()
+            elif path == "/admin/api/traces":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                limit = int(query_params.get("limit", "20"))
+                self.handle_get_traces(limit)
+            elif path == "/admin/api/queries":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                limit = int(query_params.get("limit", "20"))
+                sort = query_params.get("sort", "total_ms")
+                self.handle_get_query_stats(limit, sort)
+            elif path == "/admin/api/profiler":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                self.handle_get_profiler(query_params.get("format", "json"))
+            elif path == "/admin/api/profiler/requests":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                self.handle_get_request_profiles(query_params.get("id"))
+            elif path == "/admin/api/analytics":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                refresh = query_params.get("refresh", "false").lower() in ("1", "true")
+                self.handle_get_analytics(query_params.get("multipliers", ""), refresh)
+            elif path == "/admin/api/script-profile":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                player_name = query_params.get("player")
+                limit = int(query_params.get("limit", "10"))
+                self.handle_get_script_profile(player_name, limit)
             else:
                 self.send_error(404, "Not Found")
                 
@@ -83,6 +320,8 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
+        if self.is_rate_limited():
+            return
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
@@ -105,12 +344,18 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                 self.handle_register(data)
             elif path == "/api/login":
                 self.handle_login(data)
+            elif path == "/api/logout":
+                self.handle_player_logout()
             elif path == "/api/player/create":
                 self.handle_create_player(data)
             elif path == "/api/player/logout":
                 self.handle_logout(data)
             elif path == "/api/command/execute":
                 self.handle_execute_command(data)
+            elif path == "/api/command/batch":
+                self.handle_execute_commands(data)
+            elif path == "/api/script/execute":
+                self.handle_execute_script(data)
             elif path == "/api/mission/start":
                 self.handle_start_mission(data)
             elif path == "/api/mission/abandon":
@@ -121,6 +366,11 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                 self.handle_start_mining(data)
             elif path == "/api/mining/check":
                 self.handle_check_mining(data)
+            elif path in BULK_MODERATION_ROUTES:
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                self.handle_bulk_moderation(BULK_MODERATION_ROUTES[path], data)
             elif path.startswith("/admin/api/players/"):
                 if not self.is_admin_authenticated():
                     self.send_error(401, "Unauthorized")
@@ -129,7 +379,7 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                 player_id = parts[-2]
                 action = parts[-1]
                 if action == "ban":
-                    self.handle_ban_player(player_id)
+                    self.handle_ban_player(player_id, data)
                 elif action == "unban":
                     self.handle_unban_player(player_id)
                 else:
@@ -149,6 +399,16 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                     self.send_error(401, "Unauthorized")
                     return
                 self.handle_unban_ip(data)
+            elif path == "/admin/api/profiler/start":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                self.handle_start_profiler(data)
+            elif path == "/admin/api/profiler/stop":
+                if not self.is_admin_authenticated():
+                    self.send_error(401, "Unauthorized")
+                    return
+                self.handle_stop_profiler()
             elif path == "/admin/api/login":
                 self.handle_admin_login(data)
             elif path == "/admin/api/logout":
@@ -331,7 +591,7 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
                             'Content-Type': 'application/json',
                             'Authorization': `Bearer ${sessionToken}`
                         },
-                        body: JSON.stringify({ command, player_name: 'test_user' })
+                        body: JSON.stringify({ command })
                     });
                     const data = await response.json();
                     const responseLine = document.createElement('div');
@@ -389,13 +649,24 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
         result = self.game_api.get_announcement()
         self.send_json_response(result)
 
+    def is_client_ip_banned(self):
+        """Check the client address against the in-memory IP ban index"""
+        if self.game_api.player_service.is_ip_banned(self.client_address[0]):
+            self.send_json_response({"success": False, "error": "Your IP address has been banned."}, 403)
+            return True
+        return False
+
     def handle_register(self, data: dict):
         """Handle register request"""
+        if self.is_client_ip_banned():
+            return
         result = self.auth_api.register(data)
         self.send_json_response(result)
 
     def handle_login(self, data: dict):
         """Handle login request"""
+        if self.is_client_ip_banned():
+            return
         result = self.auth_api.login(data)
         self.send_json_response(result)
 
@@ -431,21 +702,57 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
         result = self.game_api.logout_player(name)
         self.send_json_response(result)
     
+    def handle_player_logout(self):
+        """Handle player session logout request"""
+        result = self.auth_api.logout(self.get_bearer_token())
+        self.send_json_response(result, 200 if result["success"] else 401)
+    
     def handle_execute_command(self, data: dict):
         """Handle command execution request"""
-        player_name = data.get("player_name")
         command = data.get("command")
         
         if not command:
             self.send_json_response({"success": False, "error": "Missing command"}, 400)
             return
 
-        if not player_name:
-            # Get the player name from the session token
-            # This is a placeholder for a real implementation.
-            player_name = "test_user"
+        claims = self.get_authenticated_player()
+        if not claims:
+            self.send_json_response({"success": False, "error": "Invalid or missing session token"}, 401)
+            return
+        
+        result = self.game_api.execute_command(claims["name"], command)
+        self.send_json_response(result)
+    
+    def handle_execute_commands(self, data: dict):
+        """Handle batched command execution request"""
+        commands = data.get("commands")
+        
+        if not commands:
+            self.send_json_response({"success": False, "error": "Missing commands"}, 400)
+            return
+
+        claims = self.get_authenticated_player()
+        if not claims:
+            self.send_json_response({"success": False, "error": "Invalid or missing session token"}, 401)
+            return
+        
+        result = self.game_api.execute_commands(claims["name"], commands, bool(data.get("stop_on_error", False)))
+        self.send_json_response(result)
+    
+    def handle_execute_script(self, data: dict):
+        """Handle NexusScript execution request"""
+        source = data.get("source")
+        
+        if not source:
+            self.send_json_response({"success": False, "error": "Missing source"}, 400)
+            return
+
+        claims = self.get_authenticated_player()
+        if not claims:
+            self.send_json_response({"success": False, "error": "Invalid or missing session token"}, 401)
+            return
         
-        result = self.game_api.execute_command(player_name, command)
+        result = self.game_api.execute_script(claims["name"], source, data.get("module"))
         self.send_json_response(result)
     
     def handle_start_mission(self, data: dict):
@@ -507,9 +814,92 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
         result = self.game_api.check_passive_mining(player_name)
         self.send_json_response(result)
     
-    def handle_get_all_players(self, search: str, sort: str, order: str):
+    def handle_get_all_players(self, search: str, sort: str, order: str, cursor: str, limit: int, fields: list):
         """Handle get all players request"""
-        result = self.admin_api.get_all_players(search, sort, order)
+        result = self.admin_api.get_all_players(search, sort, order, cursor, limit, fields)
+        self.send_json_response(result)
+
+    def handle_get_traces(self, limit: int):
+        """Handle recent traces request"""
+        exporter = TRACER.memory_exporter()
+        if exporter is None:
+            self.send_json_response({"success": False, "error": "In-memory tracing is not enabled"}, 404)
+            return
+        self.send_json_response({"success": True, "data": exporter.traces(limit)})
+
+    def handle_start_profiler(self, data: dict):
+        """Handle a request to sample stacks for a number of seconds"""
+        if not self.monitoring.profiling_enabled:
+            self.send_json_response({"success": False, "error": "Profiling is disabled"}, 404)
+            return
+        try:
+            seconds = float(data.get("seconds", 10))
+            interval = float(data.get("interval_ms", 10)) / 1000
+            started = SAMPLING_PROFILER.start(seconds, interval)
+        except (TypeError, ValueError) as e:
+            self.send_json_response({"success": False, "error": str(e)}, 400)
+            return
+        if not started:
+            self.send_json_response({"success": False, "error": "A profiling session is already running"}, 409)
+            return
+        self.send_json_response({"success": True, "data": SAMPLING_PROFILER.status()})
+
+    def handle_stop_profiler(self):
+        """Handle a request to end the sampling session early"""
+        SAMPLING_PROFILER.stop()
+        self.send_json_response({"success": True, "data": SAMPLING_PROFILER.status()})
+
+    def handle_get_profiler(self, output_format: str):
+        """Handle sampling profiler status, or its collapsed stacks"""
+        if output_format != "collapsed":
+            self.send_json_response({"success": True, "data": SAMPLING_PROFILER.status()})
+            return
+        body = SAMPLING_PROFILER.collapsed().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_get_request_profiles(self, profile_id: str):
+        """Handle recent request profiles, or one profile by id"""
+        if not profile_id:
+            self.send_json_response({"success": True, "data": REQUEST_PROFILES.recent()})
+            return
+        profile = REQUEST_PROFILES.get(profile_id)
+        if profile is None:
+            self.send_json_response({"success": False, "error": "Profile not found"}, 404)
+            return
+        self.send_json_response({"success": True, "data": profile})
+
+    def handle_get_query_stats(self, limit: int, sort: str):
+        """Handle query statistics request"""
+        result = self.game_api.get_query_stats(limit, sort)
+        self.send_json_response(result)
+
+    def handle_metrics(self):
+        """Handle a metrics scrape"""
+        if not hmac.compare_digest(self.get_bearer_token() or "", self.monitoring.metrics_token):
+            self.send_error(401, "Unauthorized")
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_export_players(self, export_format: str, fields: list):
+        """Handle player export request"""
+        result = self.admin_api.export_players(export_format, fields)
+        if not result["success"]:
+            self.send_json_response(result, 400)
+            return
+        self.send_streaming_response(result["content_type"], result["chunks"], f"players.{export_format}")
+
+    def handle_search_players(self, query: str, limit: int):
+        """Handle player name search request"""
+        result = self.admin_api.search_players(query, limit)
         self.send_json_response(result)
 
     def handle_get_banned_players(self):
@@ -517,9 +907,46 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
         result = self.admin_api.get_banned_players()
         self.send_json_response(result)
 
-    def handle_ban_player(self, player_id: str):
+    def handle_get_analytics(self, multipliers: str, refresh: bool):
+        """Handle player analytics request; multipliers is a comma-separated list"""
+        try:
+            values = [float(value) for value in multipliers.split(",") if value]
+        except ValueError:
+            self.send_json_response({"success": False, "error": "Credit multipliers must be numbers"}, 400)
+            return
+        # nan passes a <= 0 check, and large values overflow the int64 credit arrays
+        if not all(math.isfinite(value) and 0 < value <= MAX_CREDIT_MULTIPLIER for value in values):
+            self.send_json_response({
+                "success": False,
+                "error": f"Credit multipliers must be above 0 and at most {MAX_CREDIT_MULTIPLIER:g}"
+            }, 400)
+            return
+        result = self.admin_api.get_player_analytics(values, refresh)
+        self.send_json_response(result)
+
+    def handle_get_script_profile(self, player_name: str, limit: int):
+        """Handle script profile report request"""
+        result = self.game_api.get_script_profile(player_name, limit)
+        self.send_json_response(result)
+
+    def handle_bulk_moderation(self, action: str, data: dict):
+        """Handle a bulk ban or unban request"""
+        if action == "ban_players":
+            result = self.admin_api.ban_players(
+                data.get("player_ids"), data.get("reason") or None, data.get("duration_minutes")
+            )
+        elif action == "unban_players":
+            result = self.admin_api.unban_players(data.get("player_ids"))
+        elif action == "ban_ips":
+            result = self.admin_api.ban_ips(data.get("ip_addresses"))
+        else:
+            result = self.admin_api.unban_ips(data.get("ip_addresses"))
+        self.send_json_response(result, 200 if result["success"] else 400)
+
+    def handle_ban_player(self, player_id: str, data: dict):
         """Handle ban player request"""
-        result = self.admin_api.ban_player(player_id)
+        reason = data.get("reason") or None
+        result = self.admin_api.ban_player(player_id, reason, data.get("duration_minutes"))
         self.send_json_response(result)
 
     def handle_unban_player(self, player_id: str):
@@ -555,9 +982,7 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
 
     def handle_admin_logout(self):
         """Handle admin logout request"""
-        auth_header = self.headers.get("Authorization")
-        token = auth_header.split(" ")[1]
-        self.admin_auth_service.logout(token)
+        self.admin_auth_service.logout(self.get_bearer_token())
         self.send_json_response({"success": True})
 
     def handle_ban_ip(self, data: dict):
@@ -595,6 +1020,39 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
         
         self.wfile.write(response_json.encode('utf-8'))
     
+    def send_streaming_response(self, content_type: str, chunks, filename: str = None):
+        """Stream text chunks as they are produced, chunk-encoded for HTTP/1.1 clients"""
+        chunked = self.request_version == "HTTP/1.1"
+        if chunked:
+            # Chunked encoding needs an HTTP/1.1 status line; the connection still closes afterwards
+            self.protocol_version = "HTTP/1.1"
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        if filename:
+            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                if not data:
+                    continue
+                if chunked:
+                    self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+                else:
+                    self.wfile.write(data)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            NexusLogger.get_logger("web_server").info("Client disconnected during streaming response")
+        except Exception as e:
+            # Headers are already sent; ending without the final chunk marks the body as truncated
+            NexusLogger.get_logger("web_server").error(f"Streaming response failed: {e}")
+
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS"""
         self.send_response(200)
@@ -605,7 +1063,8 @@ class CustomAPIHandler(BaseHTTPRequestHandler):
     
     def log_message(self, format, *args):
         """Override log message to use our logger"""
-        logger = NexusLogger.get_logger("web_server")
+        # Separate from "web_server" so access lines can be sampled on their own
+        logger = NexusLogger.get_logger("access")
         logger.info(f"{self.address_string()} - {format % args}")
 
 class WebServer:
@@ -620,19 +1079,55 @@ class WebServer:
         
         # Initialize Admin API
         player_repository = self.game_api.player_repository
-        admin_service = AdminService(player_repository)
-        self.admin_api = AdminAPI(self.game_api.player_service, admin_service)
+        player_service = self.game_api.player_service
+        admin_service = AdminService(
+            player_repository, player_service.ip_ban_index, player_service.player_ban_list, self.game_api.event_bus
+        )
+        analytics_service = AnalyticsService(player_repository, config.game)
+        self.admin_api = AdminAPI(self.game_api.player_service, admin_service, analytics_service)
 
-        # Initialize Admin Auth Service
-        self.admin_auth_service = AdminAuthService(config.database.database)
+        # Shared by both auth services, so one semaphore caps concurrent hashes across all request threads
+        self.password_hasher = PasswordHasher.from_config(config.security)
+
+        # Initialize Admin Auth Service with the in-memory session store
+        self.session_store = SessionStore.from_config(config.database.database, config.security)
+        self.session_store.load()
+        self.admin_auth_service = AdminAuthService(config.database.database, self.session_store, self.password_hasher)
 
         # Initialize Auth Service and API
-        auth_service = AuthService(config.database.database, self.game_api.player_repository)
+        auth_service = AuthService(
+            config.database.database,
+            self.game_api.player_repository,
+            TokenService.from_config(config.security),
+            self.password_hasher,
+            player_service.player_ban_list
+        )
         self.auth_api = AuthAPI(auth_service)
 
+        # Throttling per IP, player and route class (None when disabled)
+        self.rate_limiter = RateLimiter.from_config(config.game)
+
+        # Request tracing; the tracer is shared by every traced module
+        TRACER.configure(config.monitoring.tracing_sample_rate, Tracer.exporters_from_config(config.monitoring))
+        SAMPLING_PROFILER.max_duration = config.monitoring.profiler_max_seconds
+
+        if config.monitoring.metrics_enabled and not config.monitoring.metrics_token:
+            self.logger.warning("Metrics are enabled but monitoring.metrics_token is empty; /metrics is not served")
+
+        # State sizes read when /metrics is scraped
+        REGISTRY.gauge("nexus_log_records_dropped", "Log records dropped because the log queue was full").set_function(
+            NexusLogger.dropped_records)
+        REGISTRY.gauge("nexus_admin_sessions", "Admin sessions held in memory").set_function(
+            lambda: len(self.session_store))
+        REGISTRY.gauge("nexus_banned_players", "Players under an active ban").set_function(
+            lambda: len(player_service.player_ban_list))
+        if self.rate_limiter is not None:
+            REGISTRY.gauge("nexus_rate_limit_buckets", "Rate limiter buckets in memory").set_function(
+                lambda: len(self.rate_limiter))
+
         # Create handler class with game_api, admin_api, and admin_auth_service
         def handler_factory(*args, **kwargs):
-            return CustomAPIHandler(*args, game_api=self.game_api, admin_api=self.admin_api, admin_auth_service=self.admin_auth_service, auth_api=self.auth_api, **kwargs)
+            return CustomAPIHandler(*args, game_api=self.game_api, admin_api=self.admin_api, admin_auth_service=self.admin_auth_service, auth_api=self.auth_api, rate_limiter=self.rate_limiter, monitoring=config.monitoring, **kwargs)
         
         self.handler_class = handler_factory
         
@@ -641,7 +1136,8 @@ class WebServer:
         server_address = (self.config.server.host, self.config.server.port)
         
         try:
-            httpd = HTTPServer(server_address, self.handler_class)
+            httpd = NexusHTTPServer(server_address, self.handler_class)
+            self.session_store.start()
             
             self.logger.info(f"Starting server on {self.config.server.host}:{self.config.server.port}")
             print(f"Nexus Root API Server running on http://{self.config.server.host}:{self.config.server.port}")
@@ -658,5 +1154,27 @@ class WebServer:
             raise
         
         finally:
-            self.game_api.shutdown()
-            self.logger.info("Server shutdown complete")
\ No newline at end of file
+            self.shutdown_services()
+    
+    def start(self) -> tuple:
+        """Serve on a background thread; returns the bound (host, port), so port 0 picks a free port"""
+        self.httpd = NexusHTTPServer((self.config.server.host, self.config.server.port), self.handler_class)
+        self.session_store.start()
+        self.serve_thread = threading.Thread(target=self.httpd.serve_forever, name="nexus-web-server", daemon=True)
+        self.serve_thread.start()
+        self.logger.info(f"Serving in the background on {self.httpd.server_address[0]}:{self.httpd.server_address[1]}")
+        return self.httpd.server_address
+    
+    def stop(self):
+        """Stop a server started with start()"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.serve_thread.join()
+        self.shutdown_services()
+    
+    def shutdown_services(self):
+        """Stop background workers and release resources"""
+        self.session_store.stop()
+        self.game_api.shutdown()
+        TRACER.close()
+        self.logger.info("Server shutdown complete")
@@ -1,13 +1,18 @@
 import sqlite3
-import hashlib
-import uuid
 from ..core.exceptions import AuthenticationError
+from .session_store import SessionStore
+from .password_hasher import PasswordHasher
 
 class AdminAuthService:
     """Service for handling admin authentication"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, session_store: SessionStore = None, password_hasher: PasswordHasher = None):
         self.db_path = db_path
+        self.password_hasher = password_hasher or PasswordHasher()
+        if session_store is None:
+            session_store = SessionStore(db_path)
+            session_store.load()
+        self.session_store = session_store
 
     def _get_admin_user(self, username: str):
         """Get an admin user from the database"""
@@ -22,6 +27,18 @@ class AdminAuthService:
         except sqlite3.Error as e:
             raise AuthenticationError(f"Database error: {e}")
 
+    def _update_password_hash(self, admin_id: str, password_hash: str):
+        """Store a new password hash for an admin user"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "UPDATE admin_users SET password_hash = ? WHERE id = ?",
+                    (password_hash, admin_id)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            raise AuthenticationError(f"Database error: {e}")
+
     def authenticate(self, username: str, password: str) -> str:
         """Authenticate an admin user and return a session token"""
         admin_user = self._get_admin_user(username)
@@ -29,48 +46,22 @@ class AdminAuthService:
             raise AuthenticationError("Invalid username or password")
 
         admin_id, password_hash = admin_user
-        if password_hash != hashlib.sha256(password.encode()).hexdigest():
+        if not self.password_hasher.verify_password(password, password_hash):
             raise AuthenticationError("Invalid username or password")
 
-        session_token = str(uuid.uuid4())
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "INSERT INTO sessions (id, admin_id, token) VALUES (?, ?, ?)",
-                    (str(uuid.uuid4()), admin_id, session_token)
-                )
-                conn.commit()
-            return session_token
-        except sqlite3.Error as e:
-            raise AuthenticationError(f"Database error: {e}")
+        # Upgrade legacy SHA-256 hashes and outdated cost parameters
+        if self.password_hasher.needs_rehash(password_hash):
+            self._update_password_hash(admin_id, self.password_hasher.hash_password(password))
+
+        return self.session_store.create(admin_id)
 
     def is_authenticated(self, token: str) -> bool:
         """Check if a session token is valid"""
-        if not token:
-            return False
-
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT 1 FROM sessions WHERE token = ?",
-                    (token,)
-                )
-                return cursor.fetchone() is not None
-        except sqlite3.Error as e:
-            return False
+        return self.session_store.validate(token)
 
     def logout(self, token: str):
         """Logout an admin user by deleting their session token"""
         if not token:
             return
 
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "DELETE FROM sessions WHERE token = ?",
-                    (token,)
-                )
-                conn.commit()
-        except sqlite3.Error as e:
-            # Log the error, but don't raise it to the client
-            print(f"Error logging out: {e}")
\ No newline at end of file
+        self.session_store.revoke(token)
@@ -2,50 +2,131 @@
 Service for handling admin-related tasks
 """
 
+import csv
+import io
+import json
 import sqlite3
 import uuid
-from typing import List, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ..repositories.sqlite_player_repository import SQLitePlayerRepository
-from ..core.exceptions import NexusException
+from ..core.exceptions import NexusException, ValidationError
 from ..core.logger import NexusLogger
+from ..core.events import EventBus, Event, AdminEvents
+from .ip_ban_index import IPBanIndex, normalize_ban_entry
+from .player_ban_list import PlayerBanList
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
 
 class AdminService:
     """
     Service for handling admin-related tasks
     """
 
-    def __init__(self, player_repository: SQLitePlayerRepository):
+    # Largest number of players or addresses accepted by one bulk call
+    MAX_BULK_ITEMS = 10000
+
+    def __init__(self, player_repository: SQLitePlayerRepository, ip_ban_index: IPBanIndex = None,
+                 player_ban_list: PlayerBanList = None, event_bus: EventBus = None):
         """Initialize the AdminService"""
         self.player_repository = player_repository
+        self.event_bus = event_bus or EventBus()
         self.logger = NexusLogger.get_logger("admin_service")
+        # Shared with PlayerService so bans apply to the next login check
+        self.ip_ban_index = ip_ban_index if ip_ban_index is not None else IPBanIndex(player_repository.find_banned_ips())
+        # Shared with AuthService so bans end sessions on their next request
+        self.player_ban_list = player_ban_list if player_ban_list is not None else PlayerBanList.from_repository(player_repository)
 
-    def get_all_players(self, search: str = None, sort: str = "name", order: str = "asc") -> List:
-        """Get all players"""
+    def get_all_players(self, search: str = None, sort: str = "name", order: str = "asc", cursor: str = None,
+                        limit: int = 50, fields: List[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of players and the cursor for the next page"""
         try:
-            players = self.player_repository.find_all()
+            return self.player_repository.query_players(search, sort, order, cursor, limit, fields)
+        except NexusException as e:
+            self.logger.error(f"Failed to get all players: {e}")
+            raise
+
+    def export_players(self, export_format: str = "ndjson", fields: List[str] = None,
+                       batch_size: int = 1000) -> Tuple[str, Iterator[str]]:
+        """
+        Export all players as NDJSON or CSV.
 
-            if search:
-                players = [p for p in players if search.lower() in p.name.lower()]
+        Returns the content type and an iterator of text chunks, one per
+        repository batch, so the export never holds more than a batch in
+        memory. Format and fields are validated before anything is read.
+        """
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError(f"Unsupported export format '{export_format}'")
+        fields = fields or list(self.player_repository.PROJECTION_FIELDS)
+        rows = self.player_repository.iter_players(fields, batch_size)
+        encode = self._encode_ndjson if export_format == "ndjson" else self._encode_csv
+        return EXPORT_CONTENT_TYPES[export_format], encode(rows, fields, batch_size)
 
-            if sort:
-                players.sort(key=lambda p: p.to_dict().get(sort, 0), reverse=order == "desc")
+    @staticmethod
+    def _encode_ndjson(rows: Iterator[Dict[str, Any]], fields: List[str], batch_size: int) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, separators=(",", ":")))
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
 
-            return players
+    @staticmethod
+    def _encode_csv(rows: Iterator[Dict[str, Any]], fields: List[str], batch_size: int) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def search_players(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search players by partial name, best matches first"""
+        try:
+            return self.player_repository.search_players(query, limit)
         except NexusException as e:
-            self.logger.error(f"Failed to get all players: {e}")
+            self.logger.error(f"Failed to search players: {e}")
             raise
 
-    def ban_player(self, player_id: str) -> Tuple[bool, str]:
-        """Ban a player"""
+    @staticmethod
+    def _ban_expiry(duration_minutes) -> Optional[datetime]:
+        """When a ban of duration_minutes ends; None (no duration) means permanent"""
+        if duration_minutes is None:
+            return None
+        try:
+            minutes = int(duration_minutes)
+        except (TypeError, ValueError):
+            raise ValidationError("Ban duration must be a whole number of minutes")
+        # 0 must not silently become a permanent ban
+        if isinstance(duration_minutes, bool) or minutes <= 0:
+            raise ValidationError("Ban duration must be positive; omit it for a permanent ban")
+        return datetime.now() + timedelta(minutes=minutes)
+
+    def ban_player(self, player_id: str, reason: str = None, duration_minutes: int = None) -> Tuple[bool, str]:
+        """Ban a player, permanently unless a duration is given"""
+        expires_at = self._ban_expiry(duration_minutes)
         try:
             player = self.player_repository.find_by_id(player_id)
             if not player:
                 return False, "Player not found"
 
-            # Add a 'banned' flag to the player's data
-            player.data["banned"] = True
-            self.player_repository.save(player)
+            self.player_repository.set_ban(player_id, True, reason, expires_at)
+            self.player_ban_list.ban(player_id, expires_at)
 
+            if expires_at:
+                return True, f"Player {player.name} has been banned until {expires_at.isoformat(timespec='minutes')}"
             return True, f"Player {player.name} has been banned"
         except NexusException as e:
             self.logger.error(f"Failed to ban player {player_id}: {e}")
@@ -58,23 +139,67 @@ class AdminService:
             if not player:
                 return False, "Player not found"
 
-            # Remove the 'banned' flag from the player's data
-            if "banned" in player.data:
-                del player.data["banned"]
-                self.player_repository.save(player)
-                return True, f"Player {player.name} has been unbanned"
+            if not player.is_banned():
+                return False, f"Player {player.name} is not banned"
 
-            return False, f"Player {player.name} is not banned"
+            self.player_repository.set_ban(player_id, False)
+            self.player_ban_list.unban(player_id)
+            return True, f"Player {player.name} has been unbanned"
         except NexusException as e:
             self.logger.error(f"Failed to unban player {player_id}: {e}")
             raise
 
-    def get_banned_players(self) -> List:
-        """Get all banned players"""
+    def ban_players(self, player_ids: List[str], reason: str = None, duration_minutes: int = None) -> Dict[str, Any]:
+        """Ban many players in one transaction and report the result for each id"""
+        player_ids = self._bulk_items(player_ids, "player_ids")
+        expires_at = self._ban_expiry(duration_minutes)
+
         try:
-            players = self.player_repository.find_all()
-            banned_players = [p for p in players if p.data.get("banned")]
-            return banned_players
+            found = self.player_repository.set_bans(player_ids, True, reason, expires_at)
+        except NexusException as e:
+            self.logger.error(f"Failed to ban {len(player_ids)} players: {e}")
+            raise
+
+        results = []
+        for player_id in player_ids:
+            if player_id in found:
+                self.player_ban_list.ban(player_id, expires_at)
+                results.append({"id": player_id, "success": True, "message": f"Player {found[player_id][0]} has been banned"})
+            else:
+                results.append({"id": player_id, "success": False, "message": "Player not found"})
+
+        self._publish_bulk(AdminEvents.PLAYERS_BANNED, "player_ids", results, reason=reason,
+                           expires_at=expires_at.isoformat() if expires_at else None)
+        return self._bulk_summary(results)
+
+    def unban_players(self, player_ids: List[str]) -> Dict[str, Any]:
+        """Unban many players in one transaction and report the result for each id"""
+        player_ids = self._bulk_items(player_ids, "player_ids")
+        try:
+            found = self.player_repository.set_bans(player_ids, False)
+        except NexusException as e:
+            self.logger.error(f"Failed to unban {len(player_ids)} players: {e}")
+            raise
+
+        results = []
+        for player_id in player_ids:
+            if player_id not in found:
+                results.append({"id": player_id, "success": False, "message": "Player not found"})
+                continue
+            name, was_banned = found[player_id]
+            self.player_ban_list.unban(player_id)
+            if was_banned:
+                results.append({"id": player_id, "success": True, "message": f"Player {name} has been unbanned"})
+            else:
+                results.append({"id": player_id, "success": False, "message": f"Player {name} is not banned"})
+
+        self._publish_bulk(AdminEvents.PLAYERS_UNBANNED, "player_ids", results)
+        return self._bulk_summary(results)
+
+    def get_banned_players(self) -> List[Dict[str, Any]]:
+        """Get players under an active ban"""
+        try:
+            return self.player_repository.find_banned()
         except NexusException as e:
             self.logger.error(f"Failed to get banned players: {e}")
             raise
@@ -89,34 +214,128 @@ class AdminService:
             self.logger.error(f"Failed to send announcement: {e}")
             raise
 
+    def ban_ips(self, ip_addresses: List[str]) -> Dict[str, Any]:
+        """Ban many addresses or CIDR ranges in one transaction"""
+        entries, results = self._normalize_bulk_ips(ip_addresses)
+        try:
+            added = set(self.player_repository.add_banned_ips(list(entries.values())))
+        except NexusException as e:
+            self.logger.error(f"Failed to ban {len(entries)} IP addresses: {e}")
+            raise
+
+        for ip_address, entry in entries.items():
+            if entry in added:
+                self.ip_ban_index.add(entry)
+                results[ip_address] = {"ip_address": entry, "success": True, "message": f"IP address {entry} has been banned"}
+            else:
+                results[ip_address] = {"ip_address": entry, "success": False, "message": f"IP address {entry} is already banned"}
+
+        results = list(results.values())
+        self._publish_bulk(AdminEvents.IPS_BANNED, "ip_addresses", results, key="ip_address")
+        return self._bulk_summary(results)
+
+    def unban_ips(self, ip_addresses: List[str]) -> Dict[str, Any]:
+        """Unban many addresses or CIDR ranges in one transaction"""
+        entries, results = self._normalize_bulk_ips(ip_addresses)
+        try:
+            removed = set(self.player_repository.remove_banned_ips(
+                {entry: ip_address for ip_address, entry in entries.items()}
+            ))
+        except NexusException as e:
+            self.logger.error(f"Failed to unban {len(entries)} IP addresses: {e}")
+            raise
+
+        for ip_address, entry in entries.items():
+            if entry in removed:
+                self.ip_ban_index.remove(entry)
+                results[ip_address] = {"ip_address": entry, "success": True, "message": f"IP address {entry} has been unbanned"}
+            else:
+                results[ip_address] = {"ip_address": entry, "success": False, "message": f"IP address {entry} is not banned"}
+
+        results = list(results.values())
+        self._publish_bulk(AdminEvents.IPS_UNBANNED, "ip_addresses", results, key="ip_address")
+        return self._bulk_summary(results)
+
+    def _bulk_items(self, items: List[str], name: str) -> List[str]:
+        """Validate a bulk request list and drop duplicates, keeping order"""
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise ValidationError(f"{name} must be a list of strings")
+        if len(items) > self.MAX_BULK_ITEMS:
+            raise ValidationError(f"At most {self.MAX_BULK_ITEMS} {name} per request")
+        return list(dict.fromkeys(items))
+
+    def _normalize_bulk_ips(self, ip_addresses: List[str]):
+        """Map each distinct valid input to its ban entry; invalid inputs get their result now"""
+        entries, results = {}, {}
+        seen = set()
+        for ip_address in self._bulk_items(ip_addresses, "ip_addresses"):
+            entry = normalize_ban_entry(ip_address)
+            if entry is None:
+                results[ip_address] = {"ip_address": ip_address, "success": False,
+                                       "message": f"Invalid IP address or CIDR range: {ip_address}"}
+            elif entry in seen:
+                results[ip_address] = {"ip_address": entry, "success": False,
+                                       "message": f"Duplicate of {entry} in this request"}
+            else:
+                seen.add(entry)
+                entries[ip_address] = entry
+                # Reserve the slot so results keep the request order
+                results[ip_address] = None
+        return entries, results
+
+    def _publish_bulk(self, event_type: str, field: str, results: List[Dict[str, Any]], key: str = "id", **data):
+        """Publish one event covering every successful item"""
+        succeeded = [result[key] for result in results if result["success"]]
+        if succeeded:
+            self.event_bus.publish(Event(
+                event_type,
+                {field: succeeded, "count": len(succeeded), **data},
+                source="admin_service"
+            ))
+
+    @staticmethod
+    def _bulk_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        succeeded = sum(1 for result in results if result["success"])
+        return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
     def ban_ip(self, ip_address: str) -> Tuple[bool, str]:
-        """Ban an IP address"""
+        """Ban an IP address or CIDR range"""
+        entry = normalize_ban_entry(ip_address)
+        if entry is None:
+            return False, f"Invalid IP address or CIDR range: {ip_address}"
+
         try:
             with sqlite3.connect(self.player_repository.db_path) as conn:
                 conn.execute(
                     "INSERT INTO banned_ips (id, ip_address) VALUES (?, ?)",
-                    (str(uuid.uuid4()), ip_address)
+                    (str(uuid.uuid4()), entry)
                 )
                 conn.commit()
-            return True, f"IP address {ip_address} has been banned"
+            self.ip_ban_index.add(entry)
+            return True, f"IP address {entry} has been banned"
         except sqlite3.IntegrityError:
-            return False, f"IP address {ip_address} is already banned"
+            return False, f"IP address {entry} is already banned"
         except sqlite3.Error as e:
             self.logger.error(f"Failed to ban IP address {ip_address}: {e}")
             raise
 
     def unban_ip(self, ip_address: str) -> Tuple[bool, str]:
-        """Unban an IP address"""
+        """Unban an IP address or CIDR range"""
+        entry = normalize_ban_entry(ip_address)
+        if entry is None:
+            return False, f"Invalid IP address or CIDR range: {ip_address}"
+
         try:
             with sqlite3.connect(self.player_repository.db_path) as conn:
                 cursor = conn.execute(
-                    "DELETE FROM banned_ips WHERE ip_address = ?",
-                    (ip_address,)
+                    "DELETE FROM banned_ips WHERE ip_address IN (?, ?)",
+                    (entry, ip_address)
                 )
                 conn.commit()
-                if cursor.rowcount > 0:
-                    return True, f"IP address {ip_address} has been unbanned"
-                return False, f"IP address {ip_address} is not banned"
+            self.ip_ban_index.remove(entry)
+            if cursor.rowcount > 0:
+                return True, f"IP address {entry} has been unbanned"
+            return False, f"IP address {entry} is not banned"
         except sqlite3.Error as e:
             self.logger.error(f"Failed to unban IP address {ip_address}: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,169 @@
+"""
+Economy analytics over every player's stats, vectorized with NumPy
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+from ..core.exceptions import ConfigurationError, ValidationError
+from ..core.logger import NexusLogger
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional dependency: only the analytics endpoints need it
+    np = None
+
+HARDWARE_COMPONENTS = ("cpu", "ram", "nic", "ssd")
+# Cost of the tier after tier 1; each further tier doubles it (see VirtualComputer)
+UPGRADE_BASE_COSTS = {"cpu": 50, "ram": 50, "nic": 75, "ssd": 25}
+MAX_TIER = 10
+
+CREDIT_PERCENTILES = (10, 25, 50, 75, 90, 99, 99.9)
+# Largest what-if multiplier; scaled balances must stay well inside int64
+MAX_CREDIT_MULTIPLIER = 1000.0
+
+class PlayerStatsSnapshot:
+    """Column arrays of every player's numeric stats, loaded in one pass"""
+
+    def __init__(self, columns: Dict[str, Any], loaded_at: float, load_seconds: float):
+        self.columns = columns
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+
+    def __len__(self):
+        return len(self.columns["level"])
+
+    def __getitem__(self, column: str):
+        return self.columns[column]
+
+class AnalyticsService:
+    """
+    Level, credit and hardware distributions across all players.
+
+    Stats are streamed from the repository in batches straight into NumPy
+    arrays, without building Player objects. A snapshot is reused for
+    max_age_seconds, so repeated reports cost only the array math. Credit
+    multiplier what-ifs assume every balance was earned at the current
+    multiplier and scale it by the ratio.
+    """
+
+    def __init__(self, player_repository, game_config, max_age_seconds: float = 300.0, batch_size: int = 50000):
+        self.player_repository = player_repository
+        self.game_config = game_config
+        self.max_age_seconds = max_age_seconds
+        self.batch_size = batch_size
+        self.logger = NexusLogger.get_logger("analytics_service")
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def load(self) -> PlayerStatsSnapshot:
+        """Read every player's stats into a new snapshot"""
+        if np is None:
+            raise ConfigurationError("Player analytics require NumPy: pip install numpy")
+        started = time.perf_counter()
+        names = list(self.player_repository.STAT_COLUMNS)
+        batches = [
+            np.array(rows, dtype=np.int64).reshape(-1, len(names))
+            for rows in self.player_repository.iter_stat_batches(self.batch_size)
+        ]
+        table = np.concatenate(batches) if batches else np.empty((0, len(names)), dtype=np.int64)
+        # Columns are contiguous copies so the table can be freed
+        columns = {name: np.ascontiguousarray(table[:, i]) for i, name in enumerate(names)}
+        load_seconds = time.perf_counter() - started
+        self.logger.info(f"Loaded stats of {len(table)} players in {load_seconds:.2f}s")
+        return PlayerStatsSnapshot(columns, time.time(), load_seconds)
+
+    def snapshot(self, refresh: bool = False) -> PlayerStatsSnapshot:
+        """The cached snapshot, reloaded if older than max_age_seconds"""
+        with self._lock:
+            snapshot = self._snapshot
+            if refresh or snapshot is None or time.time() - snapshot.loaded_at >= self.max_age_seconds:
+                snapshot = self._snapshot = self.load()
+            return snapshot
+
+    @staticmethod
+    def level_histogram(snapshot: PlayerStatsSnapshot) -> List[Dict[str, int]]:
+        """Players per level, for every level from 1 to the highest"""
+        counts = np.bincount(snapshot["level"])
+        return [{"level": level, "players": int(counts[level])} for level in range(1, len(counts))]
+
+    @staticmethod
+    def credit_distribution(credits, percentiles: Sequence[float] = CREDIT_PERCENTILES) -> Dict[str, Any]:
+        """Percentiles, total supply and Gini coefficient of credit balances"""
+        if len(credits) == 0:
+            return {"total": 0, "mean": 0.0, "percentiles": {}, "gini": 0.0}
+        values = np.sort(credits.astype(np.float64))
+        total = values.sum()
+        # Gini from the sorted balances: 1 - 2 * area under the Lorenz curve
+        n = len(values)
+        gini = 0.0
+        if total > 0:
+            lorenz = np.cumsum(values) / total
+            gini = float(1 - (2 * lorenz.sum() - 1) / n)
+        return {
+            "total": int(total),
+            "mean": round(float(values.mean()), 2),
+            "percentiles": {
+                f"p{p:g}": round(float(value), 2) for p, value in zip(percentiles, np.percentile(values, percentiles))
+            },
+            "gini": round(gini, 4),
+        }
+
+    @staticmethod
+    def hardware_mix(snapshot: PlayerStatsSnapshot) -> Dict[str, Dict[str, int]]:
+        """Players at each tier, per component"""
+        mix = {}
+        for component in HARDWARE_COMPONENTS:
+            counts = np.bincount(snapshot[f"{component}_tier"], minlength=MAX_TIER + 1)
+            mix[component] = {str(tier): int(counts[tier]) for tier in range(1, len(counts)) if counts[tier]}
+        return mix
+
+    @staticmethod
+    def upgrade_affordability(snapshot: PlayerStatsSnapshot, credits) -> Dict[str, float]:
+        """Share of players who could pay for their next tier of each component"""
+        if len(snapshot) == 0:
+            return {component: 0.0 for component in HARDWARE_COMPONENTS}
+        shares = {}
+        for component in HARDWARE_COMPONENTS:
+            tiers = snapshot[f"{component}_tier"]
+            cost = UPGRADE_BASE_COSTS[component] * np.left_shift(1, np.clip(tiers - 1, 0, 62))
+            affordable = (tiers < MAX_TIER) & (credits >= cost)
+            shares[component] = round(float(affordable.mean()), 4)
+        return shares
+
+    def simulate_credit_multiplier(self, snapshot: PlayerStatsSnapshot, multiplier: float) -> Dict[str, Any]:
+        """Credit distribution and upgrade affordability had credits been earned at multiplier"""
+        if not math.isfinite(multiplier) or not 0 < multiplier <= MAX_CREDIT_MULTIPLIER:
+            raise ValidationError(f"Credit multiplier must be above 0 and at most {MAX_CREDIT_MULTIPLIER:g}")
+        current = self.game_config.credit_multiplier or 1.0
+        credits = np.floor(snapshot["credits"] * (multiplier / current)).astype(np.int64)
+        return {
+            "credit_multiplier": multiplier,
+            "credits": self.credit_distribution(credits),
+            "upgrade_affordability": self.upgrade_affordability(snapshot, credits),
+        }
+
+    def get_report(self, multipliers: Sequence[float] = (), refresh: bool = False) -> Dict[str, Any]:
+        """Distributions across all players, plus a what-if per credit multiplier"""
+        snapshot = self.snapshot(refresh)
+        credits = snapshot["credits"]
+        vip = snapshot["is_vip"].astype(bool)
+        return {
+            "players": len(snapshot),
+            "loaded_at": snapshot.loaded_at,
+            "load_seconds": round(snapshot.load_seconds, 3),
+            "level_histogram": self.level_histogram(snapshot),
+            "credits": self.credit_distribution(credits),
+            "credits_vip": self.credit_distribution(credits[vip]),
+            "credits_free": self.credit_distribution(credits[~vip]),
+            "hardware_mix": self.hardware_mix(snapshot),
+            "upgrade_affordability": self.upgrade_affordability(snapshot, credits),
+            "current_credit_multiplier": self.game_config.credit_multiplier,
+            "what_if": [self.simulate_credit_multiplier(snapshot, multiplier) for multiplier in multipliers],
+        }
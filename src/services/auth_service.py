@@ -1,22 +1,21 @@
-import sqlite3
-import hashlib
-import uuid
+import secrets
+from typing import Any, Dict
 from ..core.exceptions import AuthenticationError, ValidationError
 from ..repositories.sqlite_player_repository import SQLitePlayerRepository
+from .token_service import TokenService
+from .password_hasher import PasswordHasher
+from .player_ban_list import PlayerBanList
 
 class AuthService:
     """Service for handling user authentication"""
 
-    def __init__(self, db_path: str, player_repository: SQLitePlayerRepository):
+    def __init__(self, db_path: str, player_repository: SQLitePlayerRepository, token_service: TokenService = None,
+                 password_hasher: PasswordHasher = None, player_ban_list: PlayerBanList = None):
         self.db_path = db_path
         self.player_repository = player_repository
-
-    def _get_player_by_username(self, username: str):
-        """Get a player by username from the database"""
-        player = self.player_repository.find_by_name(username)
-        if player:
-            return player.id, player.password_hash
-        return None
+        self.token_service = token_service or TokenService({"k1": secrets.token_urlsafe(32)}, "k1")
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.player_ban_list = player_ban_list if player_ban_list is not None else PlayerBanList.from_repository(player_repository)
 
     def register(self, username: str, password: str) -> str:
         """Register a new player"""
@@ -31,7 +30,7 @@ class AuthService:
             raise ValidationError("Username is already taken")
 
         # Hash the password
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        password_hash = self.password_hasher.hash_password(password)
 
         # Create a new player
         from ..models.player import Player
@@ -42,22 +41,36 @@ class AuthService:
 
     def login(self, username: str, password: str) -> str:
         """Authenticate a player and return a session token"""
-        player_data = self._get_player_by_username(username)
-        if not player_data:
+        player = self.player_repository.find_by_name(username)
+        if not player:
             raise AuthenticationError("Invalid username or password")
 
-        player_id, password_hash = player_data
-        if not password_hash or password_hash != hashlib.sha256(password.encode()).hexdigest():
+        password_hash = player.password_hash
+        if not password_hash or not self.password_hasher.verify_password(password, password_hash):
             raise AuthenticationError("Invalid username or password")
 
-        session_token = str(uuid.uuid4())
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "INSERT INTO sessions (id, player_id, token) VALUES (?, ?, ?)",
-                    (str(uuid.uuid4()), player_id, session_token)
-                )
-                conn.commit()
-            return session_token
-        except sqlite3.Error as e:
-            raise AuthenticationError(f"Database error: {e}")
\ No newline at end of file
+        if player.is_banned():
+            raise AuthenticationError(self._ban_message(player.ban_reason))
+
+        # Upgrade legacy SHA-256 hashes and outdated cost parameters
+        if self.password_hasher.needs_rehash(password_hash):
+            # Only the hash is written, so requests saving this player meanwhile keep their changes
+            self.player_repository.set_password_hash(player.id, self.password_hasher.hash_password(password))
+
+        return self.token_service.issue(player.id, player.name, vip=player.is_vip)
+
+    def verify_token(self, token: str) -> Dict[str, Any]:
+        """Verify a session token and return its claims"""
+        claims = self.token_service.verify(token)
+        # Tokens issued before a ban stay valid, so check the ban list on every request
+        if self.player_ban_list.is_banned(claims["pid"]):
+            raise AuthenticationError(self._ban_message())
+        return claims
+
+    @staticmethod
+    def _ban_message(reason: str = None) -> str:
+        return f"Account is banned: {reason}" if reason else "Account is banned"
+
+    def logout(self, token: str):
+        """Revoke a session token"""
+        self.token_service.revoke(token)
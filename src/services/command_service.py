@@ -10,6 +10,19 @@ from ..models.player import Player
 from ..core.events import EventBus, Event, GameEvents
 from ..core.exceptions import CommandNotFoundError, InsufficientResourcesError, ScriptExecutionError, CommandError
 from ..core.logger import NexusLogger
+from ..core.metrics import REGISTRY
+from ..core.tracing import traced, current_span
+
+COMMAND_SECONDS = REGISTRY.histogram(
+    "nexus_command_duration_seconds",
+    "Command execution latency by command name",
+    ("command",)
+)
+COMMANDS_TOTAL = REGISTRY.counter(
+    "nexus_commands_total",
+    "Commands executed by command name and outcome",
+    ("command", "status")
+)
 
 class CommandResult:
     """Result of command execution"""
@@ -252,6 +265,7 @@ class CommandService:
         
         return available
     
+    @traced("CommandService.execute_command")
     def execute_command(self, player: Player, command_line: str) -> CommandResult:
         """Execute a command"""
         start_time = time.time()
@@ -262,6 +276,7 @@ class CommandService:
             return CommandResult(False, error="No command specified")
         
         command_name = parts[0]
+        current_span().set_attribute("command", command_name)
         args = parts[1:] if len(parts) > 1 else []
         
         try:
@@ -277,6 +292,7 @@ class CommandService:
             # Check permissions
             can_execute, reason = command.can_execute(player)
             if not can_execute:
+                self._record_command(command_name, "denied", time.time() - start_time)
                 return CommandResult(False, error=reason)
             
             # Charge resources if needed
@@ -291,6 +307,7 @@ class CommandService:
             # Calculate execution time
             end_time = time.time()
             result.execution_time_ms = (end_time - start_time) * 1000
+            self._record_command(command_name, "success" if result.success else "failed", end_time - start_time)
             
             # Update player stats
             player.stats.total_commands_executed += 1
@@ -320,6 +337,7 @@ class CommandService:
             
             error_result = CommandResult(False, error=str(e))
             error_result.execution_time_ms = execution_time_ms
+            self._record_command(command_name, "error", end_time - start_time)
             
             # Log error
             self.logger.error(f"Command execution error: {player.name} -> {command_line} -> {str(e)}")
@@ -341,6 +359,12 @@ class CommandService:
             
             return error_result
     
+    def _record_command(self, command_name: str, status: str, seconds: float):
+        """Record command latency; unknown names share one label to bound cardinality"""
+        label = command_name if command_name in self.commands else "unknown"
+        COMMAND_SECONDS.observe(seconds, label)
+        COMMANDS_TOTAL.inc(1, label, status)
+    
     def get_command_help(self, command_name: str = None) -> str:
         """Get help for commands"""
         if command_name:
@@ -0,0 +1,134 @@
+import ipaddress
+import threading
+from typing import Iterable, Optional, Union
+
+# Trie node layout: [zero child, one child, range ends here]
+_ZERO, _ONE, _TERMINAL = 0, 1, 2
+
+def _new_node():
+    return [None, None, False]
+
+def normalize_ban_entry(entry: str) -> Optional[str]:
+    """Canonical form of an address or CIDR range, or None if invalid"""
+    try:
+        network = ipaddress.ip_network(entry.strip(), strict=False)
+    except (ValueError, AttributeError):
+        return None
+    network = _unmap_network(network)
+    if network.prefixlen == network.max_prefixlen:
+        return str(network.network_address)
+    return str(network)
+
+def _unmap_network(network):
+    mapped = getattr(network.network_address, "ipv4_mapped", None)
+    if mapped is not None and network.prefixlen >= 96:
+        return ipaddress.ip_network(f"{mapped}/{network.prefixlen - 96}")
+    return network
+
+def _unmap_address(address):
+    mapped = getattr(address, "ipv4_mapped", None)
+    return mapped if mapped is not None else address
+
+class IPBanIndex:
+    """
+    In-memory index of banned addresses and CIDR ranges.
+
+    Exact addresses live in a set; ranges live in one binary trie per
+    address family, so a lookup walks at most 32 or 128 bits with no I/O.
+    IPv4-mapped IPv6 addresses are matched as IPv4. Lookups take no lock:
+    mutations only link or unlink whole nodes.
+    """
+
+    def __init__(self, entries: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._exact = set()
+        self._ranges = set()
+        self._tries = {4: _new_node(), 6: _new_node()}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: str) -> bool:
+        """Add an address or CIDR range; returns False if it is invalid"""
+        normalized = normalize_ban_entry(entry)
+        if normalized is None:
+            return False
+
+        network = ipaddress.ip_network(normalized)
+        with self._lock:
+            if network.prefixlen == network.max_prefixlen:
+                self._exact.add(normalized)
+                return True
+
+            node = self._tries[network.version]
+            for bit in self._bits(int(network.network_address), network.max_prefixlen, network.prefixlen):
+                if node[bit] is None:
+                    node[bit] = _new_node()
+                node = node[bit]
+            node[_TERMINAL] = True
+            self._ranges.add(normalized)
+        return True
+
+    def remove(self, entry: str) -> bool:
+        """Remove an address or CIDR range; returns False if it was not present"""
+        normalized = normalize_ban_entry(entry)
+        if normalized is None:
+            return False
+
+        network = ipaddress.ip_network(normalized)
+        with self._lock:
+            if network.prefixlen == network.max_prefixlen:
+                if normalized not in self._exact:
+                    return False
+                self._exact.discard(normalized)
+                return True
+
+            if normalized not in self._ranges:
+                return False
+            self._ranges.discard(normalized)
+
+            path = [self._tries[network.version]]
+            bits = list(self._bits(int(network.network_address), network.max_prefixlen, network.prefixlen))
+            for bit in bits:
+                path.append(path[-1][bit])
+            path[-1][_TERMINAL] = False
+
+            # Prune nodes that no longer lead to a range
+            for depth in range(len(bits), 0, -1):
+                node = path[depth]
+                if node[_TERMINAL] or node[_ZERO] is not None or node[_ONE] is not None:
+                    break
+                path[depth - 1][bits[depth - 1]] = None
+        return True
+
+    def contains(self, ip_address: Union[str, None]) -> bool:
+        """Whether an address is banned exactly or by a range"""
+        if not ip_address:
+            return False
+        try:
+            address = _unmap_address(ipaddress.ip_address(ip_address.strip()))
+        except ValueError:
+            return False
+
+        if str(address) in self._exact:
+            return True
+
+        node = self._tries[address.version]
+        if node[_TERMINAL]:
+            return True
+        for bit in self._bits(int(address), address.max_prefixlen, address.max_prefixlen):
+            node = node[bit]
+            if node is None:
+                return False
+            if node[_TERMINAL]:
+                return True
+        return False
+
+    __contains__ = contains
+
+    def __len__(self):
+        return len(self._exact) + len(self._ranges)
+
+    @staticmethod
+    def _bits(value: int, width: int, count: int):
+        for shift in range(width - 1, width - 1 - count, -1):
+            yield (value >> shift) & 1
@@ -172,7 +172,7 @@ class MissionService:
         
         # Publish event
         self.event_bus.publish(Event(
-            "game.mission_started",
+            GameEvents.MISSION_STARTED,
             {
                 "player_id": player.id,
                 "player_name": player.name,
@@ -260,6 +260,17 @@ class MissionService:
         
         self.repository.save(mission)
         
+        self.event_bus.publish(Event(
+            GameEvents.MISSION_ABANDONED,
+            {
+                "player_id": player.id,
+                "player_name": player.name,
+                "mission_id": mission_id,
+                "mission_name": mission.name
+            },
+            source="mission_service"
+        ))
+        
         self.logger.info(f"Player {player.name} abandoned mission: {mission_id}")
         return True, f"Mission '{mission.name}' abandoned"
     
@@ -0,0 +1,112 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+from ..core.logger import NexusLogger
+
+SCRYPT = "scrypt"
+PBKDF2 = "pbkdf2_sha256"
+
+_LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+class PasswordHasher:
+    """
+    Salted password hashing with scrypt or PBKDF2-SHA256.
+
+    Hashes are stored as `scrypt$n$r$p$salt$hash` or
+    `pbkdf2_sha256$iterations$salt$hash`, so cost parameters can be raised
+    later and old hashes still verify. Bare hex SHA-256 hashes from before
+    this are accepted and reported by needs_rehash.
+
+    hash_password and verify_password run on the calling request thread,
+    at most `workers` at a time; further logins wait for a slot. Both KDFs
+    release the GIL, so the limit caps how many cores (and, for scrypt,
+    how much memory) a burst of logins can take from command traffic
+    without a pool of threads to start or shut down.
+    """
+
+    def __init__(self, algorithm: str = SCRYPT, scrypt_n: int = 2 ** 14, scrypt_r: int = 8, scrypt_p: int = 1,
+                 pbkdf2_iterations: int = 600000, workers: int = 2):
+        if algorithm not in (SCRYPT, PBKDF2):
+            raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.scrypt_n = scrypt_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.pbkdf2_iterations = pbkdf2_iterations
+        self.workers = workers
+        self.logger = NexusLogger.get_logger("password_hasher")
+        self._slots = threading.BoundedSemaphore(workers)
+
+    @classmethod
+    def from_config(cls, security_config) -> "PasswordHasher":
+        """Create a password hasher from a SecurityConfig"""
+        return cls(
+            security_config.password_hash_algorithm,
+            security_config.scrypt_n,
+            security_config.scrypt_r,
+            security_config.scrypt_p,
+            security_config.pbkdf2_iterations,
+            security_config.password_hash_workers,
+        )
+
+    def hash_password(self, password: str) -> str:
+        """Hash a password once a hashing slot is free"""
+        with self._slots:
+            return self.hash(password)
+
+    def verify_password(self, password: str, encoded: str) -> bool:
+        """Verify a password once a hashing slot is free"""
+        with self._slots:
+            return self.verify(password, encoded)
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the calling thread"""
+        salt = os.urandom(16)
+        if self.algorithm == SCRYPT:
+            digest = self._scrypt(password, salt, self.scrypt_n, self.scrypt_r, self.scrypt_p)
+            return f"{SCRYPT}${self.scrypt_n}${self.scrypt_r}${self.scrypt_p}${_b64encode(salt)}${_b64encode(digest)}"
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.pbkdf2_iterations)
+        return f"{PBKDF2}${self.pbkdf2_iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Verify a password on the calling thread"""
+        if not encoded:
+            return False
+
+        if _LEGACY_SHA256.match(encoded):
+            expected = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(expected, encoded)
+
+        try:
+            algorithm, *fields = encoded.split("$")
+            if algorithm == SCRYPT:
+                n, r, p, salt, digest = fields
+                actual = self._scrypt(password, _b64decode(salt), int(n), int(r), int(p))
+            elif algorithm == PBKDF2:
+                iterations, salt, digest = fields
+                actual = hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations))
+            else:
+                return False
+            return hmac.compare_digest(actual, _b64decode(digest))
+        except ValueError:
+            self.logger.warning("Malformed password hash")
+            return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether a stored hash uses a legacy format or older cost parameters"""
+        if self.algorithm == SCRYPT:
+            return not encoded.startswith(f"{SCRYPT}${self.scrypt_n}${self.scrypt_r}${self.scrypt_p}$")
+        return not encoded.startswith(f"{PBKDF2}${self.pbkdf2_iterations}$")
+
+    def _scrypt(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        # OpenSSL's default 32 MiB limit is too small for n=2**15, r=8
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32)
@@ -0,0 +1,51 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+class PlayerBanList:
+    """
+    In-memory set of banned player ids with optional expiry times.
+
+    Loaded from the repository's partial index on banned rows at startup and
+    updated by AdminService, so checking a session token against it is a
+    dictionary lookup rather than a database query. Expired bans are dropped
+    the first time they are looked up.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Optional[datetime]]] = ()):
+        self._bans: Dict[str, Optional[datetime]] = dict(entries)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_repository(cls, player_repository) -> "PlayerBanList":
+        """Load active bans from the player repository"""
+        return cls(
+            (row["id"], datetime.fromisoformat(row["ban_expires_at"]) if row["ban_expires_at"] else None)
+            for row in player_repository.find_banned()
+        )
+
+    def ban(self, player_id: str, expires_at: datetime = None):
+        """Record a ban, replacing any previous expiry"""
+        with self._lock:
+            self._bans[player_id] = expires_at
+
+    def unban(self, player_id: str) -> bool:
+        """Lift a ban; False if the player was not banned"""
+        with self._lock:
+            return self._bans.pop(player_id, False) is not False
+
+    def is_banned(self, player_id: str, now: datetime = None) -> bool:
+        """Check if a player is under an active ban"""
+        if player_id not in self._bans:
+            return False
+        with self._lock:
+            if player_id not in self._bans:
+                return False
+            expires_at = self._bans[player_id]
+            if expires_at is not None and expires_at <= (now or datetime.now()):
+                del self._bans[player_id]
+                return False
+            return True
+
+    def __len__(self):
+        return len(self._bans)
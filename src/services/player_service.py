@@ -2,20 +2,33 @@
 Player service layer
 """
 
-import sqlite3
 from typing import Optional, List, Dict, Any
 from ..models.player import Player
 from ..core.events import EventBus, Event, PlayerEvents
 from ..core.exceptions import ValidationError, InsufficientCreditsError, AuthenticationError
 from ..core.logger import NexusLogger
+from ..core.tracing import traced
+from .ip_ban_index import IPBanIndex
+from .player_ban_list import PlayerBanList
 
 class PlayerService:
     """Service for managing player operations"""
     
-    def __init__(self, player_repository, event_bus: EventBus = None):
+    def __init__(self, player_repository, event_bus: EventBus = None, ip_ban_index: IPBanIndex = None,
+                 player_ban_list: PlayerBanList = None):
         self.repository = player_repository
         self.event_bus = event_bus or EventBus()
         self.logger = NexusLogger.get_logger("player_service")
+        self.ip_ban_index = ip_ban_index if ip_ban_index is not None else self._load_ip_ban_index()
+        self.player_ban_list = player_ban_list if player_ban_list is not None else PlayerBanList.from_repository(player_repository)
+    
+    def _load_ip_ban_index(self) -> IPBanIndex:
+        """Build the banned-IP index from the banned_ips table"""
+        index = IPBanIndex()
+        for entry in self.repository.find_banned_ips():
+            if not index.add(entry):
+                self.logger.warning(f"Skipped invalid banned IP entry: {entry}")
+        return index
     
     def create_player(self, name: str, is_vip: bool = False, session_id: str = None) -> Player:
         """Create a new player"""
@@ -80,20 +93,8 @@ class PlayerService:
         return player
 
     def is_ip_banned(self, ip_address: str) -> bool:
-        """Check if an IP address is banned"""
-        if not ip_address:
-            return False
-
-        try:
-            with sqlite3.connect(self.repository.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT 1 FROM banned_ips WHERE ip_address = ?",
-                    (ip_address,)
-                )
-                return cursor.fetchone() is not None
-        except sqlite3.Error as e:
-            self.logger.error(f"Failed to check if IP address {ip_address} is banned: {e}")
-            return False
+        """Check if an IP address is banned, exactly or by a CIDR range"""
+        return self.ip_ban_index.contains(ip_address)
 
     def lock_cpu(self, player, duration_seconds: int):
         """Lock a player's CPU for a specified duration"""
@@ -180,6 +181,7 @@ class PlayerService:
         
         return success
     
+    @traced("PlayerService.check_passive_mining")
     def check_passive_mining(self, player: Player) -> Optional[int]:
         """Check and collect passive mining rewards"""
         credits = player.virtual_computer.check_passive_mining()
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+from ..core.config import GameConfig
+from ..core.exceptions import ConfigurationError
+
+AUTH = "auth"
+COMMAND = "command"
+ADMIN = "admin"
+READ = "read"
+ROUTE_CLASSES = (AUTH, COMMAND, ADMIN, READ)
+
+AUTH_PATHS = {"/api/login", "/api/register", "/admin/api/login"}
+
+def classify_route(path: str) -> str:
+    """Route class used to pick a rate limit"""
+    path = path.split("?", 1)[0]
+    if path in AUTH_PATHS:
+        return AUTH
+    if path.startswith(("/api/command/", "/api/script/")):
+        return COMMAND
+    if path.startswith("/admin/api/"):
+        return ADMIN
+    return READ
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by client (IP or player) and route class.
+
+    Each bucket is a two-item list [tokens, last_update] refilled lazily
+    when it is next checked, so there are no per-bucket timers. Buckets are
+    kept in least-recently-updated order and the table never holds more
+    than max_buckets. A new bucket at capacity evicts the oldest bucket,
+    plus any buckets after it that have refilled completely and so are
+    indistinguishable from new ones. This is O(1) amortized however full
+    the table is. Route classes without limits of their own use the read
+    limits, which are required.
+    """
+
+    def __init__(self, free_limits: Dict[str, Sequence[float]], vip_limits: Dict[str, Sequence[float]] = None,
+                 ip_multiplier: float = 1.0, max_buckets: int = 100000):
+        self.free_limits = self._resolve_limits(free_limits)
+        self.vip_limits = self._resolve_limits(vip_limits or free_limits)
+        self.ip_multiplier = ip_multiplier
+        self.max_buckets = max_buckets
+        # A bucket idle for longer than the slowest full refill is back at its burst size
+        self._full_refill_seconds = max(
+            (burst / rate for rate, burst in list(self.free_limits.values()) + list(self.vip_limits.values()) if rate > 0),
+            default=0.0
+        )
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve_limits(limits: Dict[str, Sequence[float]]) -> Dict[str, tuple]:
+        """(rate, burst) for every route class, resolved once so requests need no fallback"""
+        if READ not in limits:
+            raise ConfigurationError(f"Rate limits must include '{READ}'")
+        unknown = set(limits) - set(ROUTE_CLASSES)
+        if unknown:
+            raise ConfigurationError(f"Unknown rate limit route classes: {', '.join(sorted(unknown))}")
+        rate, burst = limits[READ]
+        resolved = {route: (float(rate), float(burst)) for route in ROUTE_CLASSES}
+        resolved.update({route: (float(rate), float(burst)) for route, (rate, burst) in limits.items()})
+        return resolved
+
+    @classmethod
+    def from_config(cls, game_config) -> Optional["RateLimiter"]:
+        """Create a rate limiter from a GameConfig, or None when disabled"""
+        if not game_config.rate_limiting_enabled:
+            return None
+        # Route classes the config leaves out keep their default limits
+        defaults = GameConfig()
+        return cls(
+            {**defaults.rate_limits_free, **game_config.rate_limits_free},
+            {**defaults.rate_limits_vip, **game_config.rate_limits_vip},
+            game_config.rate_limit_ip_multiplier
+        )
+
+    def check_request(self, route_class: str, ip_address: str, player_id: str = None, is_vip: bool = False) -> float:
+        """Charge one request to the IP and player buckets; returns seconds to wait, 0 if allowed"""
+        now = time.monotonic()
+        rate, burst = self.free_limits[route_class]
+        # Several players may share an address, so IP buckets get a larger allowance
+        retry_after = self._take(("ip", ip_address, route_class), rate * self.ip_multiplier, burst * self.ip_multiplier, now)
+        if retry_after or player_id is None:
+            return retry_after
+
+        limits = self.vip_limits if is_vip else self.free_limits
+        rate, burst = limits[route_class]
+        return self._take(("player", player_id, route_class), rate, burst, now)
+
+    def _take(self, key, rate: float, burst: float, now: float) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._evict(now)
+                bucket = self._buckets[key] = [burst, now]
+            else:
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / rate if rate > 0 else float("inf")
+
+    def _evict(self, now: float):
+        # The oldest bucket always goes, refilled or not, to keep the hard cap
+        buckets = self._buckets
+        buckets.popitem(last=False)
+        # Also drop the refilled ones behind it; each bucket is removed at most once
+        while buckets:
+            _, updated = next(iter(buckets.values()))
+            if now - updated < self._full_refill_seconds:
+                break
+            buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
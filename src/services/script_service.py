@@ -0,0 +1,93 @@
+"""
+NexusScript execution service
+"""
+
+from ..models.player import Player
+from ..nexus_script.executor import DEFAULT_MODULE, ScriptExecutor, ScriptResult
+from ..vc_state import VC_State
+from ..core.events import EventBus, Event, GameEvents
+from ..core.exceptions import ValidationError
+from ..core.logger import NexusLogger
+
+# Module names label profiler entries, so clients cannot make them unbounded
+MAX_MODULE_LENGTH = 64
+
+# VC_State tier attribute -> VirtualComputer component
+HARDWARE_TIERS = {
+    "cpu_tier": "cpu",
+    "ram_tier": "ram",
+    "nic_tier": "network_card",
+    "ssd_tier": "storage",
+}
+
+class ScriptPlayer:
+    """
+    The view of a Player that NexusScript programs run against.
+
+    The evaluator reads and writes a VC_State, so the player's level,
+    credits, settings, hardware tiers and mining state are copied into one
+    and copied back with apply_to once the script has finished.
+    """
+
+    def __init__(self, player: Player):
+        self.name = player.name
+        self.is_vip = player.is_vip
+
+        computer = player.virtual_computer
+        vc_state = VC_State()
+        vc_state.level = player.stats.level
+        vc_state.experience = player.stats.experience
+        vc_state.credits = player.stats.credits
+        vc_state.theme = player.settings.get("theme", vc_state.theme)
+        vc_state.prompt_format = player.settings.get("prompt_format", vc_state.prompt_format)
+        vc_state.passive_mining_end_time = computer.passive_mining_end_time
+        for attribute, component in HARDWARE_TIERS.items():
+            setattr(vc_state, attribute, getattr(computer, component).tier)
+        self.vc_state = vc_state
+
+    def apply_to(self, player: Player):
+        """Copy the script's changes back into the player"""
+        vc_state = self.vc_state
+        computer = player.virtual_computer
+        player.stats.credits = vc_state.credits
+        player.settings["theme"] = vc_state.theme
+        player.settings["prompt_format"] = vc_state.prompt_format
+        computer.passive_mining_end_time = vc_state.passive_mining_end_time
+        for attribute, component in HARDWARE_TIERS.items():
+            getattr(computer, component).tier = getattr(vc_state, attribute)
+
+class ScriptService:
+    """Runs NexusScript programs for players through the ScriptExecutor"""
+
+    def __init__(self, script_executor: ScriptExecutor, event_bus: EventBus, max_source_length: int = 10000):
+        self.script_executor = script_executor
+        self.event_bus = event_bus
+        self.max_source_length = max_source_length
+        self.logger = NexusLogger.get_logger("script_service")
+
+    def execute_script(self, player: Player, source: str, module: str = DEFAULT_MODULE) -> ScriptResult:
+        """Run source for a player and apply its changes to the player"""
+        if not isinstance(source, str) or not source.strip():
+            raise ValidationError("Missing script source")
+        if len(source) > self.max_source_length:
+            raise ValidationError(f"Script too long (max {self.max_source_length} characters)")
+        if module is not None and (not isinstance(module, str) or len(module) > MAX_MODULE_LENGTH):
+            raise ValidationError(f"Module name must be a string of at most {MAX_MODULE_LENGTH} characters")
+
+        script_player = ScriptPlayer(player)
+        # execute() returns once the changes are merged into script_player
+        result = self.script_executor.execute(script_player, source, module or DEFAULT_MODULE)
+        script_player.apply_to(player)
+        player.stats.total_scripts_executed += 1
+
+        self.event_bus.publish(Event(
+            GameEvents.SCRIPT_EXECUTED,
+            {
+                "player_id": player.id,
+                "player_name": player.name,
+                "module": module or DEFAULT_MODULE
+            },
+            source="script_service"
+        ))
+        self.logger.info(f"Script executed: {player.name} -> {module or DEFAULT_MODULE}")
+        return result
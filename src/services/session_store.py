@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+import time
+import uuid
+from ..core.exceptions import AuthenticationError
+from ..core.logger import NexusLogger
+
+class SessionStore:
+    """
+    In-memory admin session store backed by the sessions table.
+
+    Tokens are validated from memory with a sliding TTL. The table is only
+    written on login and logout; extended expiries are flushed and expired
+    rows purged in batches by the sweeper thread. Only admin sessions are
+    loaded, so player session tokens never pass the admin check.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 3600, sweep_interval_seconds: int = 60, sweep_batch_size: int = 500):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.sweep_batch_size = sweep_batch_size
+        self.logger = NexusLogger.get_logger("session_store")
+
+        self._lock = threading.Lock()
+        self._sessions = {}   # token -> [admin_id, expires_at]
+        self._dirty = set()   # tokens whose expiry slid since the last flush
+        self._stop_event = threading.Event()
+        self._sweeper = None
+
+    @classmethod
+    def from_config(cls, db_path: str, security_config) -> "SessionStore":
+        """Create a session store from a SecurityConfig"""
+        return cls(
+            db_path,
+            security_config.admin_session_ttl_seconds,
+            security_config.session_sweep_interval_seconds,
+            security_config.session_sweep_batch_size,
+        )
+
+    def load(self):
+        """Load live admin sessions from the database"""
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT token, admin_id, expires_at FROM sessions WHERE admin_id IS NOT NULL"
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to load sessions: {e}")
+            return
+
+        with self._lock:
+            for token, admin_id, expires_at in rows:
+                if expires_at is None:
+                    # Sessions from before expiry tracking get one full TTL
+                    expires_at = now + self.ttl_seconds
+                    self._dirty.add(token)
+                if expires_at > now:
+                    self._sessions[token] = [admin_id, expires_at]
+        self.logger.info(f"Loaded {len(self._sessions)} admin sessions")
+
+    def create(self, admin_id: str) -> str:
+        """Create a session for an admin and return its token"""
+        token = str(uuid.uuid4())
+        expires_at = time.time() + self.ttl_seconds
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO sessions (id, admin_id, token, expires_at) VALUES (?, ?, ?, ?)",
+                    (str(uuid.uuid4()), admin_id, token, expires_at)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            raise AuthenticationError(f"Database error: {e}")
+
+        with self._lock:
+            self._sessions[token] = [admin_id, expires_at]
+        return token
+
+    def validate(self, token: str) -> bool:
+        """Check a token and extend its expiry"""
+        if not token:
+            return False
+
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return False
+            if session[1] <= now:
+                # The sweeper deletes the row
+                del self._sessions[token]
+                self._dirty.discard(token)
+                return False
+            session[1] = now + self.ttl_seconds
+            self._dirty.add(token)
+            return True
+
+    def revoke(self, token: str):
+        """Remove a session from memory and the database"""
+        with self._lock:
+            self._sessions.pop(token, None)
+            self._dirty.discard(token)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to delete session: {e}")
+
+    def sweep(self) -> int:
+        """Drop expired sessions, persist slid expiries and purge expired rows in batches"""
+        now = time.time()
+        with self._lock:
+            expired = [token for token, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for token in expired:
+                del self._sessions[token]
+                self._dirty.discard(token)
+            updates = [(self._sessions[token][1], token) for token in self._dirty]
+            self._dirty.clear()
+
+        purged = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if updates:
+                    conn.executemany("UPDATE sessions SET expires_at = ? WHERE token = ?", updates)
+                    conn.commit()
+                while True:
+                    cursor = conn.execute(
+                        "DELETE FROM sessions WHERE rowid IN "
+                        "(SELECT rowid FROM sessions WHERE expires_at <= ? LIMIT ?)",
+                        (now, self.sweep_batch_size)
+                    )
+                    conn.commit()
+                    purged += cursor.rowcount
+                    if cursor.rowcount < self.sweep_batch_size:
+                        break
+        except sqlite3.Error as e:
+            self.logger.error(f"Session sweep failed: {e}")
+            return purged
+
+        if purged:
+            self.logger.info(f"Purged {purged} expired sessions")
+        return purged
+
+    def start(self):
+        """Start the background sweeper thread"""
+        if self._sweeper is not None:
+            return
+        self._stop_event.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self):
+        """Stop the sweeper and flush pending expiries"""
+        if self._sweeper is not None:
+            self._stop_event.set()
+            self._sweeper.join()
+            self._sweeper = None
+        self.sweep()
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval_seconds):
+            self.sweep()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Any, Dict
+from ..core.events import Event, EventBus, EventHandler, GameEvents, PlayerEvents
+from ..core.logger import NexusLogger
+
+class StatisticsService(EventHandler):
+    """
+    Server statistics kept in memory and updated from game events.
+
+    Player and mission counts are adjusted as events arrive, so reads cost
+    no queries. Changes made without an event (admin deletions, session
+    cleanup, edits to the database) are picked up by a recount from the
+    repositories, which the first read after max_staleness_seconds runs
+    before answering.
+    """
+
+    # Mission status before and after each mission event
+    MISSION_TRANSITIONS = {
+        GameEvents.MISSION_STARTED: ("available", "in_progress"),
+        GameEvents.MISSION_COMPLETED: ("in_progress", "completed"),
+        GameEvents.MISSION_FAILED: ("in_progress", "failed"),
+        GameEvents.MISSION_ABANDONED: ("in_progress", "available"),
+    }
+
+    def __init__(self, player_repository, mission_repository, event_bus: EventBus,
+                 max_staleness_seconds: float = 30.0):
+        self.player_repository = player_repository
+        self.mission_repository = mission_repository
+        self.max_staleness_seconds = max_staleness_seconds
+        self.logger = NexusLogger.get_logger("statistics_service")
+
+        self._lock = threading.Lock()
+        self._total_players = 0
+        self._online_players = 0
+        self._total_missions = 0
+        self._missions_by_status: Dict[str, int] = {}
+        self._missions_by_type: Dict[str, int] = {}
+        self._reconciled_at = None
+
+        for event_type in (PlayerEvents.PLAYER_CREATED, PlayerEvents.PLAYER_LOGGED_IN,
+                           PlayerEvents.PLAYER_LOGGED_OUT, *self.MISSION_TRANSITIONS):
+            event_bus.subscribe(event_type, self)
+
+    def handle(self, event: Event) -> bool:
+        """Apply one event to the counts"""
+        with self._lock:
+            if event.event_type == PlayerEvents.PLAYER_CREATED:
+                self._total_players += 1
+            elif event.event_type == PlayerEvents.PLAYER_LOGGED_IN:
+                if not event.data.get("was_online"):
+                    self._online_players += 1
+            elif event.event_type == PlayerEvents.PLAYER_LOGGED_OUT:
+                if event.data.get("was_online", True):
+                    self._online_players = max(0, self._online_players - 1)
+            else:
+                before, after = self.MISSION_TRANSITIONS[event.event_type]
+                by_status = self._missions_by_status
+                by_status[before] = max(0, by_status.get(before, 0) - 1)
+                by_status[after] = by_status.get(after, 0) + 1
+        return True
+
+    def reconcile(self):
+        """Recount everything from the repositories"""
+        total_players = self.player_repository.count()
+        online_players = self.player_repository.count_online()
+        mission_statistics = self.mission_repository.get_mission_statistics()
+
+        with self._lock:
+            drift = {
+                name: actual - current
+                for name, current, actual in (
+                    ("total_players", self._total_players, total_players),
+                    ("online_players", self._online_players, online_players),
+                    ("total_missions", self._total_missions, mission_statistics["total"]),
+                )
+                if actual != current
+            }
+            self._total_players = total_players
+            self._online_players = online_players
+            self._total_missions = mission_statistics["total"]
+            self._missions_by_status = dict(mission_statistics["by_status"])
+            self._missions_by_type = dict(mission_statistics["by_type"])
+            first = self._reconciled_at is None
+            self._reconciled_at = time.monotonic()
+
+        if drift and not first:
+            self.logger.info(f"Statistics recount corrected drift: {drift}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Current counts, recounted first if the last recount is too old"""
+        reconciled_at = self._reconciled_at
+        if reconciled_at is None or time.monotonic() - reconciled_at >= self.max_staleness_seconds:
+            self.reconcile()
+
+        with self._lock:
+            by_status = {status: count for status, count in self._missions_by_status.items() if count}
+            by_type = dict(self._missions_by_type)
+            stats = {
+                "total_players": self._total_players,
+                "online_players": self._online_players,
+                "total_missions": self._total_missions,
+            }
+
+        completed = by_status.get("completed", 0)
+        total_started = completed + by_status.get("in_progress", 0) + by_status.get("failed", 0)
+        stats["mission_statistics"] = {
+            "total": stats["total_missions"],
+            "by_status": by_status,
+            "by_type": by_type,
+            "completion_rate": (completed / total_started * 100) if total_started > 0 else 0,
+        }
+        return stats
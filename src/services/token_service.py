@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+import uuid
+from typing import Any, Dict
+from ..core.exceptions import AuthenticationError
+from ..core.logger import NexusLogger
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+class TokenService:
+    """
+    Issues and verifies stateless, HMAC-SHA256 signed player session tokens.
+
+    A token is `<payload>.<signature>`, both base64url encoded. The payload
+    carries the player id and name, issue and expiry times, the signing key
+    id and a unique token id, so verification needs no I/O. Old keys stay
+    valid for verification after a rotation until they are retired. Revoked
+    token ids are kept in memory only until the token would have expired.
+    """
+
+    def __init__(self, keys: Dict[str, str], active_key_id: str, ttl_seconds: int = 86400):
+        if active_key_id not in keys:
+            raise ValueError(f"Unknown active key id: {active_key_id}")
+        self._keys = {key_id: secret.encode() for key_id, secret in keys.items()}
+        self.active_key_id = active_key_id
+        self.ttl_seconds = ttl_seconds
+        self._revoked = {}  # jti -> exp
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, security_config) -> "TokenService":
+        """Create a token service from a SecurityConfig"""
+        keys = dict(security_config.token_previous_secrets)
+        secret = security_config.token_secret
+        if not secret:
+            NexusLogger.get_logger("token_service").warning(
+                "No token secret configured; using a random key, tokens will not survive a restart"
+            )
+            secret = secrets.token_urlsafe(32)
+        keys[security_config.token_key_id] = secret
+        return cls(keys, security_config.token_key_id, security_config.player_token_ttl_seconds)
+
+    def issue(self, player_id: str, player_name: str, **claims) -> str:
+        """Issue a signed token for a player"""
+        now = int(time.time())
+        payload = dict(
+            claims,
+            pid=player_id,
+            name=player_name,
+            iat=now,
+            exp=now + self.ttl_seconds,
+            kid=self.active_key_id,
+            jti=uuid.uuid4().hex,
+        )
+        encoded = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return f"{encoded}.{self._sign(self._keys[self.active_key_id], encoded)}"
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Verify a token and return its claims"""
+        try:
+            encoded, signature = token.split(".")
+            claims = json.loads(_b64decode(encoded))
+            valid = hmac.compare_digest(signature, self._sign(self._keys[claims["kid"]], encoded))
+        except (AttributeError, ValueError, KeyError, TypeError):
+            valid = False
+
+        if not valid:
+            raise AuthenticationError("Invalid session token")
+        if claims.get("exp", 0) <= time.time():
+            raise AuthenticationError("Session token expired")
+        if claims.get("jti") in self._revoked:
+            raise AuthenticationError("Session token revoked")
+        return claims
+
+    def revoke(self, token: str):
+        """Revoke a token until it expires"""
+        claims = self.verify(token)
+        now = time.time()
+        with self._lock:
+            # Expired entries can go: their tokens fail the expiry check anyway
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            self._revoked[claims["jti"]] = claims["exp"]
+
+    def rotate(self, key_id: str, secret: str):
+        """Sign new tokens with a new key; existing keys still verify"""
+        self._keys[key_id] = secret.encode()
+        self.active_key_id = key_id
+
+    def retire_key(self, key_id: str):
+        """Stop accepting tokens signed with a key"""
+        if key_id == self.active_key_id:
+            raise ValueError("Cannot retire the active key")
+        self._keys.pop(key_id, None)
+
+    def _sign(self, key: bytes, encoded: str) -> str:
+        return _b64encode(hmac.new(key, encoded.encode("ascii"), hashlib.sha256).digest())
@@ -18,7 +18,7 @@ class NexusShellRedesigned:
         self.config = config or NexusConfig.load_from_file()
         
         # Initialize logging
-        NexusLogger.initialize(self.config.log_level, self.config.log_file)
+        NexusLogger.initialize(self.config.log_level, self.config.log_file, self.config.logging)
         self.logger = NexusLogger.get_logger("shell")
         
         # Initialize game API
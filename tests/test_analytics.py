@@ -0,0 +1,163 @@
+"""
+Tests for NumPy player analytics
+"""
+
+import http.client
+import json
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.api.admin_api import AdminAPI
+from src.core.config import GameConfig, NexusConfig
+from src.core.exceptions import ValidationError
+from src.models.player import Player
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services import analytics_service
+from src.server.web_server import WebServer
+from src.services.analytics_service import AnalyticsService
+from src.services.password_hasher import PasswordHasher
+
+class TestAnalyticsService:
+    """Test cases for AnalyticsService and the admin analytics API"""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create temporary database for testing"""
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield path
+        os.unlink(path)
+
+    @pytest.fixture
+    def repository(self, temp_db):
+        """Ten players: levels 1-10, credits 100 per level, CPU tier 1 or 2, one VIP"""
+        repository = SQLitePlayerRepository(temp_db)
+        template = Player("template").to_dict()
+        rows = []
+        for i in range(10):
+            data = dict(template, id=f"p{i}", name=f"player{i}", is_vip=i == 9)
+            data["virtual_computer"] = dict(template["virtual_computer"], cpu_tier=1 + i % 2)
+            rows.append((f"p{i}", f"player{i}", i == 9, template["created_at"], template["created_at"],
+                         i + 1, 100 * (i + 1), json.dumps(data)))
+        with sqlite3.connect(temp_db) as conn:
+            conn.executemany(
+                "INSERT INTO players (id, name, is_vip, created_at, last_login, level, credits, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return repository
+
+    def test_stat_batches_stream_all_players(self, repository):
+        """Test stats come back in batches with tiers read from the JSON data"""
+        batches = list(repository.iter_stat_batches(batch_size=4))
+
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert batches[0][1] == (2, 200, 0, 0, 2, 1, 1, 1)
+
+    def test_report(self, repository):
+        """Test histograms, percentiles, hardware mix and what-ifs"""
+        pytest.importorskip("numpy")
+        service = AnalyticsService(repository, GameConfig(credit_multiplier=2.0), batch_size=3)
+
+        report = service.get_report([0.8])
+
+        assert report["players"] == 10
+        assert report["level_histogram"] == [{"level": level, "players": 1} for level in range(1, 11)]
+        assert report["credits"]["total"] == 5500
+        assert report["credits"]["percentiles"]["p50"] == 550.0
+        assert report["credits_vip"]["total"] == 1000
+        assert report["hardware_mix"]["cpu"] == {"1": 5, "2": 5}
+        # Next CPU tier costs 50 from tier 1 and 100 from tier 2; everyone has at least 100
+        assert report["upgrade_affordability"]["cpu"] == 1.0
+
+        # Going from 2.0 to 0.8 scales every balance by 0.4
+        what_if = report["what_if"][0]
+        assert what_if["credits"]["total"] == 2200
+        # The two poorest players, at 40 and 80 credits, drop below their upgrade cost
+        assert what_if["upgrade_affordability"]["cpu"] == 0.8
+
+    def test_credit_distribution_gini(self):
+        """Test the Gini coefficient of equal and fully concentrated balances"""
+        np = pytest.importorskip("numpy")
+
+        assert AnalyticsService.credit_distribution(np.array([5, 5, 5, 5]))["gini"] == 0.0
+        assert AnalyticsService.credit_distribution(np.array([0, 0, 0, 100]))["gini"] == 0.75
+
+    def test_snapshot_is_cached(self, repository):
+        """Test reports reuse the loaded snapshot until refreshed"""
+        pytest.importorskip("numpy")
+        service = AnalyticsService(repository, GameConfig())
+        first = service.snapshot()
+
+        assert service.snapshot() is first
+        assert service.snapshot(refresh=True) is not first
+
+    def test_admin_api_without_numpy(self, repository, monkeypatch):
+        """Test a missing NumPy is reported as an API error"""
+        monkeypatch.setattr(analytics_service, "np", None)
+        admin_api = AdminAPI(None, None, AnalyticsService(repository, GameConfig()))
+
+        result = admin_api.get_player_analytics()
+
+        assert result["success"] == False
+        assert result["code"] == "ConfigurationError"
+        assert "NumPy" in result["error"]
+
+    def test_largest_multiplier_keeps_supply_positive(self, repository):
+        """Test the largest allowed multiplier scales balances without overflowing"""
+        pytest.importorskip("numpy")
+        service = AnalyticsService(repository, GameConfig())
+
+        what_if = service.simulate_credit_multiplier(service.snapshot(), analytics_service.MAX_CREDIT_MULTIPLIER)
+
+        assert what_if["credits"]["total"] == 5500 * 1000
+
+    @pytest.mark.parametrize("multiplier", [0, -1.5, float("nan"), float("inf"), 1e300, 1000.5])
+    def test_invalid_multiplier_rejected(self, repository, multiplier):
+        """Test non-positive, non-finite and overflowing multipliers are rejected before any array math"""
+        service = AnalyticsService(repository, GameConfig())
+
+        with pytest.raises(ValidationError):
+            service.simulate_credit_multiplier(None, multiplier)
+
+class TestAnalyticsEndpoint:
+    """Test the admin analytics endpoint"""
+
+    @pytest.fixture
+    def server(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.server.host = "127.0.0.1"
+        config.server.port = 0
+        config.game.rate_limiting_enabled = False
+
+        web_server = WebServer(config)
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "INSERT INTO admin_users (id, username, password_hash) VALUES (?, ?, ?)",
+                ("admin-1", "admin", PasswordHasher().hash("admin-password"))
+            )
+        token = web_server.admin_auth_service.authenticate("admin", "admin-password")
+        _, port = web_server.start()
+        yield port, token
+        web_server.stop()
+        os.unlink(path)
+
+    @pytest.mark.parametrize("multipliers", ["abc", "1.5,x", "nan", "inf", "-inf", "0", "1e300"])
+    def test_bad_multipliers_are_client_errors(self, server, multipliers):
+        """Test unparseable, out of range and non-finite multipliers get a 400, not a 500"""
+        port, token = server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", f"/admin/api/analytics?multipliers={multipliers}",
+                           headers={"Authorization": f"Bearer {token}"})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+
+        assert response.status == 400
+        assert not json.loads(body)["success"]
@@ -0,0 +1,134 @@
+"""
+Tests for bulk moderation
+"""
+
+import pytest
+import tempfile
+import os
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from src.core.events import EventBus, EventHandler, AdminEvents
+from src.core.exceptions import ValidationError
+from src.models.player import Player
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.admin_service import AdminService
+from src.services.player_service import PlayerService
+
+class RecordingHandler(EventHandler):
+    def __init__(self):
+        self.events = []
+
+    def handle(self, event):
+        self.events.append(event)
+        return True
+
+class TestBulkModeration:
+    """Test cases for AdminService bulk bans"""
+
+    @pytest.fixture
+    def services(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        repository = SQLitePlayerRepository(path)
+        # More players than one id lookup chunk, inserted in one transaction
+        players = [Player(f"Raider_{i:03d}") for i in range(600)]
+        for i, player in enumerate(players):
+            player.id = f"raider-{i:03d}"
+        with sqlite3.connect(path) as conn:
+            conn.executemany(
+                "INSERT INTO players (id, name, created_at, last_login, data) VALUES (?, ?, '', '', ?)",
+                [(player.id, player.name, json.dumps(player.to_dict())) for player in players]
+            )
+        player_ids = [player.id for player in players]
+        event_bus = EventBus()
+        recorder = RecordingHandler()
+        for event_type in (AdminEvents.PLAYERS_BANNED, AdminEvents.PLAYERS_UNBANNED,
+                           AdminEvents.IPS_BANNED, AdminEvents.IPS_UNBANNED):
+            event_bus.subscribe(event_type, recorder)
+        player_service = PlayerService(repository)
+        admin_service = AdminService(repository, player_service.ip_ban_index, player_service.player_ban_list, event_bus)
+        yield admin_service, player_service, player_ids, recorder
+        os.unlink(path)
+
+    def test_ban_players_reports_each_id(self, services):
+        """Test one call bans every player and reports missing ids"""
+        admin_service, player_service, player_ids, recorder = services
+
+        summary = admin_service.ban_players(player_ids + ["missing", player_ids[0]], "raid", 60)
+
+        assert summary["succeeded"] == 600 and summary["failed"] == 1
+        assert summary["results"][-1] == {"id": "missing", "success": False, "message": "Player not found"}
+        assert len(admin_service.get_banned_players()) == 600
+        assert all(player_service.player_ban_list.is_banned(player_id) for player_id in player_ids)
+        assert admin_service.player_repository.find_by_id(player_ids[5]).ban_reason == "raid"
+
+        assert len(recorder.events) == 1
+        assert recorder.events[0].event_type == AdminEvents.PLAYERS_BANNED
+        assert recorder.events[0].data["count"] == 600
+
+    def test_unban_players(self, services):
+        """Test unbanning reports players that were not banned"""
+        admin_service, player_service, player_ids, recorder = services
+        admin_service.ban_players(player_ids[:10])
+
+        summary = admin_service.unban_players(player_ids[:20])
+
+        assert summary["succeeded"] == 10 and summary["failed"] == 10
+        assert "is not banned" in summary["results"][15]["message"]
+        assert admin_service.get_banned_players() == []
+        assert not player_service.player_ban_list.is_banned(player_ids[0])
+        assert recorder.events[-1].data["player_ids"] == player_ids[:10]
+
+    def test_ban_and_unban_ips(self, services):
+        """Test bulk IP bans normalize, dedupe and update the index"""
+        admin_service, player_service, _, recorder = services
+        admin_service.ban_ip("203.0.113.9")
+
+        summary = admin_service.ban_ips(["198.51.100.0/24", "203.0.113.9", "bogus", "198.51.100.7/24", "2001:db8::/48"])
+
+        assert [result["success"] for result in summary["results"]] == [True, False, False, False, True]
+        assert "Duplicate" in summary["results"][3]["message"]
+        assert player_service.is_ip_banned("198.51.100.20")
+        assert recorder.events[-1].data["ip_addresses"] == ["198.51.100.0/24", "2001:db8::/48"]
+
+        summary = admin_service.unban_ips(["198.51.100.0/24", "192.0.2.1"])
+        assert summary["succeeded"] == 1
+        assert not player_service.is_ip_banned("198.51.100.20")
+        assert sorted(admin_service.player_repository.find_banned_ips()) == ["2001:db8::/48", "203.0.113.9"]
+
+    def test_unban_expired_ban_reports_not_banned(self, services):
+        """Test an expired ban is cleared but reported like unban_player does"""
+        admin_service, _, player_ids, recorder = services
+        admin_service.player_repository.set_ban(player_ids[0], True, "old", datetime.now() - timedelta(minutes=1))
+
+        summary = admin_service.unban_players([player_ids[0]])
+
+        assert summary["succeeded"] == 0
+        assert "is not banned" in summary["results"][0]["message"]
+        assert not admin_service.player_repository.find_by_id(player_ids[0]).banned
+        assert admin_service.unban_player(player_ids[0]) == (False, "Player Raider_000 is not banned")
+
+    def test_bulk_ips_use_normalized_and_given_forms(self, services):
+        """Test bulk IP bans store normalized entries and unbans also remove rows stored as given"""
+        admin_service = services[0]
+        with sqlite3.connect(admin_service.player_repository.db_path) as conn:
+            conn.execute("INSERT INTO banned_ips (id, ip_address) VALUES ('legacy', '192.0.2.7/32')")
+
+        summary = admin_service.ban_ips(["198.51.100.7/24"])
+        assert summary["results"][0] == {"ip_address": "198.51.100.0/24", "success": True,
+                                         "message": "IP address 198.51.100.0/24 has been banned"}
+        assert admin_service.player_repository.find_banned_ips() == ["192.0.2.7/32", "198.51.100.0/24"]
+
+        summary = admin_service.unban_ips(["192.0.2.7/32", "198.51.100.0/24"])
+        assert summary["succeeded"] == 2
+        assert admin_service.player_repository.find_banned_ips() == []
+
+    def test_invalid_bulk_requests(self, services):
+        """Test malformed and oversized lists are rejected"""
+        admin_service = services[0]
+        with pytest.raises(ValidationError):
+            admin_service.ban_players("not-a-list")
+        with pytest.raises(ValidationError):
+            admin_service.ban_ips([f"10.0.{i // 256}.{i % 256}" for i in range(AdminService.MAX_BULK_ITEMS + 1)])
+        assert not admin_service.ban_players([])["results"]
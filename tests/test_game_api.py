@@ -5,6 +5,7 @@ Tests for game API
 import pytest
 import tempfile
 import os
+import threading
 from src.api.game_api import GameAPI
 from src.core.config import NexusConfig
 
@@ -79,6 +80,21 @@ class TestGameAPI:
         assert result["output"] is not None
         assert result["execution_time_ms"] >= 0
     
+    def test_concurrent_commands_for_one_player(self, game_api):
+        """Test commands from concurrent requests for one player are all saved"""
+        game_api.create_player("TestPlayer")
+        threads = [
+            threading.Thread(target=lambda: [game_api.execute_command("TestPlayer", "ls") for _ in range(5)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        player = game_api.player_service.get_player_by_name("TestPlayer")
+        assert player.stats.total_commands_executed == 20
+    
     def test_execute_command_unknown_player(self, game_api):
         """Test command execution with unknown player"""
         result = game_api.execute_command("UnknownPlayer", "ls")
@@ -86,6 +102,40 @@ class TestGameAPI:
         assert result["success"] == False
         assert "Player not found" in result["error"]
     
+    def test_execute_commands_batch(self, game_api):
+        """Test batched command execution saves once and keeps order"""
+        game_api.create_player("TestPlayer")
+        saves = []
+        original_save = game_api.player_repository.save
+        game_api.player_repository.save = lambda player: saves.append(player) or original_save(player)
+        
+        result = game_api.execute_commands("TestPlayer", ["ls", "cat data.txt", "nosuchcommand"])
+        
+        assert result["success"] == False
+        results = result["data"]["results"]
+        assert [r["success"] for r in results] == [True, True, False]
+        assert "target_ip" in results[1]["output"]
+        assert len(saves) == 1
+        assert game_api.player_service.get_player_by_name("TestPlayer").stats.total_commands_executed == 2
+    
+    def test_execute_commands_stop_on_error(self, game_api):
+        """Test batch stops at the first failure when asked"""
+        game_api.create_player("TestPlayer")
+        
+        result = game_api.execute_commands("TestPlayer", ["nosuchcommand", "ls"], stop_on_error=True)
+        
+        assert result["data"]["executed"] == 1
+    
+    def test_execute_commands_batch_limit(self, game_api):
+        """Test oversized batches are rejected"""
+        game_api.create_player("TestPlayer")
+        game_api.config.game.max_commands_per_batch = 2
+        
+        result = game_api.execute_commands("TestPlayer", ["ls"] * 3)
+        
+        assert result["success"] == False
+        assert "Too many commands" in result["error"]
+    
     def test_get_available_commands(self, game_api):
         """Test getting available commands"""
         # Create player
@@ -180,6 +230,64 @@ class TestGameAPI:
         assert result["success"] == True
         assert "progress" in result["message"].lower()
     
+    def test_execute_script_api(self, game_api):
+        """Test NexusScript execution saves the player's changes"""
+        game_api.create_player("TestPlayer")
+        player = game_api.player_service.get_player_by_name("TestPlayer")
+        player.stats.credits = 150
+        game_api.player_repository.save(player)
+        
+        result = game_api.execute_script("TestPlayer", 'set-theme("retro")')
+        assert result["success"] == True
+        assert result["output"] == "Theme set to 'retro'."
+        
+        result = game_api.execute_script("TestPlayer", 'buy("cpu")', "shop.ns")
+        assert result["success"] == True
+        assert "CPU Tier 2" in result["output"]
+        
+        player = game_api.player_service.get_player_by_name("TestPlayer")
+        assert player.settings["theme"] == "retro"
+        assert player.virtual_computer.cpu.tier == 2
+        assert player.stats.credits == 50
+        assert player.stats.total_scripts_executed == 2
+    
+    def test_execute_script_errors(self, game_api):
+        """Test script execution with bad input"""
+        game_api.create_player("TestPlayer")
+        
+        assert game_api.execute_script("UnknownPlayer", "ls()")["success"] == False
+        assert "Missing script source" in game_api.execute_script("TestPlayer", "")["error"]
+        assert game_api.execute_script("TestPlayer", "set = 1")["success"] == False
+    
+    def test_script_variables_dropped_on_logout(self, game_api):
+        """Test a player's script variables are forgotten when they log out"""
+        game_api.create_player("TestPlayer")
+        game_api.execute_script("TestPlayer", 'set $theme = "retro"')
+        assert "TestPlayer" in game_api.script_executor._environments
+        
+        game_api.logout_player("TestPlayer")
+        assert "TestPlayer" not in game_api.script_executor._environments
+    
+    def test_execute_script_feeds_profiler(self, config):
+        """Test scripts run through the API show up in the script profile"""
+        config.game.script_profiling_enabled = True
+        game_api = GameAPI(config)
+        game_api.create_player("TestPlayer")
+        
+        assert game_api.get_script_profile()["data"]["players"] == []
+        game_api.execute_script("TestPlayer", 'shop() set-prompt("p> ")', "macro")
+        game_api.execute_script("TestPlayer", "shop()", "macro")
+        
+        report = game_api.get_script_profile("TestPlayer")["data"]
+        assert report["enabled"] == True
+        assert report["players"][0]["runs"] == 2
+        assert report["modules"][0]["module"] == "macro"
+        calls = {entry["function"]: entry["calls"] for entry in report["functions"]}
+        assert calls == {"shop": 2, "set-prompt": 1}
+        
+        result = game_api.execute_script("TestPlayer", "shop()", "m" * 65)
+        assert result["success"] == False
+    
     def test_validate_player_session(self, game_api):
         """Test session validation"""
         # Create and authenticate player
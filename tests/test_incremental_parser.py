@@ -0,0 +1,48 @@
+import unittest
+from src.nexus_script.incremental import IncrementalParser
+from src.nexus_script.lexer import Lexer
+from src.nexus_script.parser import Parser
+
+class TestIncrementalParser(unittest.TestCase):
+    def _full_parse(self, source):
+        return [s.to_string() for s in Parser(Lexer(source)).parse_program().statements]
+
+    def test_edit_reuses_unchanged_statements(self):
+        source = "\n".join(f'set $v{i} = "value {i}"' for i in range(50))
+        parser = IncrementalParser(source)
+        before = list(parser.program.statements)
+
+        position = source.index("value 25")
+        parser.edit(position, position + len("value"), "changed")
+
+        self.assertLessEqual(parser.last_reparsed, 3)
+        after = parser.program.statements
+        self.assertIs(after[0], before[0])
+        self.assertIs(after[-1], before[-1])
+        self.assertEqual([s.to_string() for s in after], self._full_parse(parser.source))
+
+    def test_spans_shifted_after_edit(self):
+        parser = IncrementalParser('ls set $a = "x" shop()')
+        parser.edit(0, 2, "clear")
+        self.assertEqual(parser.spans, IncrementalParser(parser.source).spans)
+        self.assertEqual(parser.spans[-1], (len(parser.source) - len("shop()"), len(parser.source)))
+
+    def test_diagnostics_follow_edits(self):
+        parser = IncrementalParser('set $a = "x"\nshop()')
+        self.assertEqual(parser.diagnostics, [])
+
+        diagnostics = parser.edit(4, 6, "")
+        self.assertTrue(diagnostics)
+        self.assertEqual(diagnostics[0]["start"], 0)
+
+        diagnostics = parser.edit(4, 4, "$a")
+        self.assertEqual(diagnostics, [])
+        self.assertEqual([s.to_string() for s in parser.program.statements], self._full_parse(parser.source))
+
+    def test_edit_outside_source_rejected(self):
+        parser = IncrementalParser("ls")
+        with self.assertRaises(ValueError):
+            parser.edit(1, 5, "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the banned-IP index
+"""
+
+import pytest
+import tempfile
+import os
+import random
+import ipaddress
+from src.services.ip_ban_index import IPBanIndex, normalize_ban_entry
+from src.services.admin_service import AdminService
+from src.services.player_service import PlayerService
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+
+class TestIPBanIndex:
+    """Test cases for IPBanIndex"""
+
+    def test_exact_and_range_matches(self):
+        """Test exact addresses and CIDR ranges for both families"""
+        index = IPBanIndex(["203.0.113.7", "10.0.0.0/8", "2001:db8::/32"])
+
+        assert index.contains("203.0.113.7")
+        assert not index.contains("203.0.113.8")
+        assert index.contains("10.255.1.2")
+        assert not index.contains("11.0.0.1")
+        assert index.contains("2001:db8:1::5")
+        assert not index.contains("2001:db9::1")
+        assert "10.1.1.1" in index
+
+    def test_ipv4_mapped_and_invalid_addresses(self):
+        """Test mapped IPv6 matches IPv4 bans and garbage never matches"""
+        index = IPBanIndex(["192.0.2.0/24"])
+
+        assert index.contains("::ffff:192.0.2.10")
+        assert not index.contains("not-an-ip")
+        assert not index.contains("")
+        assert not index.contains(None)
+        assert not index.add("999.1.1.1/8")
+
+    def test_remove_range_keeps_overlapping(self):
+        """Test removing a range leaves nested ranges in place"""
+        index = IPBanIndex(["10.0.0.0/8", "10.1.0.0/16"])
+
+        assert index.remove("10.0.0.0/8")
+        assert not index.contains("10.2.0.1")
+        assert index.contains("10.1.2.3")
+        assert not index.remove("10.0.0.0/8")
+        assert len(index) == 1
+
+    def test_catch_all_range(self):
+        """Test a /0 range bans the whole family"""
+        index = IPBanIndex(["0.0.0.0/0"])
+        assert index.contains("8.8.8.8")
+        assert not index.contains("::1")
+
+    def test_matches_linear_scan(self):
+        """Test random lookups agree with checking every network"""
+        rng = random.Random(7)
+        networks = [
+            ipaddress.ip_network((rng.getrandbits(32), rng.randint(8, 32)), strict=False)
+            for _ in range(200)
+        ]
+        index = IPBanIndex(str(network) for network in networks)
+
+        for _ in range(2000):
+            address = ipaddress.ip_address(rng.getrandbits(32))
+            if rng.random() < 0.5:
+                network = rng.choice(networks)
+                address = network.network_address + rng.randrange(network.num_addresses)
+            expected = any(address in network for network in networks)
+            assert index.contains(str(address)) == expected
+
+    def test_normalize_ban_entry(self):
+        """Test entries are stored in canonical form"""
+        assert normalize_ban_entry("10.1.2.3/8") == "10.0.0.0/8"
+        assert normalize_ban_entry("10.1.2.3/32") == "10.1.2.3"
+        assert normalize_ban_entry("2001:DB8::1") == "2001:db8::1"
+        assert normalize_ban_entry("nope") is None
+
+class TestIPBans:
+    """Test cases for IP bans through the services"""
+
+    @pytest.fixture
+    def temp_db(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield path
+        os.unlink(path)
+
+    def test_ban_updates_shared_index_and_persists(self, temp_db):
+        """Test bans apply immediately and are loaded on startup"""
+        repository = SQLitePlayerRepository(temp_db)
+        player_service = PlayerService(repository)
+        admin_service = AdminService(repository, player_service.ip_ban_index)
+
+        assert admin_service.ban_ip("198.51.100.0/24")[0]
+        assert admin_service.ban_ip("203.0.113.9")[0]
+        assert not admin_service.ban_ip("203.0.113.9")[0]
+        assert not admin_service.ban_ip("bogus")[0]
+        assert player_service.is_ip_banned("198.51.100.77")
+
+        restarted = PlayerService(SQLitePlayerRepository(temp_db))
+        assert restarted.is_ip_banned("198.51.100.77")
+        assert restarted.is_ip_banned("203.0.113.9")
+
+        assert admin_service.unban_ip("198.51.100.0/24")[0]
+        assert not player_service.is_ip_banned("198.51.100.77")
+        assert not PlayerService(SQLitePlayerRepository(temp_db)).is_ip_banned("198.51.100.77")
@@ -0,0 +1,93 @@
+"""
+Tests for the load test harness and background server mode
+"""
+
+import pytest
+import asyncio
+import os
+import sys
+import tempfile
+from src.core.config import NexusConfig
+from src.server.web_server import WebServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import load_test
+
+class TestRampProfile:
+    """Test cases for RampProfile and the argument parsers"""
+
+    def test_linear_ramp(self):
+        """Test targets interpolate between stage targets"""
+        profile = load_test.RampProfile(load_test.parse_stages("10:100,5:100,5:0"))
+
+        assert profile.duration == 20 and profile.max_players == 100
+        assert [profile.target(t) for t in (0, 5, 10, 12, 17.5, 30)] == [0, 50, 100, 100, 50, 0]
+
+    def test_mix_validation(self):
+        """Test unknown actions are rejected"""
+        assert load_test.parse_mix("execute_command=3,login=1") == {"execute_command": 3.0, "login": 1.0}
+        with pytest.raises(ValueError):
+            load_test.parse_mix("teleport=1")
+
+class TestInProcessLoad:
+    """Test a short run against a background WebServer"""
+
+    @pytest.fixture
+    def server(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.server.host = "127.0.0.1"
+        config.server.port = 0
+        config.game.rate_limiting_enabled = False
+        config.security.scrypt_n = 1024
+        web_server = WebServer(config)
+        yield web_server, web_server.start()
+        web_server.stop()
+        os.unlink(path)
+
+    def test_short_run_reports_every_endpoint(self, server):
+        """Test players register, log in and exercise the mix without errors"""
+        _, (host, port) = server
+        profile = load_test.RampProfile([(0.5, 8), (1.0, 8)])
+        mix = load_test.parse_mix(load_test.DEFAULT_MIX)
+
+        stats, elapsed = asyncio.run(load_test.run_load(host, port, profile, mix, 0.05, 16, 10, seed=3))
+        summary = stats.summary(elapsed)
+
+        assert summary["register"]["requests"] == 8
+        assert {"execute_command", "login"} <= set(summary)
+        assert all(row["error_rate"] == 0 for row in summary.values())
+        assert summary["register"]["rejected_rate"] == 0
+
+    def test_seeded_missions_repeat(self, server):
+        """Test each player can keep starting and abandoning its own seeded mission"""
+        web_server, (host, port) = server
+        profile = load_test.RampProfile([(0.1, 4), (1.0, 4)])
+        mix = load_test.parse_mix("mission=8,execute_command=2")
+        missions = load_test.seed_missions(web_server.game_api.mission_service, profile.max_players)
+
+        stats, elapsed = asyncio.run(load_test.run_load(host, port, profile, mix, 0.02, 8, 10, 5, missions))
+        summary = stats.summary(elapsed)
+
+        assert summary["mission"]["requests"] > 4 * 4
+        assert summary["mission"]["error_rate"] == 0
+        assert summary["mission"]["rejected_rate"] == 0
+
+    def test_completed_missions_not_retried(self):
+        """Test a player stops starting missions the server reports as completed"""
+        class FakeClient:
+            def __init__(self):
+                self.requests = []
+
+            async def request(self, endpoint, method, path, body=None, token=None):
+                self.requests.append(body["mission_id"])
+                return {"success": False, "message": "Mission is completed"}
+
+        client = FakeClient()
+        player = load_test.SimulatedPlayer(0, "t", client, {"mission": 1}, 0, None, load_test.TUTORIAL_MISSIONS)
+        for _ in range(6):
+            asyncio.run(player.mission())
+
+        assert client.requests == load_test.TUTORIAL_MISSIONS
@@ -0,0 +1,73 @@
+"""
+Tests for the queue-based logging pipeline
+"""
+
+import pytest
+import json
+import logging
+import queue
+from src.core.config import LoggingConfig
+from src.core.logger import NexusLogger, SamplingFilter, JsonFormatter, DroppingQueueHandler
+
+def make_record(name: str, level: int = logging.INFO, message: str = "hello"):
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+class TestLoggingPipeline:
+    """Test cases for the logging handlers and filters"""
+
+    def test_sampling_filter(self):
+        """Test sampled loggers keep about their rate and warnings always pass"""
+        sampler = SamplingFilter({"command_service": 0.1, "web_server": 0.0})
+
+        kept = sum(sampler.filter(make_record("nexus.command_service")) for _ in range(5000))
+        assert 300 < kept < 700
+        assert not sampler.filter(make_record("nexus.web_server"))
+        assert sampler.filter(make_record("nexus.web_server", logging.WARNING))
+        assert sampler.filter(make_record("nexus.player_service"))
+
+    def test_json_formatter(self):
+        """Test records render as one JSON object"""
+        record = make_record("nexus.shell", message="player %s joined")
+        record.args = ("Alice",)
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["logger"] == "nexus.shell"
+        assert entry["level"] == "INFO"
+        assert entry["message"] == "player Alice joined"
+
+    def test_full_queue_drops_records(self):
+        """Test a full queue drops records instead of raising or blocking"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        for _ in range(5):
+            handler.handle(make_record("nexus.shell"))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+class TestNexusLoggerInitialize:
+    """Test NexusLogger.initialize with a LoggingConfig"""
+
+    @pytest.fixture(autouse=True)
+    def restore_default(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        yield
+        NexusLogger.initialize()
+
+    def test_json_file_output(self, tmp_path):
+        """Test records reach the rotating file as JSON once flushed"""
+        NexusLogger.initialize("INFO", "test.log", LoggingConfig(json_format=True, sampling={"access": 0.0}))
+        NexusLogger.get_logger("shell").info("written")
+        NexusLogger.get_logger("access").info("sampled out")
+        NexusLogger.shutdown()
+
+        lines = (tmp_path / "logs" / "test.log").read_text().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["written"]
+
+    def test_size_rotation(self, tmp_path):
+        """Test the file handler rolls over at max_bytes"""
+        NexusLogger.initialize("INFO", "rotate.log", LoggingConfig(max_bytes=200, backup_count=2))
+        for i in range(20):
+            NexusLogger.get_logger("shell").info(f"line {i:02d} of the rotation test")
+        NexusLogger.shutdown()
+
+        assert sorted(path.name for path in (tmp_path / "logs").iterdir()) == ["rotate.log", "rotate.log.1", "rotate.log.2"]
@@ -0,0 +1,200 @@
+"""
+Tests for the metrics registry and /metrics endpoint
+"""
+
+import pytest
+import tempfile
+import os
+import threading
+import time
+import http.client
+from http.server import HTTPServer
+from src.core.config import NexusConfig
+from src.core.exceptions import ValidationError
+from src.core.metrics import MetricsRegistry, REGISTRY, _ShardedMetric
+from src.repositories.base_repository import REPOSITORY_CALL_SECONDS, instrumented
+from src.models.player import Player
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.server.web_server import WebServer, route_label
+from src.services.command_service import CommandService, COMMANDS_TOTAL
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry"""
+
+    def test_counter_merges_thread_shards(self):
+        """Test increments from many threads, live or finished, are all counted"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_events_total", "Events", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(1, "a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.labels("b").inc(2.5)
+
+        assert counter.collect() == {("a",): 8000, ("b",): 2.5}
+        # Finished threads are folded into one retired shard
+        assert len(counter._shards) == 1
+        assert counter.collect()[("a",)] == 8000
+
+    def test_histogram_render(self):
+        """Test cumulative buckets, sum and count in the text format"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "/x")
+
+        text = registry.render()
+
+        assert "# TYPE test_latency_seconds histogram" in text
+        assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{route="/x",le="1"} 3' in text
+        assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+        assert 'test_latency_seconds_sum{route="/x"} 6.05' in text
+        assert 'test_latency_seconds_count{route="/x"} 4' in text
+
+    def test_gauge_and_label_escaping(self):
+        """Test gauges, callbacks and escaped label values"""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("test_queue_depth", "Depth", ("queue",))
+        gauge.set(3, 'say "hi"\n')
+        gauge.set_function(lambda: 7, "live")
+
+        text = registry.render()
+
+        assert 'test_queue_depth{queue="say \\"hi\\"\\n"} 3' in text
+        assert 'test_queue_depth{queue="live"} 7' in text
+
+    def test_registration_rules(self):
+        """Test re-registration returns the metric and wrong labels fail"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "Total", ("a",))
+
+        assert registry.counter("test_total", "Total", ("a",)) is counter
+        with pytest.raises(ValueError):
+            registry.gauge("test_total", "Total")
+        with pytest.raises(ValueError):
+            counter.inc(1, "x", "y")
+
+    def test_command_metrics(self):
+        """Test commands are counted by name with unknown names collapsed"""
+        before = COMMANDS_TOTAL.collect()
+        command_service = CommandService()
+        player = Player("Tester")
+
+        command_service.execute_command(player, "ls")
+        command_service.execute_command(player, "rm -rf /")
+
+        after = COMMANDS_TOTAL.collect()
+        assert after[("ls", "success")] == before.get(("ls", "success"), 0) + 1
+        assert after[("unknown", "error")] == before.get(("unknown", "error"), 0) + 1
+
+    def test_repository_generators_timed_through_iteration(self):
+        """Test generator methods are timed until exhausted, not just created"""
+        @instrumented("timing_test")
+        class SlowRepository:
+            def iter_rows(self):
+                for row in range(3):
+                    time.sleep(0.01)
+                    yield row
+
+        key = ("timing_test", "iter_rows")
+        before = REPOSITORY_CALL_SECONDS.collect().get(key, [0.0])[-1]
+        assert list(SlowRepository().iter_rows()) == [0, 1, 2]
+        assert REPOSITORY_CALL_SECONDS.collect()[key][-1] - before >= 0.03
+
+    def test_repository_iterators_timed_through_iteration(self):
+        """Test iter_players, which validates fields eagerly and returns a generator, is timed until exhausted"""
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        try:
+            repository = SQLitePlayerRepository(path)
+            for i in range(3):
+                repository.save(Player(f"Iterated{i}"))
+            with pytest.raises(ValidationError):
+                repository.iter_players(["password_hash"])
+
+            key = ("player", "iter_players")
+            before = REPOSITORY_CALL_SECONDS.collect().get(key, [0.0])[-1]
+            for _ in repository.iter_players(["name"], batch_size=1):
+                time.sleep(0.01)
+            assert REPOSITORY_CALL_SECONDS.collect()[key][-1] - before >= 0.03
+        finally:
+            os.unlink(path)
+
+    def test_sharded_metrics_must_merge(self):
+        """Test the shard merge is abstract"""
+        with pytest.raises(TypeError):
+            _ShardedMetric("test_abstract", "Abstract")
+
+    def test_route_label(self):
+        """Test dynamic paths map to templates and unknown paths collapse"""
+        assert route_label("/api/status?x=1", 200) == "/api/status"
+        assert route_label("/api/player/Alice", 200) == "/api/player/{name}"
+        assert route_label("/admin/api/players/abc/ban", 401) == "/admin/api/players/{id}/{action}"
+        assert route_label("/admin/api/players/bulk-ban", 200) == "/admin/api/players/bulk-ban"
+        assert route_label("/admin/api/players/whatever", 401) == "unmatched"
+        assert route_label("/nope", 404) == "unmatched"
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint"""
+
+    @pytest.fixture
+    def server(self, request):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.game.rate_limiting_enabled = False
+        config.monitoring.metrics_enabled = True
+        config.monitoring.metrics_token = getattr(request, "param", "scrape-secret")
+
+        web_server = WebServer(config)
+        httpd = HTTPServer(("127.0.0.1", 0), web_server.handler_class)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd.server_address[1]
+        httpd.shutdown()
+        httpd.server_close()
+        web_server.game_api.shutdown()
+        os.unlink(path)
+
+    def _get(self, port, path, token=None):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", path, headers={"Authorization": f"Bearer {token}"} if token else {})
+        response = connection.getresponse()
+        body = response.read().decode()
+        connection.close()
+        return response.status, body
+
+    def test_requests_are_recorded(self, server):
+        """Test request metrics appear after requests are served"""
+        before = REGISTRY.get("nexus_http_requests_total").collect().get(("GET", "/api/status", "200"), 0)
+        self._get(server, "/api/status")
+        self._get(server, "/api/status")
+
+        status, body = self._get(server, "/metrics", "scrape-secret")
+
+        assert status == 200
+        assert f'nexus_http_requests_total{{method="GET",route="/api/status",status="200"}} {int(before) + 2}' in body
+        assert 'nexus_http_request_duration_seconds_count{method="GET",route="/api/status"}' in body
+        assert "nexus_admin_sessions 0" in body
+
+    def test_token_required(self, server):
+        """Test scrapes need the configured token"""
+        assert self._get(server, "/metrics")[0] == 401
+        assert self._get(server, "/metrics", "wrong")[0] == 401
+
+    @pytest.mark.parametrize("server", [""], indirect=True)
+    def test_not_served_without_token(self, server):
+        """Test enabling metrics without a token does not open /metrics"""
+        assert self._get(server, "/metrics")[0] == 404
+
+    def test_disabled_by_default(self):
+        """Test metrics are off unless enabled"""
+        assert NexusConfig().monitoring.metrics_enabled is False
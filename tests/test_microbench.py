@@ -0,0 +1,45 @@
+"""
+Tests for the microbenchmark runner's timing and regression gate
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import microbench
+
+class TestMicrobench:
+    """Test cases for time_case and compare"""
+
+    def test_time_case_calibrates_rounds(self):
+        """Test the loop count grows until a round reaches the minimum time"""
+        calls = []
+        result = microbench.time_case(microbench.Case("noop", lambda: calls.append(1), ops=2), rounds=3, min_time=0.01)
+
+        assert result["loops"] > 1 and result["rounds"] == 3
+        assert len(calls) >= result["loops"] * 3
+        assert 0 < result["min_ns"] <= result["median_ns"]
+
+    def test_compare_flags_regressions(self, capsys):
+        """Test only slowdowns beyond the threshold are regressions"""
+        baseline = {"fast": {"median_ns": 100.0}, "slow": {"median_ns": 100.0}}
+        results = {"fast": {"median_ns": 105.0}, "slow": {"median_ns": 125.0}, "added": {"median_ns": 50.0}}
+
+        assert microbench.compare(baseline, results, threshold=0.10) == ["slow"]
+        output = capsys.readouterr().out
+        assert "REGRESSION" in output and "new" in output
+
+    def test_nexus_script_cases_count_operations(self):
+        """Test lexer and parser cases report per-token and per-statement costs"""
+        cases = {case.name: case for case in microbench.benchmark_nexus_script()}
+        statements = len(microbench.Parser(microbench.Lexer(microbench.SCRIPT)).parse_program().statements)
+        assert cases["parser.parse_program[per statement]"].ops == statements > 0
+        assert cases["lexer.tokenize[per token]"].ops > statements
+
+    def test_command_cases_time_successful_commands(self):
+        """Test every command case runs its command successfully rather than an error path"""
+        cases = {case.name: case for case in microbench.benchmark_commands()}
+
+        assert {"command.execute[ls]", "command.execute[scan]", "command.execute[hashcrack]"} <= set(cases)
+        for name, case in cases.items():
+            assert case.fn().success, name
@@ -0,0 +1,120 @@
+"""
+Tests for player name search
+"""
+
+import pytest
+import tempfile
+import os
+import random
+import sqlite3
+from src.models.player import Player
+from src.repositories.name_index import NgramIndex
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+
+class TestNgramIndex:
+    """Test cases for the in-memory n-gram index"""
+
+    def test_substring_and_prefix_search(self):
+        """Test substring, short prefix and ranking"""
+        index = NgramIndex(entries=[("1", "Shadow"), ("2", "Shadowfax"), ("3", "DarkShadow"), ("4", "Sha")])
+
+        assert [name for _, name in index.search("shadow")] == ["Shadow", "Shadowfax", "DarkShadow"]
+        assert [name for _, name in index.search("sh")] == ["Sha", "Shadow", "Shadowfax"]
+        assert index.search("shadow", limit=1) == [("1", "Shadow")]
+        # Trigrams present but not adjacent
+        assert index.search("hadark") == []
+
+    def test_rename_and_remove(self):
+        """Test renamed and removed players leave the index"""
+        index = NgramIndex(entries=[("1", "Alpha")])
+        index.add("1", "Bravo")
+
+        assert index.search("alp") == []
+        assert index.search("rav") == [("1", "Bravo")]
+        assert index.remove("1")
+        assert not index.remove("1")
+        assert index.search("br") == [] and len(index) == 0
+
+    def test_bulk_build_matches_incremental_adds(self):
+        """Test building from entries indexes the same as adding one by one, last name winning"""
+        rng = random.Random(5)
+        entries = [(str(rng.randrange(200)), "".join(rng.choice("abcde") for _ in range(rng.randint(1, 8))))
+                   for _ in range(400)]
+        built = NgramIndex(entries=entries)
+        added = NgramIndex()
+        for player_id, name in entries:
+            added.add(player_id, name)
+
+        assert built._names == added._names
+        assert built._postings == added._postings
+        assert built._sorted == added._sorted
+
+    def test_matches_linear_scan(self):
+        """Test random queries agree with checking every name"""
+        rng = random.Random(3)
+        names = {str(i): "".join(rng.choice("abcde") for _ in range(rng.randint(1, 8))) for i in range(300)}
+        index = NgramIndex(entries=names.items())
+
+        for _ in range(300):
+            query = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 4)))
+            found = {player_id for player_id, _ in index.search(query, limit=1000)}
+            if len(query) < 3:
+                expected = {i for i, name in names.items() if name.startswith(query)}
+            else:
+                expected = {i for i, name in names.items() if query in name}
+            assert found == expected
+
+class TestRepositoryNameSearch:
+    """Test cases for SQLitePlayerRepository.search_players"""
+
+    @pytest.fixture(params=["fts", "ngram"])
+    def repository(self, request, monkeypatch):
+        if request.param == "ngram":
+            monkeypatch.setattr(SQLitePlayerRepository, "_initialize_name_search", lambda self, conn: False)
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        repository = SQLitePlayerRepository(path)
+        for name in ["Shadow", "Shadowfax", "DarkShadow", "Sha", "Nova", "50%_off"]:
+            repository.save(Player(name))
+        yield repository
+        os.unlink(path)
+
+    def test_ranked_substring_search(self, repository):
+        """Test ranking, case folding and limits"""
+        assert [row["name"] for row in repository.search_players("SHADOW")] == ["Shadow", "Shadowfax", "DarkShadow"]
+        assert [row["name"] for row in repository.search_players("sh", limit=2)] == ["Sha", "Shadow"]
+        assert repository.search_players("%_o")[0]["name"] == "50%_off"
+        assert repository.search_players("") == []
+
+    def test_index_follows_updates(self, repository):
+        """Test renames, repeated saves and deletes keep the index current"""
+        player = repository.find_by_name("Nova")
+        player.name = "Supernova"
+        repository.save(player)
+        repository.save(player)
+
+        assert [row["name"] for row in repository.search_players("nova")] == ["Supernova"]
+        repository.delete(player.id)
+        assert repository.search_players("nova") == []
+
+    def test_query_players_search_uses_index(self, repository):
+        """Test the paged list filter matches the same names"""
+        rows, _ = repository.query_players(search="adow", sort="name")
+        assert [row["name"] for row in rows] == ["DarkShadow", "Shadow", "Shadowfax"]
+
+    def test_existing_players_indexed(self, repository):
+        """Test a repository opened on an existing database finds old players"""
+        reopened = SQLitePlayerRepository(repository.db_path)
+        assert [row["name"] for row in reopened.search_players("fax")] == ["Shadowfax"]
+
+    def test_fts_index_built_for_older_databases(self, repository):
+        """Test the FTS table is rebuilt from players that predate it"""
+        if not repository.fts_enabled:
+            pytest.skip("FTS5 trigram tokenizer not in use")
+        with sqlite3.connect(repository.db_path) as conn:
+            conn.execute("DROP TABLE players_fts")
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER players_fts_{trigger}")
+
+        reopened = SQLitePlayerRepository(repository.db_path)
+        assert [row["name"] for row in reopened.search_players("dark")] == ["DarkShadow"]
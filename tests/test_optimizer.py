@@ -0,0 +1,66 @@
+import pickle
+import unittest
+from src.player import Player
+from src.nexus_script.evaluator import Evaluator
+from src.nexus_script.lexer import Lexer
+from src.nexus_script.parser import Parser
+from src.nexus_script.optimizer import Optimizer
+from src.nexus_script.themes import THEMES
+from src.nexus_script.ast import (
+    Builtin,
+    CallExpression,
+    ExpressionStatement,
+    SetStatement,
+    StringLiteral,
+)
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.player = Player("TestPlayer")
+        self.evaluator = Evaluator(self.player, THEMES)
+
+    def _compile(self, source, keep_globals=True):
+        program = Parser(Lexer(source)).parse_program()
+        return self.evaluator.compile(program, keep_globals)
+
+    def test_builtins_resolved_at_compile_time(self):
+        program = self._compile("shop()")
+        call = program.statements[0].expression
+        self.assertIsInstance(call, CallExpression)
+        self.assertIsInstance(call.function, Builtin)
+        self.assertIn("--- Hardware Shop ---", self.evaluator.eval(program))
+
+    def test_constants_propagated_into_calls(self):
+        program = self._compile('set $t = "retro" set-theme($t)')
+        argument = program.statements[-1].expression.arguments[0]
+        self.assertIsInstance(argument, StringLiteral)
+        self.assertEqual(argument.value, "retro")
+        self.evaluator.eval(program)
+        self.assertEqual(self.player.vc_state.theme, "retro")
+
+    def test_overwritten_store_dropped(self):
+        program = self._compile('set $a = "x" set $a = "y" set-prompt($a)')
+        sets = [s for s in program.statements if isinstance(s, SetStatement)]
+        self.assertEqual(len(sets), 1)
+        self.assertEqual(sets[0].value.value, "y")
+
+    def test_unread_store_kept_for_later_runs(self):
+        program = self._compile('set $a = "x" ls')
+        self.assertIsInstance(program.statements[0], SetStatement)
+
+    def test_unread_store_dropped_without_globals(self):
+        program = self._compile('set $a = "x" set $b = shop() ls', keep_globals=False)
+        self.assertEqual(len(program.statements), 2)
+        # The call is kept for its side effects, only the store goes away
+        self.assertIsInstance(program.statements[0], ExpressionStatement)
+
+    def test_compiled_program_shared_between_evaluators(self):
+        optimizer = Optimizer(self.evaluator.builtins)
+        program = optimizer.optimize(Parser(Lexer('set-prompt("x> ")')).parse_program())
+        other = Player("Other")
+        Evaluator(other, THEMES).eval(pickle.loads(pickle.dumps(program)))
+        self.assertEqual(other.vc_state.prompt_format, "x> ")
+        self.assertEqual(self.player.vc_state.prompt_format, "{user}@nexus-root> ")
+
+if __name__ == '__main__':
+    unittest.main()
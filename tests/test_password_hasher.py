@@ -0,0 +1,130 @@
+"""
+Tests for password hashing
+"""
+
+import pytest
+import hashlib
+import sqlite3
+import tempfile
+import os
+import threading
+import time
+import uuid
+from src.core.exceptions import AuthenticationError
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.models.player import Player
+from src.services.auth_service import AuthService
+from src.services.admin_auth_service import AdminAuthService
+from src.services.session_store import SessionStore
+from src.services.password_hasher import PasswordHasher
+
+# Low cost parameters keep the tests fast
+FAST_SCRYPT = dict(scrypt_n=2 ** 10)
+
+class TestPasswordHasher:
+    """Test cases for PasswordHasher"""
+
+    @pytest.mark.parametrize("algorithm", ["scrypt", "pbkdf2_sha256"])
+    def test_hash_and_verify(self, algorithm):
+        """Test salted hashes verify only the right password"""
+        hasher = PasswordHasher(algorithm, pbkdf2_iterations=1000, **FAST_SCRYPT)
+        first = hasher.hash_password("password123")
+        second = hasher.hash_password("password123")
+
+        assert first.startswith(algorithm + "$")
+        assert first != second
+        assert hasher.verify_password("password123", first)
+        assert not hasher.verify_password("password124", first)
+        assert not hasher.needs_rehash(first)
+
+    def test_concurrent_hashes_limited_to_workers(self):
+        """Test no more than `workers` hashes run at once"""
+        hasher = PasswordHasher(workers=2, **FAST_SCRYPT)
+        lock = threading.Lock()
+        running = [0, 0]
+        original_hash = hasher.hash
+
+        def tracked_hash(password):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return original_hash(password)
+
+        hasher.hash = tracked_hash
+        threads = [threading.Thread(target=hasher.hash_password, args=("password123",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert running[1] == 2
+
+    def test_legacy_sha256_verifies_and_needs_rehash(self):
+        """Test unsalted SHA-256 hashes still verify but are flagged"""
+        hasher = PasswordHasher(**FAST_SCRYPT)
+        legacy = hashlib.sha256(b"password123").hexdigest()
+
+        assert hasher.verify("password123", legacy)
+        assert not hasher.verify("wrong", legacy)
+        assert hasher.needs_rehash(legacy)
+
+    def test_cost_change_needs_rehash(self):
+        """Test hashes with old parameters verify and are flagged"""
+        old = PasswordHasher(scrypt_n=2 ** 10).hash("password123")
+        hasher = PasswordHasher(scrypt_n=2 ** 11)
+
+        assert hasher.verify("password123", old)
+        assert hasher.needs_rehash(old)
+
+    def test_malformed_hash_rejected(self):
+        """Test malformed or unknown hashes do not verify"""
+        hasher = PasswordHasher(**FAST_SCRYPT)
+        for encoded in ["", "scrypt$1$2", "scrypt$x$8$1$aa$bb", "bcrypt$12$abc"]:
+            assert not hasher.verify("password123", encoded)
+
+class TestRehashOnLogin:
+    """Test cases for transparent rehashing of legacy hashes"""
+
+    @pytest.fixture
+    def temp_db(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield path
+        os.unlink(path)
+
+    def test_player_legacy_hash_upgraded(self, temp_db):
+        """Test a player with a SHA-256 hash can log in and is rehashed"""
+        repository = SQLitePlayerRepository(temp_db)
+        player = Player(name="Alice")
+        player.password_hash = hashlib.sha256(b"password123").hexdigest()
+        repository.save(player)
+        auth_service = AuthService(temp_db, repository, password_hasher=PasswordHasher(**FAST_SCRYPT))
+
+        auth_service.login("Alice", "password123")
+
+        upgraded = repository.find_by_name("Alice").password_hash
+        assert upgraded.startswith("scrypt$")
+        assert auth_service.login("Alice", "password123")
+        with pytest.raises(AuthenticationError):
+            auth_service.login("Alice", "wrong-password")
+
+    def test_admin_legacy_hash_upgraded(self, temp_db):
+        """Test an admin with a SHA-256 hash can log in and is rehashed"""
+        SQLitePlayerRepository(temp_db)
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute(
+                "INSERT INTO admin_users (id, username, password_hash) VALUES (?, ?, ?)",
+                (str(uuid.uuid4()), "admin", hashlib.sha256(b"admin-password").hexdigest())
+            )
+            conn.commit()
+        auth = AdminAuthService(temp_db, SessionStore(temp_db), PasswordHasher(**FAST_SCRYPT))
+
+        assert auth.is_authenticated(auth.authenticate("admin", "admin-password"))
+
+        with sqlite3.connect(temp_db) as conn:
+            stored = conn.execute("SELECT password_hash FROM admin_users").fetchone()[0]
+        assert stored.startswith("scrypt$")
+        assert auth.authenticate("admin", "admin-password")
@@ -0,0 +1,142 @@
+"""
+Tests for player moderation state
+"""
+
+import pytest
+import tempfile
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from src.core.exceptions import AuthenticationError, ValidationError
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.admin_service import AdminService
+from src.services.auth_service import AuthService
+from src.services.player_ban_list import PlayerBanList
+
+class TestPlayerBanList:
+    """Test cases for PlayerBanList"""
+
+    def test_ban_expiry_and_unban(self):
+        """Test permanent and timed bans"""
+        now = datetime(2024, 1, 1, 12, 0)
+        ban_list = PlayerBanList([("p1", None), ("p2", now + timedelta(minutes=5))])
+
+        assert ban_list.is_banned("p1", now)
+        assert ban_list.is_banned("p2", now)
+        assert not ban_list.is_banned("p2", now + timedelta(minutes=5))
+        assert not ban_list.is_banned("p3", now)
+        assert len(ban_list) == 1
+
+        assert ban_list.unban("p1")
+        assert not ban_list.unban("p1")
+
+class TestPlayerBans:
+    """Test cases for bans through the services"""
+
+    @pytest.fixture
+    def services(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        repository = SQLitePlayerRepository(path)
+        ban_list = PlayerBanList()
+        auth_service = AuthService(path, repository, player_ban_list=ban_list)
+        admin_service = AdminService(repository, player_ban_list=ban_list)
+        for name in ["Alice", "Bob", "Carol"]:
+            auth_service.register(name, "password123")
+        yield repository, auth_service, admin_service
+        os.unlink(path)
+
+    def test_ban_duration_must_be_positive(self, services):
+        """Test a zero or negative duration is rejected instead of banning permanently"""
+        repository, _, admin_service = services
+        alice = repository.find_by_name("Alice")
+
+        for duration in (0, -5, "soon"):
+            with pytest.raises(ValidationError):
+                admin_service.ban_player(alice.id, duration_minutes=duration)
+            with pytest.raises(ValidationError):
+                admin_service.ban_players([alice.id], duration_minutes=duration)
+        assert not repository.find_by_name("Alice").banned
+
+        assert admin_service.ban_players([alice.id], duration_minutes=None)["succeeded"] == 1
+        alice = repository.find_by_name("Alice")
+        assert alice.banned and alice.ban_expires_at is None
+
+    def test_saving_a_stale_player_keeps_the_ban(self, services):
+        """Test a player loaded before a ban cannot unban itself by being saved"""
+        repository, _, admin_service = services
+        stale = repository.find_by_name("Alice")
+        assert admin_service.ban_player(stale.id, "spamming")[0]
+
+        stale.stats.credits = 42
+        repository.save(stale)
+
+        alice = repository.find_by_name("Alice")
+        assert alice.banned and alice.ban_reason == "spamming"
+        assert alice.stats.credits == 42
+        assert repository.find_banned()[0]["name"] == "Alice"
+
+    def test_ban_persists_and_lists(self, services):
+        """Test bans are stored in columns and JSON and listed as projections"""
+        repository, _, admin_service = services
+        alice = repository.find_by_name("Alice")
+
+        assert admin_service.ban_player(alice.id, "spamming")[0]
+        assert admin_service.ban_player(repository.find_by_name("Bob").id, duration_minutes=30)[0]
+        assert not admin_service.ban_player("missing")[0]
+
+        banned = admin_service.get_banned_players()
+        assert [(row["name"], row["ban_reason"]) for row in banned] == [("Alice", "spamming"), ("Bob", None)]
+        assert banned[1]["ban_expires_at"] is not None
+
+        reloaded = repository.find_by_name("Alice")
+        assert reloaded.is_banned() and reloaded.ban_reason == "spamming"
+        # Saving a loaded player keeps its moderation state
+        repository.save(reloaded)
+        assert len(repository.find_banned()) == 2
+
+    def test_ban_ends_existing_sessions(self, services):
+        """Test tokens stop verifying once the player is banned"""
+        repository, auth_service, admin_service = services
+        token = auth_service.login("Alice", "password123")
+        alice_id = auth_service.verify_token(token)["pid"]
+
+        admin_service.ban_player(alice_id, "cheating")
+        with pytest.raises(AuthenticationError, match="banned"):
+            auth_service.verify_token(token)
+        with pytest.raises(AuthenticationError, match="cheating"):
+            auth_service.login("Alice", "password123")
+
+        assert admin_service.unban_player(alice_id)[0]
+        assert not admin_service.unban_player(alice_id)[0]
+        assert auth_service.verify_token(token)["name"] == "Alice"
+
+    def test_expired_ban_allows_login(self, services):
+        """Test a ban past its expiry no longer blocks login or lists"""
+        repository, auth_service, _ = services
+        alice = repository.find_by_name("Alice")
+        repository.set_ban(alice.id, True, "timeout", datetime.now() - timedelta(minutes=1))
+
+        assert repository.find_banned() == []
+        assert auth_service.login("Alice", "password123")
+
+    def test_bans_loaded_on_startup(self, services):
+        """Test a new service loads bans from the database"""
+        repository, auth_service, admin_service = services
+        token = auth_service.login("Carol", "password123")
+        admin_service.ban_player(repository.find_by_name("Carol").id)
+
+        restarted = AuthService(repository.db_path, SQLitePlayerRepository(repository.db_path),
+                                auth_service.token_service)
+        with pytest.raises(AuthenticationError):
+            restarted.verify_token(token)
+
+    def test_ban_list_uses_partial_index(self, services):
+        """Test the ban list query reads the partial index"""
+        repository = services[0]
+        with sqlite3.connect(repository.db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM players WHERE banned = 1 AND "
+                "(ban_expires_at IS NULL OR ban_expires_at > ?)", ("2024-01-01",)
+            ).fetchall()
+        assert "idx_players_banned" in " ".join(str(step) for step in plan)
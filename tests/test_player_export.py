@@ -0,0 +1,125 @@
+"""
+Tests for streaming player exports
+"""
+
+import pytest
+import json
+import csv
+import io
+import tempfile
+import os
+import sqlite3
+import threading
+import http.client
+from http.server import HTTPServer
+from src.core.config import NexusConfig
+from src.core.exceptions import ValidationError
+from src.models.player import Player
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.server.web_server import WebServer
+from src.services.admin_service import AdminService
+from src.services.password_hasher import PasswordHasher
+
+class TestPlayerExport:
+    """Test cases for AdminService.export_players"""
+
+    @pytest.fixture
+    def admin_service(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        repository = SQLitePlayerRepository(path)
+        for i in range(25):
+            player = Player(f"Player_{i:02d}")
+            player.stats.credits = i
+            repository.save(player)
+        yield AdminService(repository)
+        os.unlink(path)
+
+    def test_ndjson_streams_in_batches(self, admin_service):
+        """Test each chunk holds one batch of rows"""
+        content_type, chunks = admin_service.export_players("ndjson", ["name", "credits"], batch_size=10)
+        chunks = list(chunks)
+
+        assert content_type == "application/x-ndjson"
+        assert [chunk.count("\n") for chunk in chunks] == [10, 10, 5]
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert rows[0] == {"name": "Player_00", "credits": 0}
+        assert len(rows) == 25
+
+    def test_csv_has_header_and_rows(self, admin_service):
+        """Test CSV output parses back to the players"""
+        content_type, chunks = admin_service.export_players("csv", ["id", "name", "is_vip"], batch_size=7)
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+        assert content_type == "text/csv"
+        assert len(rows) == 25
+        assert rows[3]["name"] == "Player_03" and rows[3]["is_vip"] == "False"
+
+    def test_invalid_export_rejected_before_streaming(self, admin_service):
+        """Test bad formats and fields fail when the export is requested"""
+        with pytest.raises(ValidationError):
+            admin_service.export_players("xml")
+        with pytest.raises(ValidationError):
+            admin_service.export_players("csv", ["password_hash"])
+
+class TestExportEndpoint:
+    """Test the chunked export endpoint"""
+
+    @pytest.fixture
+    def server(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.game.rate_limiting_enabled = False
+
+        web_server = WebServer(config)
+        with sqlite3.connect(path) as conn:
+            # More players than one export batch, inserted in one transaction
+            conn.executemany(
+                "INSERT INTO players (id, name, created_at, last_login, data) VALUES (?, ?, '', '', '{}')",
+                [(f"id-{i:04d}", f"Player_{i:04d}") for i in range(1500)]
+            )
+            conn.execute(
+                "INSERT INTO admin_users (id, username, password_hash) VALUES (?, ?, ?)",
+                ("admin-1", "admin", PasswordHasher().hash("admin-password"))
+            )
+        token = web_server.admin_auth_service.authenticate("admin", "admin-password")
+
+        httpd = HTTPServer(("127.0.0.1", 0), web_server.handler_class)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd.server_address[1], token
+        httpd.shutdown()
+        httpd.server_close()
+        web_server.game_api.shutdown()
+        os.unlink(path)
+
+    def _get(self, port, path, token):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_chunked_ndjson_export(self, server):
+        """Test the export is chunk-encoded and complete"""
+        port, token = server
+        response, body = self._get(port, "/admin/api/players/export?format=ndjson&fields=id,name", token)
+
+        assert response.status == 200
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        assert response.getheader("Content-Type").startswith("application/x-ndjson")
+        names = [json.loads(line)["name"] for line in body.decode().splitlines()]
+        assert len(names) == 1500 and names[-1] == "Player_1499"
+
+    def test_export_errors(self, server):
+        """Test bad parameters and missing auth"""
+        port, token = server
+        response, body = self._get(port, "/admin/api/players/export?format=xml", token)
+        assert response.status == 400
+        assert not json.loads(body)["success"]
+
+        response, _ = self._get(port, "/admin/api/players/export", "wrong-token")
+        assert response.status == 401
@@ -0,0 +1,120 @@
+"""
+Tests for paged player queries
+"""
+
+import pytest
+import tempfile
+import os
+import json
+import sqlite3
+from src.core.exceptions import ValidationError
+from src.models.player import Player
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.admin_service import AdminService
+from src.api.admin_api import AdminAPI
+
+class TestPlayerQuery:
+    """Test cases for SQLitePlayerRepository.query_players"""
+
+    @pytest.fixture
+    def temp_db(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield path
+        os.unlink(path)
+
+    @pytest.fixture
+    def repository(self, temp_db):
+        repository = SQLitePlayerRepository(temp_db)
+        for i in range(25):
+            player = Player(f"Player_{i:02d}")
+            player.stats.level = i % 5 + 1
+            player.stats.credits = i * 10
+            repository.save(player)
+        return repository
+
+    def _all_pages(self, repository, **kwargs):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page, cursor = repository.query_players(cursor=cursor, **kwargs)
+            rows.extend(page)
+            pages += 1
+            if cursor is None:
+                return rows, pages
+
+    def test_keyset_pages_cover_all_rows(self, repository):
+        """Test paging by a non-unique column visits every player once"""
+        rows, pages = self._all_pages(repository, sort="level", limit=4)
+
+        assert pages == 7
+        assert len({row["id"] for row in rows}) == 25
+        assert [row["level"] for row in rows] == sorted(row["level"] for row in rows)
+
+    def test_descending_order(self, repository):
+        """Test descending pages continue from the cursor"""
+        rows, _ = self._all_pages(repository, sort="credits", order="desc", limit=10)
+        assert [row["credits"] for row in rows] == list(range(240, -10, -10))
+
+    def test_search_and_projection(self, repository):
+        """Test search filters by name and only listed fields are returned"""
+        repository.save(Player("under_score"))
+        rows, cursor = repository.query_players(search="_1", fields=["name", "is_vip"])
+
+        assert cursor is None
+        assert [row["name"] for row in rows] == [f"Player_1{i}" for i in range(10)]
+        assert rows[0] == {"name": "Player_10", "is_vip": False}
+        # LIKE wildcards in the search text are matched literally
+        assert repository.query_players(search="%")[0] == []
+
+    def test_stats_kept_in_sync(self, repository):
+        """Test saving a player updates its sort columns"""
+        player = repository.find_by_name("Player_00")
+        player.stats.credits = 9999
+        repository.save(player)
+
+        rows, _ = repository.query_players(sort="stats.credits", order="desc", limit=1)
+        assert rows[0]["name"] == "Player_00"
+
+    def test_invalid_arguments(self, repository):
+        """Test unknown sorts, fields and cursors are rejected"""
+        with pytest.raises(ValidationError):
+            repository.query_players(sort="password_hash")
+        with pytest.raises(ValidationError):
+            repository.query_players(order="sideways")
+        with pytest.raises(ValidationError):
+            repository.query_players(fields=["data"])
+        with pytest.raises(ValidationError):
+            repository.query_players(cursor="not-a-cursor")
+
+    def test_migration_backfills_stat_columns(self, temp_db):
+        """Test older databases gain the sort columns from player data"""
+        player = Player("Veteran")
+        player.stats.level = 7
+        player.stats.credits = 350
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("""
+                CREATE TABLE players (
+                    id TEXT PRIMARY KEY, name TEXT UNIQUE NOT NULL, is_vip BOOLEAN DEFAULT FALSE,
+                    session_id TEXT, created_at TEXT NOT NULL, last_login TEXT NOT NULL,
+                    is_online BOOLEAN DEFAULT FALSE, password_hash TEXT, data TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT INTO players (id, name, created_at, last_login, data) VALUES (?, ?, ?, ?, ?)",
+                (player.id, player.name, player.created_at.isoformat(), player.last_login.isoformat(),
+                 json.dumps(player.to_dict()))
+            )
+
+        rows, _ = SQLitePlayerRepository(temp_db).query_players(fields=["name", "level", "credits"])
+        assert rows == [{"name": "Veteran", "level": 7, "credits": 350}]
+
+    def test_admin_api_returns_next_cursor(self, repository):
+        """Test the admin API exposes the page cursor"""
+        admin_api = AdminAPI(None, AdminService(repository))
+
+        first = admin_api.get_all_players(sort="name", limit=20)
+        second = admin_api.get_all_players(sort="name", cursor=first["next_cursor"], limit=20)
+
+        assert first["success"] and len(first["data"]) == 20
+        assert len(second["data"]) == 5 and second["next_cursor"] is None
+        assert not admin_api.get_all_players(sort="bogus")["success"]
@@ -0,0 +1,44 @@
+import unittest
+from src.player import Player
+from src.nexus_script.executor import ScriptExecutor, IN_PROCESS, PROCESS_POOL
+from src.nexus_script.profiler import ScriptProfiler
+
+class TestScriptProfiler(unittest.TestCase):
+    def test_in_process_profile(self):
+        profiler = ScriptProfiler()
+        executor = ScriptExecutor(IN_PROCESS, profiler=profiler)
+        player = Player("TestPlayer")
+
+        for _ in range(3):
+            executor.execute(player, 'shop() set-prompt("p> ")', module="macro")
+
+        report = profiler.get_report()
+        self.assertEqual(report["players"][0]["player"], "TestPlayer")
+        self.assertEqual(report["players"][0]["runs"], 3)
+        self.assertGreater(report["players"][0]["instructions"], 0)
+        self.assertEqual(report["modules"][0]["module"], "macro")
+        self.assertEqual(len(report["modules"][0]["hot_statements"]), 2)
+
+        calls = {entry["function"]: entry["calls"] for entry in report["functions"]}
+        self.assertEqual(calls, {"shop": 3, "set-prompt": 3})
+
+    def test_process_pool_profile_merged(self):
+        profiler = ScriptProfiler()
+        executor = ScriptExecutor(PROCESS_POOL, max_workers=1, profiler=profiler)
+        try:
+            executor.execute(Player("Alice"), "shop()", timeout=30)
+            executor.execute(Player("Bob"), "shop()", timeout=30)
+        finally:
+            executor.shutdown()
+
+        report = profiler.get_report("Alice")
+        self.assertEqual([entry["player"] for entry in report["players"]], ["Alice"])
+        self.assertEqual(report["functions"][0]["calls"], 1)
+
+    def test_disabled_by_default(self):
+        executor = ScriptExecutor(IN_PROCESS)
+        result = executor.execute(Player("TestPlayer"), "shop()")
+        self.assertIsNone(result.profile)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Tests for the on-demand profilers
+"""
+
+import pytest
+import cProfile
+import json
+import tempfile
+import os
+import sqlite3
+import threading
+import time
+import http.client
+from http.server import HTTPServer
+from src.core.config import NexusConfig
+from src.core.profiling import SamplingProfiler, RequestProfiles, SAMPLING_PROFILER
+from src.server.web_server import CustomAPIHandler, WebServer
+from src.services.password_hasher import PasswordHasher
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+class TestSamplingProfiler:
+    """Test cases for SamplingProfiler"""
+
+    def test_collapsed_stacks(self):
+        """Test a busy thread shows up root-first in the collapsed output"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        profiler = SamplingProfiler()
+        try:
+            assert profiler.start(0.3, 0.005)
+            assert not profiler.start(0.3, 0.005)
+            while profiler.running:
+                time.sleep(0.02)
+        finally:
+            stop.set()
+            worker.join()
+
+        status = profiler.status()
+        assert not status["running"] and status["samples"] > 10
+        lines = profiler.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        assert busy and all("busy_loop (test_profiling.py:" in line for line in busy)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert not any(line.startswith("nexus-sampling-profiler;") for line in lines)
+
+    def test_limits_and_stop(self):
+        """Test bad durations are rejected and stop ends a session early"""
+        profiler = SamplingProfiler(max_duration=5)
+        with pytest.raises(ValueError):
+            profiler.start(10)
+        with pytest.raises(ValueError):
+            profiler.start(1, interval=0)
+
+        started = time.perf_counter()
+        profiler.start(5)
+        profiler.stop()
+        assert not profiler.running
+        assert time.perf_counter() - started < 1
+
+    def test_request_profiles(self):
+        """Test profiles are summarized and found by id"""
+        profiles = RequestProfiles(max_profiles=2)
+        for i in range(3):
+            profile = cProfile.Profile()
+            profile.enable()
+            sorted(range(1000), key=lambda x: -x)
+            profile.disable()
+            profiles.add(f"id-{i}", "GET", "/api/status?x=1", 1.5, profile)
+
+        assert [entry["id"] for entry in profiles.recent()] == ["id-2", "id-1"]
+        assert profiles.get("id-0") is None
+        entry = profiles.get("id-2")
+        assert entry["path"] == "/api/status"
+        assert any("sorted" in row["function"] for row in entry["functions"])
+
+    def test_one_request_profiled_at_a_time(self):
+        """Test a second profiler cannot start while one is active, on any thread"""
+        profiles = RequestProfiles()
+        first = profiles.start()
+        others = []
+        thread = threading.Thread(target=lambda: others.append(profiles.start()))
+        thread.start()
+        thread.join()
+        profiles.stop(first)
+
+        assert first is not None and others == [None]
+        second = profiles.start()
+        assert second is not None
+        profiles.stop(second)
+
+class TestProfilerEndpoints:
+    """Test the admin profiler endpoints on a live server"""
+
+    @pytest.fixture
+    def server(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.game.rate_limiting_enabled = False
+
+        web_server = WebServer(config)
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "INSERT INTO admin_users (id, username, password_hash) VALUES (?, ?, ?)",
+                ("admin-1", "admin", PasswordHasher().hash("admin-password"))
+            )
+        token = web_server.admin_auth_service.authenticate("admin", "admin-password")
+
+        httpd = HTTPServer(("127.0.0.1", 0), web_server.handler_class)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd.server_address[1], token
+        SAMPLING_PROFILER.stop()
+        httpd.shutdown()
+        httpd.server_close()
+        web_server.game_api.shutdown()
+        os.unlink(path)
+
+    def _request(self, port, method, path, token=None, body=None, headers=None):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(body)
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        connection.close()
+        return response, data
+
+    def test_sampling_session(self, server):
+        """Test starting, conflicting, stopping and reading a session"""
+        port, token = server
+        response, _ = self._request(port, "POST", "/admin/api/profiler/start", body={"seconds": 5})
+        assert response.status == 401
+
+        response, body = self._request(port, "POST", "/admin/api/profiler/start", token, {"seconds": 5, "interval_ms": 5})
+        assert response.status == 200 and json.loads(body)["data"]["running"]
+        response, _ = self._request(port, "POST", "/admin/api/profiler/start", token, {"seconds": 5})
+        assert response.status == 409
+        for _ in range(5):
+            self._request(port, "GET", "/api/status")
+
+        response, body = self._request(port, "POST", "/admin/api/profiler/stop", token, {})
+        assert not json.loads(body)["data"]["running"]
+        response, body = self._request(port, "GET", "/admin/api/profiler?format=collapsed", token)
+        assert response.getheader("Content-Type").startswith("text/plain")
+        assert "serve_forever" in body.decode()
+
+        response, _ = self._request(port, "POST", "/admin/api/profiler/start", token, {"seconds": 3600})
+        assert response.status == 400
+
+    def test_request_profile_header(self, server):
+        """Test an admin token in X-Nexus-Profile profiles just that request"""
+        port, token = server
+        response, _ = self._request(port, "GET", "/api/status", headers={"X-Nexus-Profile": "not-a-token"})
+        assert response.getheader("X-Nexus-Profile-Id") is None
+
+        response, _ = self._request(port, "GET", "/api/status", headers={"X-Nexus-Profile": token})
+        profile_id = response.getheader("X-Nexus-Profile-Id")
+        assert profile_id
+
+        response, body = self._request(port, "GET", f"/admin/api/profiler/requests?id={profile_id}", token)
+        profile = json.loads(body)["data"]
+        assert profile["path"] == "/api/status" and profile["functions"]
+        response, body = self._request(port, "GET", "/admin/api/profiler/requests", token)
+        assert profile_id in [entry["id"] for entry in json.loads(body)["data"]]
+
+    def test_request_profile_stopped_when_request_fails(self, server, monkeypatch):
+        """Test the request profiler is disabled even if handling the request raises"""
+        port, token = server
+        profiles = []
+
+        class TrackedProfile(cProfile.Profile):
+            def __init__(self):
+                super().__init__()
+                self.enabled = False
+                profiles.append(self)
+
+            def enable(self):
+                self.enabled = True
+                super().enable()
+
+            def disable(self):
+                self.enabled = False
+                super().disable()
+
+        def client_went_away(handler):
+            raise ConnectionResetError("client went away")
+
+        monkeypatch.setattr(cProfile, "Profile", TrackedProfile)
+        monkeypatch.setattr(CustomAPIHandler, "do_GET", client_went_away)
+        with pytest.raises((http.client.HTTPException, OSError)):
+            self._request(port, "GET", "/api/status", headers={"X-Nexus-Profile": token})
+
+        assert len(profiles) == 1 and not profiles[0].enabled
@@ -0,0 +1,131 @@
+"""
+Tests for repository query statistics
+"""
+
+import pytest
+import tempfile
+import os
+import sqlite3
+import time
+from src.models.player import Player
+from src.repositories.query_log import QUERY_LOG, QueryLog, connect, is_full_scan, normalize_sql
+from src.repositories.sqlite_mission_repository import SQLiteMissionRepository
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+
+class TestQueryLog:
+    """Test cases for QueryLog"""
+
+    def test_normalize_sql(self):
+        """Test whitespace and placeholder lists do not split statements"""
+        assert normalize_sql("SELECT *\n    FROM players\n  WHERE id = ?") == "SELECT * FROM players WHERE id = ?"
+        assert normalize_sql("WHERE id IN (?, ?,?)") == normalize_sql("WHERE id IN (?, ?)") == "WHERE id IN (?, ...)"
+
+    def test_aggregates(self):
+        """Test count, total, max and p95 per statement"""
+        log = QueryLog(slow_query_ms=1000)
+        for ms in range(1, 101):
+            log.record("SELECT 1", float(ms))
+        log.record("SELECT 2", 5.0)
+
+        first, second = log.get_stats()
+        assert first["sql"] == "SELECT 1"
+        assert first["count"] == 100 and first["total_ms"] == 5050.0
+        assert first["max_ms"] == 100.0 and first["p95_ms"] == 96.0
+        assert first["slow_count"] == 0 and first["plan"] is None
+        assert second["avg_ms"] == 5.0
+        assert log.get_stats(sort="avg_ms", limit=1)[0]["sql"] == "SELECT 1"
+
+    def test_statement_limit(self):
+        """Test statements past the limit share the overflow entry"""
+        log = QueryLog()
+        log.MAX_STATEMENTS = 2
+        for i in range(5):
+            log.record(f"SELECT {i}", 1.0)
+        assert sorted(row["sql"] for row in log.get_stats()) == ["(other statements)", "SELECT 0", "SELECT 1"]
+
+    def test_slow_query_plan_captured(self):
+        """Test slow statements get their query plan and scan flag"""
+        log = QueryLog(slow_query_ms=0)
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("CREATE INDEX idx_t_name ON t(name)")
+
+        log.record("SELECT * FROM t WHERE name LIKE ?", 5.0, conn, ("%a%",))
+        log.record("SELECT * FROM t WHERE name = ?", 5.0, conn, ("a",))
+        plans = {row["sql"]: row for row in log.get_stats()}
+
+        assert plans["SELECT * FROM t WHERE name LIKE ?"]["full_scan"]
+        assert not plans["SELECT * FROM t WHERE name = ?"]["full_scan"]
+        assert plans["SELECT * FROM t WHERE name = ?"]["slow_count"] == 1
+        assert is_full_scan(["SCAN t"]) and not is_full_scan(["SCAN t USING COVERING INDEX idx_t_name"])
+
+class TestRepositoryQueryLogging:
+    """Test statements issued by the repositories are recorded"""
+
+    @pytest.fixture
+    def db_path(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        QUERY_LOG.reset()
+        yield path
+        QUERY_LOG.configure(100.0, True)
+        QUERY_LOG.reset()
+        os.unlink(path)
+
+    def test_connection_records_statements(self, db_path):
+        """Test both the connection and cursor execute paths are timed"""
+        with connect(db_path) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS t (id INTEGER)")
+            conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+            conn.cursor().execute("SELECT id FROM t").fetchall()
+
+        counts = {row["sql"]: row["count"] for row in QUERY_LOG.get_stats(limit=100)}
+        assert counts["INSERT INTO t VALUES (?)"] == 1
+        assert counts["SELECT id FROM t"] == 1
+
+    def test_large_scan_timed_through_fetch(self, db_path):
+        """Test a SELECT is recorded once its rows are fetched, with the fetch time included"""
+        with connect(db_path) as conn:
+            conn.execute("CREATE TABLE big (id INTEGER PRIMARY KEY, payload TEXT)")
+            conn.executemany("INSERT INTO big (payload) VALUES (?)", [("x" * 50,) for _ in range(50000)])
+            # Each row is computed as it is fetched, so the rows cost at least 50 ms to read
+            conn.create_function("slow", 1, lambda value: time.sleep(0.001) or value)
+            sql = "SELECT id, slow(payload) FROM big WHERE id % 1000 = 0"
+
+            cursor = conn.execute(sql)
+            cursor.fetchone()
+            assert sql not in {row["sql"] for row in QUERY_LOG.get_stats(limit=100)}
+            for _ in cursor:
+                pass
+
+            stats = {row["sql"]: row for row in QUERY_LOG.get_stats(limit=100)}
+            assert stats[sql]["count"] == 1
+            assert stats[sql]["total_ms"] >= 50
+
+            # Cursors dropped before their last row are still recorded
+            conn.execute("SELECT id FROM big").fetchone()
+            assert {row["sql"]: row["count"] for row in QUERY_LOG.get_stats(limit=100)}["SELECT id FROM big"] == 1
+
+    def test_repository_statements_aggregate(self, db_path):
+        """Test repository lookups and cleanups share one entry per statement"""
+        players = SQLitePlayerRepository(db_path)
+        missions = SQLiteMissionRepository(db_path)
+        QUERY_LOG.reset()
+        players.save(Player("Alice"))
+        players.find_by_name("Alice")
+        players.find_by_name("Bob")
+        missions.cleanup_old_missions(30)
+        missions.cleanup_old_missions(7)
+        players.cleanup_old_sessions(24)
+
+        stats = QUERY_LOG.get_stats(limit=100)
+        lookups = [row for row in stats if row["sql"].startswith("SELECT data FROM players WHERE name")]
+        cleanups = [row for row in stats if row["sql"].startswith("DELETE FROM missions")]
+        assert [row["count"] for row in lookups] == [2]
+        assert [row["count"] for row in cleanups] == [2]
+
+    def test_disabled_records_nothing(self, db_path):
+        """Test a disabled log leaves statements untimed"""
+        QUERY_LOG.configure(100.0, False)
+        SQLitePlayerRepository(db_path).find_by_name("Nobody")
+        assert QUERY_LOG.get_stats() == []
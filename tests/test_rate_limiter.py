@@ -0,0 +1,165 @@
+"""
+Tests for request rate limiting
+"""
+
+import pytest
+import json
+import tempfile
+import os
+import threading
+import http.client
+from http.server import HTTPServer
+from src.core.config import NexusConfig, GameConfig
+from src.core.exceptions import ConfigurationError
+from src.server.web_server import WebServer
+from src.services import rate_limiter as rate_limiter_module
+from src.services.rate_limiter import RateLimiter, classify_route
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+class TestRateLimiter:
+    """Test cases for RateLimiter"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter_module, "time", clock)
+        return clock
+
+    def test_burst_then_refill(self, clock):
+        """Test a bucket allows its burst and refills lazily"""
+        limiter = RateLimiter({"read": [2, 3]})
+
+        assert [limiter.check_request("read", "1.2.3.4") for _ in range(3)] == [0, 0, 0]
+        assert limiter.check_request("read", "1.2.3.4") == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert limiter.check_request("read", "1.2.3.4") == 0
+        assert limiter.check_request("read", "1.2.3.4") > 0
+
+    def test_player_and_ip_buckets(self, clock):
+        """Test players get their own bucket and VIPs their own limits"""
+        limiter = RateLimiter({"command": [1, 1], "read": [1, 1]}, {"command": [1, 3], "read": [1, 1]}, ip_multiplier=10)
+
+        assert limiter.check_request("command", "1.2.3.4", "free-player") == 0
+        assert limiter.check_request("command", "1.2.3.4", "free-player") > 0
+        # Another player behind the same address is unaffected
+        assert limiter.check_request("command", "1.2.3.4", "other-player") == 0
+
+        assert [limiter.check_request("command", "1.2.3.4", "vip", is_vip=True) for _ in range(3)] == [0, 0, 0]
+        assert limiter.check_request("command", "1.2.3.4", "vip", is_vip=True) > 0
+
+    def test_route_classes_are_separate(self, clock):
+        """Test exhausting one route class leaves others available"""
+        limiter = RateLimiter({"auth": [0.1, 1], "read": [1, 1]})
+
+        assert limiter.check_request("auth", "1.2.3.4") == 0
+        assert limiter.check_request("auth", "1.2.3.4") == pytest.approx(10)
+        assert limiter.check_request("read", "1.2.3.4") == 0
+
+    def test_idle_buckets_pruned(self, clock):
+        """Test full buckets are dropped once the table is over capacity"""
+        limiter = RateLimiter({"read": [1, 2]}, max_buckets=2)
+        limiter.check_request("read", "10.0.0.1")
+        limiter.check_request("read", "10.0.0.2")
+
+        clock.now += 5
+        limiter.check_request("read", "10.0.0.3")
+        assert len(limiter) == 1
+
+    def test_bucket_table_capped(self, clock):
+        """Test the least recently used bucket is evicted when none has refilled"""
+        limiter = RateLimiter({"read": [1, 10]}, max_buckets=3)
+        for ip in ["10.0.0.1", "10.0.0.2", "10.0.0.3"]:
+            limiter.check_request("read", ip)
+            clock.now += 1
+        # Touching .1 makes .2 the least recently used
+        limiter.check_request("read", "10.0.0.1")
+
+        limiter.check_request("read", "10.0.0.4")
+        assert len(limiter) == 3
+        assert ("ip", "10.0.0.2", "read") not in limiter._buckets
+        assert ("ip", "10.0.0.1", "read") in limiter._buckets
+
+    def test_classify_route(self):
+        """Test paths map to route classes"""
+        assert classify_route("/api/login") == "auth"
+        assert classify_route("/api/command/batch") == "command"
+        assert classify_route("/admin/api/players?search=a") == "admin"
+        assert classify_route("/api/leaderboard?limit=5") == "read"
+
+    def test_missing_route_classes(self, clock):
+        """Test omitted route classes use the read limits in code and the defaults from config"""
+        limiter = RateLimiter({"read": [1, 1]})
+        assert limiter.check_request("command", "1.2.3.4") == 0
+        assert limiter.check_request("command", "1.2.3.4") > 0
+
+        with pytest.raises(ConfigurationError):
+            RateLimiter({"command": [1, 1]})
+        with pytest.raises(ConfigurationError):
+            RateLimiter({"read": [1, 1], "reads": [1, 1]})
+
+        limiter = RateLimiter.from_config(GameConfig(rate_limits_free={"command": [1, 1]}, rate_limits_vip={}))
+        assert limiter.free_limits["command"] == (1.0, 1.0)
+        assert limiter.free_limits["read"] == tuple(map(float, GameConfig().rate_limits_free["read"]))
+        assert limiter.check_request("command", "1.2.3.4", "player") == 0
+        assert limiter.check_request("read", "1.2.3.4", "vip", is_vip=True) == 0
+
+    def test_disabled_from_config(self):
+        """Test no limiter is built when disabled"""
+        assert RateLimiter.from_config(GameConfig(rate_limiting_enabled=False)) is None
+        assert RateLimiter.from_config(GameConfig()) is not None
+
+class TestRateLimitedServer:
+    """Test 429 responses from the HTTP handler"""
+
+    @pytest.fixture
+    def server(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        config.game.rate_limits_free = {"auth": [0.01, 1], "command": [1, 1], "admin": [1, 1], "read": [1, 2]}
+        config.game.rate_limit_ip_multiplier = 1
+
+        web_server = WebServer(config)
+        httpd = HTTPServer(("127.0.0.1", 0), web_server.handler_class)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd.server_address[1]
+        httpd.shutdown()
+        httpd.server_close()
+        web_server.game_api.shutdown()
+        os.unlink(path)
+
+    def _request(self, port, method, path, body=None):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        result = response.status, response.getheader("Retry-After"), response.read()
+        connection.close()
+        return result
+
+    def test_429_with_retry_after(self, server):
+        """Test requests over the limit get 429 and Retry-After"""
+        assert self._request(server, "GET", "/api/status")[0] == 200
+        assert self._request(server, "GET", "/api/status")[0] == 200
+        status, retry_after, body = self._request(server, "GET", "/api/status")
+
+        assert status == 429
+        assert int(retry_after) >= 1
+        assert json.loads(body)["error"] == "Rate limit exceeded"
+
+    def test_auth_route_limited_separately(self, server):
+        """Test login attempts use the stricter auth limit"""
+        self._request(server, "POST", "/api/login", {"username": "x", "password": "y"})
+        status, retry_after, _ = self._request(server, "POST", "/api/login", {"username": "x", "password": "y"})
+
+        assert status == 429
+        assert int(retry_after) == 100
@@ -0,0 +1,80 @@
+import unittest
+from src.player import Player
+from src.nexus_script.executor import ScriptExecutor, IN_PROCESS, PROCESS_POOL
+from src.core.exceptions import ConfigurationError, ScriptExecutionError
+
+class TestScriptExecutor(unittest.TestCase):
+    def test_in_process_updates_player(self):
+        executor = ScriptExecutor(IN_PROCESS)
+        player = Player("TestPlayer")
+        result = executor.execute(player, 'set-theme("retro")')
+        self.assertEqual(player.vc_state.theme, "retro")
+        self.assertEqual(result.value, "Theme set to 'retro'.")
+
+    def test_in_process_keeps_variables_between_runs(self):
+        executor = ScriptExecutor(IN_PROCESS)
+        player = Player("TestPlayer")
+        executor.execute(player, 'set $theme = "cyberpunk"')
+        executor.execute(player, "set-theme($theme)")
+        self.assertEqual(player.vc_state.theme, "cyberpunk")
+
+    def test_environments_bounded(self):
+        executor = ScriptExecutor(IN_PROCESS, max_environments=2)
+        players = [Player(f"Player{i}") for i in range(3)]
+        for player in players:
+            executor.execute(player, "set $x = 1")
+        # Running again makes Player1 the most recent, so Player2 goes next
+        executor.execute(players[1], "set $y = 2")
+        executor.execute(players[0], "set $x = 1")
+        self.assertEqual(list(executor._environments), ["Player1", "Player0"])
+
+        self.assertTrue(executor.discard_environment("Player1"))
+        self.assertFalse(executor.discard_environment("Player1"))
+        self.assertEqual(list(executor._environments), ["Player0"])
+
+    def test_process_pool_merges_state_in_order(self):
+        executor = ScriptExecutor(PROCESS_POOL, max_workers=2)
+        try:
+            player = Player("TestPlayer")
+            player.vc_state.credits = 350
+            futures = [
+                executor.submit(player, 'buy("cpu")'),
+                executor.submit(player, 'buy("cpu")'),
+                executor.submit(player, 'set-prompt("pool> ")'),
+            ]
+            results = [future.result(timeout=30) for future in futures]
+
+            # Workers never touch the live player; the caller merges results
+            self.assertEqual(player.vc_state.cpu_tier, 1)
+            for result in results:
+                executor.apply_result(player, result)
+
+            self.assertIn("CPU Tier 2", results[0].value)
+            self.assertIn("CPU Tier 3", results[1].value)
+            self.assertEqual(results[0].state_delta, {"credits": 250, "cpu_tier": 2})
+            self.assertEqual(player.vc_state.cpu_tier, 3)
+            self.assertEqual(player.vc_state.credits, 0)
+            self.assertEqual(player.vc_state.prompt_format, "pool> ")
+        finally:
+            executor.shutdown()
+
+    def test_process_pool_execute_applies_result(self):
+        executor = ScriptExecutor(PROCESS_POOL, max_workers=1)
+        try:
+            player = Player("TestPlayer")
+            executor.execute(player, 'set-theme("retro")', timeout=30)
+            self.assertEqual(player.vc_state.theme, "retro")
+        finally:
+            executor.shutdown()
+
+    def test_parse_errors_raise(self):
+        executor = ScriptExecutor(IN_PROCESS)
+        with self.assertRaises(ScriptExecutionError):
+            executor.execute(Player("TestPlayer"), "set = 1")
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ConfigurationError):
+            ScriptExecutor("threads")
+
+if __name__ == '__main__':
+    unittest.main()
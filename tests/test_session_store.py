@@ -0,0 +1,107 @@
+"""
+Tests for the admin session store
+"""
+
+import pytest
+import sqlite3
+import tempfile
+import os
+import time
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.session_store import SessionStore
+from src.services.admin_auth_service import AdminAuthService
+
+class TestSessionStore:
+    """Test cases for SessionStore"""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create temporary database with the sessions table"""
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        SQLitePlayerRepository(path)
+        yield path
+        os.unlink(path)
+
+    def _expires_at(self, db_path, token):
+        with sqlite3.connect(db_path) as conn:
+            row = conn.execute("SELECT expires_at FROM sessions WHERE token = ?", (token,)).fetchone()
+        return row[0] if row else None
+
+    def test_validate_without_database(self, temp_db):
+        """Test validation is served from memory"""
+        store = SessionStore(temp_db)
+        token = store.create("admin-1")
+
+        store.db_path = os.path.join(temp_db, "missing", "nexus.db")
+        assert store.validate(token)
+        assert not store.validate("unknown")
+
+    def test_sliding_expiry_flushed_by_sweep(self, temp_db):
+        """Test validation extends expiry and the sweep persists it"""
+        store = SessionStore(temp_db, ttl_seconds=100)
+        token = store.create("admin-1")
+        created_expiry = self._expires_at(temp_db, token)
+
+        time.sleep(0.01)
+        assert store.validate(token)
+        assert self._expires_at(temp_db, token) == created_expiry
+
+        store.sweep()
+        assert self._expires_at(temp_db, token) > created_expiry
+
+    def test_expired_sessions_rejected_and_purged(self, temp_db):
+        """Test expired sessions fail validation and are purged in batches"""
+        store = SessionStore(temp_db, ttl_seconds=0, sweep_batch_size=2)
+        tokens = [store.create(f"admin-{i}") for i in range(5)]
+
+        assert not store.validate(tokens[0])
+        assert store.sweep() == 5
+        assert len(store) == 0
+        assert self._expires_at(temp_db, tokens[1]) is None
+
+    def test_load_only_admin_sessions(self, temp_db):
+        """Test loading restores admin sessions and ignores player sessions"""
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("INSERT INTO sessions (id, admin_id, token) VALUES ('1', 'admin-1', 'legacy-admin')")
+            conn.execute("INSERT INTO sessions (id, player_id, token) VALUES ('2', 'player-1', 'player-token')")
+            conn.commit()
+        store = SessionStore(temp_db)
+        live = store.create("admin-2")
+
+        reloaded = SessionStore(temp_db)
+        reloaded.load()
+
+        assert reloaded.validate(live)
+        assert reloaded.validate("legacy-admin")
+        assert not reloaded.validate("player-token")
+
+    def test_admin_logout_revokes(self, temp_db):
+        """Test logout removes the session from memory and the table"""
+        store = SessionStore(temp_db)
+        auth = AdminAuthService(temp_db, store)
+        token = store.create("admin-1")
+
+        auth.logout(token)
+
+        assert not auth.is_authenticated(token)
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+
+    def test_sweeper_thread(self, temp_db):
+        """Test the background sweeper purges expired rows"""
+        store = SessionStore(temp_db, ttl_seconds=0, sweep_interval_seconds=0.01)
+        store.create("admin-1")
+        store.start()
+        try:
+            deadline = time.time() + 2
+            while time.time() < deadline:
+                with sqlite3.connect(temp_db) as conn:
+                    if conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0:
+                        break
+                time.sleep(0.01)
+        finally:
+            store.stop()
+
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
@@ -0,0 +1,95 @@
+"""
+Tests for event-maintained server statistics
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src.core.events import EventBus
+from src.repositories.sqlite_mission_repository import SQLiteMissionRepository
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.mission_service import MissionService
+from src.services.player_service import PlayerService
+from src.services.statistics_service import StatisticsService
+
+class TestStatisticsService:
+    """Test cases for StatisticsService"""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create temporary database for testing"""
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield path
+        os.unlink(path)
+
+    @pytest.fixture
+    def world(self, temp_db):
+        event_bus = EventBus()
+        player_repository = SQLitePlayerRepository(temp_db)
+        mission_repository = SQLiteMissionRepository(temp_db)
+        statistics = StatisticsService(player_repository, mission_repository, event_bus, max_staleness_seconds=3600)
+        return {
+            "statistics": statistics,
+            "players": PlayerService(player_repository, event_bus),
+            "missions": MissionService(mission_repository, event_bus),
+            "player_repository": player_repository,
+            "mission_repository": mission_repository,
+        }
+
+    def expected(self, world):
+        """Statistics computed the old way, straight from the database"""
+        return {
+            "total_players": world["player_repository"].count(),
+            "online_players": world["player_repository"].count_online(),
+            "total_missions": world["mission_repository"].count(),
+            "mission_statistics": world["mission_repository"].get_mission_statistics(),
+        }
+
+    def test_events_keep_counts_current_without_queries(self, world, monkeypatch):
+        """Test counts follow player and mission events between recounts"""
+        statistics = world["statistics"]
+        statistics.get_statistics()
+
+        alice = world["players"].create_player("alice")
+        world["players"].create_player("bob")
+        alice = world["players"].authenticate_player("alice")
+        world["missions"].start_mission(alice, "tutorial_001")
+        bob = world["players"].authenticate_player("bob")
+        world["missions"].start_mission(bob, "tutorial_003")
+        world["missions"].abandon_mission(bob, "tutorial_003")
+        world["players"].logout_player(bob)
+        expected = self.expected(world)
+
+        def no_queries(*args):
+            raise AssertionError("statistics read should not query the database")
+        monkeypatch.setattr(world["player_repository"], "count", no_queries)
+        monkeypatch.setattr(world["mission_repository"], "get_mission_statistics", no_queries)
+
+        assert statistics.get_statistics() == expected
+        assert expected["online_players"] == 1
+        assert expected["mission_statistics"]["by_status"]["in_progress"] == 1
+
+    def test_repeated_login_counts_once(self, world):
+        """Test logging in while already online does not inflate the online count"""
+        world["players"].create_player("alice")
+        world["statistics"].get_statistics()
+
+        for _ in range(3):
+            world["players"].authenticate_player("alice")
+
+        assert world["statistics"].get_statistics()["online_players"] == 1
+
+    def test_recount_after_staleness_bound(self, world):
+        """Test changes made without events show up once the counts are stale"""
+        statistics = world["statistics"]
+        player = world["players"].create_player("alice")
+        statistics.get_statistics()
+
+        world["player_repository"].delete(player.id)
+        assert statistics.get_statistics()["total_players"] == 1
+
+        statistics.max_staleness_seconds = 0
+        assert statistics.get_statistics()["total_players"] == 0
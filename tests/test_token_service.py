@@ -0,0 +1,111 @@
+"""
+Tests for signed player session tokens
+"""
+
+import pytest
+import tempfile
+import os
+from src.core.config import SecurityConfig
+from src.core.exceptions import AuthenticationError
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+from src.services.auth_service import AuthService
+from src.services.token_service import TokenService
+
+class TestTokenService:
+    """Test cases for TokenService"""
+
+    @pytest.fixture
+    def token_service(self):
+        return TokenService({"k1": "first-secret"}, "k1", ttl_seconds=60)
+
+    def test_issue_and_verify(self, token_service):
+        """Test a token round-trips its claims"""
+        token = token_service.issue("player-1", "Alice")
+        claims = token_service.verify(token)
+
+        assert claims["pid"] == "player-1"
+        assert claims["name"] == "Alice"
+        assert claims["kid"] == "k1"
+        assert claims["exp"] - claims["iat"] == 60
+
+    def test_tampered_token_rejected(self, token_service):
+        """Test changed payloads, signatures and garbage fail verification"""
+        token = token_service.issue("player-1", "Alice")
+        forged = TokenService({"k1": "other-secret"}, "k1").issue("player-1", "Mallory")
+        payload, signature = token.split(".")
+        flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+        for bad in [forged.split(".")[0] + "." + signature, payload + "." + flipped, "garbage", "", "é.é"]:
+            with pytest.raises(AuthenticationError):
+                token_service.verify(bad)
+
+    def test_expired_token_rejected(self):
+        """Test expired tokens fail verification"""
+        token_service = TokenService({"k1": "secret"}, "k1", ttl_seconds=-1)
+        with pytest.raises(AuthenticationError, match="expired"):
+            token_service.verify(token_service.issue("player-1", "Alice"))
+
+    def test_key_rotation(self, token_service):
+        """Test old tokens verify after rotation until the key is retired"""
+        old_token = token_service.issue("player-1", "Alice")
+        token_service.rotate("k2", "second-secret")
+        new_token = token_service.issue("player-1", "Alice")
+
+        assert token_service.verify(old_token)["kid"] == "k1"
+        assert token_service.verify(new_token)["kid"] == "k2"
+
+        token_service.retire_key("k1")
+        with pytest.raises(AuthenticationError):
+            token_service.verify(old_token)
+        with pytest.raises(ValueError):
+            token_service.retire_key("k2")
+
+    def test_revocation(self, token_service):
+        """Test revoked tokens fail while other tokens still verify"""
+        revoked = token_service.issue("player-1", "Alice")
+        other = token_service.issue("player-1", "Alice")
+
+        token_service.revoke(revoked)
+
+        with pytest.raises(AuthenticationError, match="revoked"):
+            token_service.verify(revoked)
+        assert token_service.verify(other)["name"] == "Alice"
+
+    def test_from_config_previous_secrets(self):
+        """Test previous secrets from config still verify"""
+        old = TokenService({"k1": "old-secret"}, "k1").issue("player-1", "Alice")
+        config = SecurityConfig(token_secret="new-secret", token_key_id="k2", token_previous_secrets={"k1": "old-secret"})
+
+        token_service = TokenService.from_config(config)
+
+        assert token_service.verify(old)["name"] == "Alice"
+        assert token_service.verify(token_service.issue("player-1", "Alice"))["kid"] == "k2"
+
+class TestAuthServiceTokens:
+    """Test cases for AuthService token login"""
+
+    @pytest.fixture
+    def auth_service(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        yield AuthService(path, SQLitePlayerRepository(path))
+        os.unlink(path)
+
+    def test_login_returns_verifiable_token(self, auth_service):
+        """Test login issues a token naming the player"""
+        auth_service.register("Alice", "password123")
+        token = auth_service.login("Alice", "password123")
+
+        claims = auth_service.verify_token(token)
+        assert claims["name"] == "Alice"
+        assert claims["pid"] == auth_service.player_repository.find_by_name("Alice").id
+
+    def test_logout_revokes_token(self, auth_service):
+        """Test logout revokes the token"""
+        auth_service.register("Alice", "password123")
+        token = auth_service.login("Alice", "password123")
+
+        auth_service.logout(token)
+
+        with pytest.raises(AuthenticationError):
+            auth_service.verify_token(token)
@@ -0,0 +1,136 @@
+"""
+Tests for request tracing
+"""
+
+import pytest
+import json
+import tempfile
+import os
+import threading
+from src.api.game_api import GameAPI
+from src.core.config import NexusConfig
+from src.core.tracing import Tracer, TRACER, InMemoryExporter, JsonLinesExporter, current_span
+
+class TestTracer:
+    """Test cases for Tracer"""
+
+    def test_nested_spans_share_trace(self):
+        """Test children get the root's trace id and their parent's span id"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(1.0, [exporter])
+
+        with tracer.span("root", kind="test") as root:
+            with tracer.span("child") as child:
+                with tracer.span("grandchild"):
+                    assert current_span() is not root
+            assert current_span() is root
+
+        spans = {span["name"]: span for span in exporter.spans()}
+        assert {span["trace_id"] for span in spans.values()} == {root.trace_id}
+        assert spans["root"]["parent_id"] is None
+        assert spans["child"]["parent_id"] == root.span_id
+        assert spans["grandchild"]["parent_id"] == child.span_id
+        assert spans["root"]["attributes"] == {"kind": "test"}
+        assert spans["root"]["duration_ms"] >= spans["child"]["duration_ms"]
+
+    def test_errors_recorded(self):
+        """Test a raising block marks its span and still exports it"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(1.0, [exporter])
+
+        with pytest.raises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+
+        assert exporter.spans()[0]["status"] == "error"
+        assert exporter.spans()[0]["error"] == "ValueError: boom"
+
+    def test_sampling_is_per_trace(self):
+        """Test unsampled roots suppress their whole subtree"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(0.5, [exporter])
+
+        for _ in range(200):
+            with tracer.span("root"):
+                with tracer.span("child"):
+                    pass
+
+        names = [span["name"] for span in exporter.spans()]
+        assert 0 < names.count("root") < 200
+        assert names.count("root") == names.count("child")
+
+    def test_disabled_tracer_exports_nothing(self):
+        """Test a zero sample rate creates no spans"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(0.0, [exporter])
+        with tracer.span("root") as span:
+            span.set_attribute("ignored", True)
+        assert exporter.spans() == []
+
+    def test_threads_get_separate_traces(self):
+        """Test spans in other threads do not attach to this thread's span"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(1.0, [exporter])
+
+        def work():
+            with tracer.span("worker"):
+                pass
+
+        with tracer.span("main"):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        spans = {span["name"]: span for span in exporter.spans()}
+        assert spans["worker"]["parent_id"] is None
+        assert spans["worker"]["trace_id"] != spans["main"]["trace_id"]
+
+    def test_json_lines_exporter(self):
+        """Test spans are appended as JSON lines"""
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        exporter = JsonLinesExporter(path)
+        tracer = Tracer(1.0, [exporter])
+
+        with tracer.span("root"):
+            with tracer.span("child"):
+                pass
+        tracer.close()
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        os.unlink(path)
+        assert [line["name"] for line in lines] == ["child", "root"]
+
+class TestGameAPITracing:
+    """Test spans produced by the instrumented layers"""
+
+    @pytest.fixture
+    def game_api(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        config = NexusConfig()
+        config.database.database = path
+        exporter = InMemoryExporter()
+        TRACER.configure(1.0, [exporter])
+        yield GameAPI(config), exporter
+        TRACER.configure(0.0, [])
+        os.unlink(path)
+
+    def test_command_trace_covers_layers(self, game_api):
+        """Test one command traces the API, service, repository and event handler calls"""
+        api, exporter = game_api
+        api.create_player("Tracer1")
+        exporter.clear()
+
+        api.execute_command("Tracer1", "ls")
+
+        trace = exporter.traces(limit=1)[0]
+        names = [span["name"] for span in trace["spans"]]
+        assert trace["name"] == "GameAPI.execute_command"
+        assert "player_repository.find_by_name" in names
+        assert "PlayerService.check_passive_mining" in names
+        assert "CommandService.execute_command" in names
+        assert "player_repository.save" in names
+        command_span = next(span for span in trace["spans"] if span["name"] == "CommandService.execute_command")
+        assert command_span["attributes"]["command"] == "ls"
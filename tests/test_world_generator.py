@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic world generator script
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import generate_world
+
+from src.repositories.sqlite_player_repository import SQLitePlayerRepository
+
+AS_OF = datetime(2026, 1, 1)
+
+class TestGenerateWorld:
+    """Test cases for generate_world"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    def dump(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT * FROM players ORDER BY id").fetchall()
+
+    def test_same_seed_same_world(self, temp_dir):
+        """Test generation is deterministic for a seed and reference date"""
+        first, second, other = (os.path.join(temp_dir, f"{name}.db") for name in ("first", "second", "other"))
+        generate_world.generate_world(first, 300, seed=3, batch_size=100, as_of=AS_OF)
+        generate_world.generate_world(second, 300, seed=3, batch_size=64, as_of=AS_OF)
+        generate_world.generate_world(other, 300, seed=4, batch_size=100, as_of=AS_OF)
+
+        assert self.dump(first) == self.dump(second)
+        assert self.dump(first) != self.dump(other)
+
+    def test_repository_reads_generated_players(self, temp_dir):
+        """Test generated rows are consistent with the repository and its indexes"""
+        db_path = os.path.join(temp_dir, "world.db")
+        counts = generate_world.generate_world(db_path, 500, seed=1, missions=50, as_of=AS_OF)
+        repository = SQLitePlayerRepository(db_path)
+
+        assert counts["players"] == repository.count() == 500
+        assert counts["sessions"] == repository.count_online()
+        players = repository.find_all()
+        for player in players:
+            assert player.stats.total_missions_completed == len(player.completed_missions)
+            assert not set(player.active_missions) & set(player.completed_missions)
+            assert player.created_at <= player.last_login
+        # Column copies of the stats agree with the JSON data
+        top = repository.get_leaderboard("level", 1)[0]
+        assert top.stats.level == max(player.stats.level for player in players)
+
+        name = players[0].name
+        assert any(result["name"] == name for result in repository.search_players(name))
+        with sqlite3.connect(db_path) as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_players_level", "idx_players_name_nocase"} <= indexes
+
+    def test_refuses_existing_database(self, temp_dir):
+        """Test an existing file is never overwritten"""
+        db_path = os.path.join(temp_dir, "world.db")
+        SQLitePlayerRepository(db_path)
+
+        with pytest.raises(FileExistsError):
+            generate_world.generate_world(db_path, 10, as_of=AS_OF)